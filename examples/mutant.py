@@ -7,6 +7,7 @@ import subprocess
 import time
 
 import boggart
+import boggart.server
 import bugzoo
 import rooibos
 
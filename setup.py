@@ -14,17 +14,20 @@ setuptools.setup(
     author_email='christimperley@gmail.com',
     url='https://github.com/squaresLab/Boggart',
     license='mit',
-    python_requires='>=3.5',
+    python_requires='>=3.7',
     install_requires=[
         'bugzoo>=2.1.20',
         'rooibos>=0.3.0',
-        'attrs>=17.2.0',
+        'attrs>=19.2.0',
         'pyyaml',
         'requests>=2.0.0',
         'mypy-extensions>=0.3.0',
         'flask>=0.10',
         'Flask-API'
     ],
+    extras_require={
+        'async': ['aiohttp>=3.5']
+    },
     setup_requires=[
         'pytest-runner'
     ],
@@ -36,8 +39,6 @@ setuptools.setup(
         'Natural Language :: English',
         'Programming Language :: Python',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.5',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7'
     ],
     include_package_data=True,
@@ -50,7 +51,8 @@ setuptools.setup(
         splitext(basename(path))[0] for path in glob.glob('src/*.py')
     ],
     entry_points = {
-        'console_scripts': [ 'boggartd = boggart.server:main' ]
+        'console_scripts': [ 'boggartd = boggart.server:main',
+                             'boggart = boggart.cli:main' ]
     },
     test_suite = 'tests'
 )
@@ -1,7 +1,7 @@
+from typing import Any
 import logging
 import boggart.exceptions
 import boggart.warnings
-import boggart.server
 import boggart.client
 import boggart.core
 
@@ -11,3 +11,13 @@ from .client import Client
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 logging.getLogger(__name__).setLevel(logging.DEBUG)
+
+
+def __getattr__(name: str) -> Any:
+    # the server is only imported when it is first accessed, since it pulls in
+    # Flask, Flask-API and the BugZoo server, none of which are needed by
+    # clients.
+    if name == 'server':
+        import boggart.server
+        return boggart.server
+    raise AttributeError("module 'boggart' has no attribute '{}'".format(name))
@@ -0,0 +1,278 @@
+"""
+Provides the boggart command-line interface, which can be used to find the
+mutations to a local directory of source files without a boggart server.
+"""
+__all__ = ['main']
+
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import json
+import logging
+import os
+import sys
+
+import attr
+import rooibos
+
+from .core import MutationSet, Operator
+from .exceptions import BoggartException, OperatorNotFound
+from .server import Installation
+from .server.providers import LocalDirectoryProvider
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+FORMATS = ('jsonl', 'columnar')
+
+
+@attr.s(frozen=True)
+class _Tree(object):
+    """
+    Stands in for a snapshot when source files are read from a directory.
+    """
+    name = attr.ib(type=str)
+
+
+class _OfflineRooibos(object):
+    """
+    Stands in for a Rooibos client when no Rooibos server is available.
+    Only literal templates, which are matched in-process, can be used.
+    """
+    def matches(self, text: str, template: str) -> Iterator[rooibos.Match]:
+        msg = "a Rooibos server is required to match template: {}"
+        raise BoggartException(msg.format(template))
+
+
+def _needs_rooibos(operator: Operator) -> bool:
+    return not all(t.is_literal for t in operator.transformations)
+
+
+def _source_files(installation: Installation, tree: _Tree) -> List[str]:
+    """
+    Finds all files within a tree that are written in one of the languages
+    supported by an installation, ignoring hidden files and directories.
+    """
+    endings = tuple(installation.languages.supported_file_endings)
+    return [fn for fn in installation.sources.list_files(tree)
+            if fn.endswith(endings)]
+
+
+class _Discoverer(object):
+    """
+    Finds the mutations to files within a local directory.
+    """
+    def __init__(self,
+                 root: str,
+                 user_config_path: Optional[str],
+                 url_rooibos: Optional[str],
+                 operator_names: Optional[Sequence[str]]
+                 ) -> None:
+        config = Installation.load_config(user_config_path)
+        if url_rooibos:
+            client_rooibos = rooibos.Client(url_rooibos)  # type: Any
+        else:
+            client_rooibos = _OfflineRooibos()
+        provider = LocalDirectoryProvider(root)
+        self.installation = Installation(config, None, client_rooibos,
+                                         provider=provider)
+        self.tree = _Tree(provider.root)
+
+        if operator_names:
+            try:
+                self.operators = [self.installation.operators[name]
+                                  for name in operator_names]
+            except KeyError as err:
+                raise OperatorNotFound(err.args[0])
+        else:
+            self.operators = list(self.installation.operators)
+        if not url_rooibos:
+            self.operators = [op for op in self.operators
+                              if not _needs_rooibos(op)]
+
+    def discover(self, filepath: str) -> MutationSet:
+        language = self.installation.languages.detect(filepath)
+        operators = [op for op in self.operators
+                     if op.supports_language(language)]
+        if not operators:
+            return MutationSet()
+        return self.installation.mutation_set(self.tree, filepath,
+                                              language=language,
+                                              operators=operators)
+
+
+_discoverer = None  # type: Optional[_Discoverer]
+
+
+def _init_worker(*args: Any) -> None:
+    global _discoverer
+    _discoverer = _Discoverer(*args)
+
+
+def _discover_in_worker(filepath: str) -> bytes:
+    assert _discoverer is not None
+    return _discoverer.discover(filepath).to_bytes()
+
+
+def discover(root: str,
+             filepaths: Optional[Iterable[str]] = None,
+             *,
+             user_config_path: Optional[str] = None,
+             url_rooibos: Optional[str] = None,
+             operator_names: Optional[Sequence[str]] = None,
+             num_workers: int = 1
+             ) -> Iterator[MutationSet]:
+    """
+    Finds the mutations to files within a local directory.
+
+    Parameters:
+        root: the directory.
+        filepaths: the files, relative to the directory, whose mutations
+            should be found. If omitted, all files written in a supported
+            language are used.
+        user_config_path: the path to the user configuration file.
+        url_rooibos: the URL of a Rooibos server. If omitted, only operators
+            whose match templates are literal are used.
+        operator_names: the names of the operators that should be used. If
+            omitted, all operators are used.
+        num_workers: the number of processes that should be used to find
+            mutations.
+
+    Returns:
+        an iterator over the mutations to each file, in order.
+
+    Raises:
+        OperatorNotFound: if one of the named operators does not exist.
+        BoggartException: if one of the named operators requires a Rooibos
+            server and none was given.
+    """
+    args = (root, user_config_path, url_rooibos, operator_names)
+    discoverer = _Discoverer(*args)
+    if operator_names and not url_rooibos:
+        for name in operator_names:
+            if name not in (op.name for op in discoverer.operators):
+                msg = "operator requires a Rooibos server: {}"
+                raise BoggartException(msg.format(name))
+
+    if filepaths is None:
+        filepaths = _source_files(discoverer.installation, discoverer.tree)
+    filepaths = list(filepaths)
+    logger.info("finding mutations to %d files in directory: %s",
+                len(filepaths), root)
+
+    if num_workers <= 1:
+        yield from (discoverer.discover(fn) for fn in filepaths)
+        return
+
+    with ProcessPoolExecutor(max_workers=num_workers,
+                             initializer=_init_worker,
+                             initargs=args) as executor:
+        for data in executor.map(_discover_in_worker, filepaths):
+            yield MutationSet.from_bytes(data)
+
+
+def write_jsonl(mutation_sets: Iterable[MutationSet], output: Any) -> int:
+    """
+    Writes mutations to a text stream, one JSON object per line.
+
+    Returns:
+        the number of mutations that were written.
+    """
+    num_mutations = 0
+    for mutations in mutation_sets:
+        for mutation in mutations.to_dicts():
+            output.write(json.dumps(mutation, sort_keys=True))
+            output.write('\n')
+            num_mutations += 1
+    return num_mutations
+
+
+def write_columnar(mutation_sets: Iterable[MutationSet], output: Any) -> int:
+    """
+    Writes mutations to a binary stream in the columnar format used by the
+    server (i.e., `application/vnd.boggart.mutations`).
+
+    Returns:
+        the number of mutations that were written.
+    """
+    everything = MutationSet()
+    for mutations in mutation_sets:
+        everything.extend(mutations)
+    output.write(everything.to_bytes())
+    return len(everything)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='boggart')
+    parser.add_argument('--log-level',
+                        type=str,
+                        choices=['debug', 'info', 'warning', 'error',
+                                 'critical'],
+                        default='warning')
+    commands = parser.add_subparsers(dest='command')
+    commands.required = True
+
+    cmd = commands.add_parser('discover',
+                              help='find the mutations to a local directory.')  # noqa: pycodestyle
+    cmd.add_argument('root',
+                     help='the directory that contains the source files.')
+    cmd.add_argument('files',
+                     nargs='*',
+                     help='the files, relative to the directory, that should be mutated. If omitted, all files in a supported language are used.')  # noqa: pycodestyle
+    cmd.add_argument('--config',
+                     type=str,
+                     help='the path to the user configuration file.')
+    cmd.add_argument('--operators',
+                     type=str,
+                     help='a semi-colon delimited list of the operators that should be used.')  # noqa: pycodestyle
+    cmd.add_argument('--rooibos',
+                     type=str,
+                     help='the URL of a Rooibos server. If omitted, only operators with literal templates are used.')  # noqa: pycodestyle
+    cmd.add_argument('--workers',
+                     type=int,
+                     default=os.cpu_count() or 1,
+                     help='the number of worker processes.')
+    cmd.add_argument('--format',
+                     choices=FORMATS,
+                     default='jsonl',
+                     help='the format of the output.')
+    cmd.add_argument('-o', '--output',
+                     type=str,
+                     help='the file to which the mutations should be written. If omitted, JSONL output is written to stdout.')  # noqa: pycodestyle
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    log_to_stderr = logging.StreamHandler()
+    log_to_stderr.setLevel(getattr(logging, args.log_level.upper()))
+    logging.getLogger('boggart').addHandler(log_to_stderr)
+
+    if args.format == 'columnar' and not args.output:
+        print("error: an output file is required for columnar output",
+              file=sys.stderr)
+        sys.exit(2)
+
+    operator_names = args.operators.split(';') if args.operators else None
+    try:
+        mutation_sets = discover(args.root,
+                                 args.files or None,
+                                 user_config_path=args.config,
+                                 url_rooibos=args.rooibos,
+                                 operator_names=operator_names,
+                                 num_workers=args.workers)
+        if args.format == 'columnar':
+            with open(args.output, 'wb') as f:
+                num_mutations = write_columnar(mutation_sets, f)
+        elif args.output:
+            with open(args.output, 'w') as f:
+                num_mutations = write_jsonl(mutation_sets, f)
+        else:
+            num_mutations = write_jsonl(mutation_sets, sys.stdout)
+    except BoggartException as err:
+        print("error: {}".format(err.message), file=sys.stderr)
+        sys.exit(1)
+    logger.info("wrote %d mutations", num_mutations)
+
+
+if __name__ == '__main__':
+    main()
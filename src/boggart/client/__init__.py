@@ -1,6 +1,8 @@
-from typing import Optional, Union, Dict, List, Iterator, Tuple
+from typing import (Optional, Union, Dict, List, Iterable, Iterator, Tuple,
+                    Any)
 import logging
 
+import requests
 from bugzoo.core.patch import Patch
 from bugzoo.core.bug import Bug
 from bugzoo.util import indent
@@ -9,8 +11,12 @@ from .api import API
 from .languages import LanguageCollection
 from .operators import OperatorCollection
 from .mutants import MutantCollection
+from .media import accept_header, decode_mutation_set, mutations_to_dicts, \
+    encode_lines
 from ..exceptions import *
-from ..core import Operator, Language, Mutation, Mutant, Replacement
+from ..core import Operator, Language, Mutation, Mutant, Replacement, \
+                   MutationSet, MutationDelta, MutationSummary, \
+                   MEDIA_TYPE_MUTATIONS
 
 
 logger = logging.getLogger(__name__)
@@ -27,29 +33,41 @@ class Client(object):
                  base_url: str,
                  *,
                  timeout: int = 30,
-                 timeout_connection: int = 60
+                 timeout_connection: int = 60,
+                 check_connection: bool = True,
+                 cache_size: int = 0
                  ) -> None:
         """
         Constructs a new client for communicating with a given boggart server.
+        The languages and operators that are supported by the server are
+        fetched when they are first accessed.
 
         Parameters:
             base_url:   the URL of the boggart server.
             timeout:    the default timeout for API calls (in seconds).
+            timeout_connection: the maximum number of seconds to wait for the
+                server to become ready.
+            check_connection: if set to False, the client will not wait for
+                the server to become ready before returning.
+            cache_size: the maximum number of responses (e.g., lists of
+                mutations) that should be cached by the client. Cached
+                responses are revalidated with the server before they are
+                reused. If zero, responses are not cached.
 
         Raises:
             ValueError: if the provided URL lacks a scheme (e.g., 'http').
+            ConnectionFailure: if a connection to the server could not be
+                established within the connection timeout window.
         """
         logger.info("constructing client for boggart server: %s", base_url)
         self.__api = API(base_url,
                          timeout=timeout,
-                         timeout_connection=timeout_connection)
+                         timeout_connection=timeout_connection,
+                         check_connection=check_connection,
+                         cache_size=cache_size)
         self.__languages = LanguageCollection(api=self.api)
         self.__operators = OperatorCollection(api=self.api)
         self.__mutants = MutantCollection(api=self.api)
-        logger.info("registered languages: %s",
-                    ', '.join([l.name for l in self.__languages]))
-        logger.info("registered operators: %s",
-                    ', '.join([op.name for op in self.__operators]))
         logger.info("constructed client for boggart server: %s", base_url)
 
     @property
@@ -99,7 +117,7 @@ class Client(object):
 
     def mutations_to_diff(self,
                           snapshot: Bug,
-                          mutations: List[Mutation]
+                          mutations: Iterable[Mutation]
                           ) -> Patch:
         """
         Transforms a given set of mutations to a snapshot into a unified diff.
@@ -107,11 +125,12 @@ class Client(object):
         logger.info("transforming mutations to snapshot [%s] into a diff",  # noqa: pycodestyle
                     snapshot.name)
         path = "diff/mutations/{}".format(snapshot.name)
-        payload = {
-            'mutations': [m.to_dict() for m in mutations]
-        }
-
-        response = self.api.put(path, json=payload)
+        if not isinstance(mutations, MutationSet):
+            mutations = MutationSet.from_mutations(mutations)
+        headers = {'Content-Type': MEDIA_TYPE_MUTATIONS}
+        response = self.api.put(path,
+                                data=mutations.to_bytes(),
+                                headers=headers)
         if response.status_code == 200:
             diff = Patch.from_unidiff(response.text)
             diff_s = "[DIFF]\n{}\n[/DIFF]".format(indent(str(diff), 2))
@@ -124,7 +143,7 @@ class Client(object):
 
     def mutations_to_replacements(self,
                                   snapshot: Bug,
-                                  mutations: List[Mutation]
+                                  mutations: Iterable[Mutation]
                                   ) -> List[Replacement]:
         """
         Transforms a given set of mutations to list of replacements.
@@ -132,11 +151,12 @@ class Client(object):
         logger.debug("transforming mutations to snapshot [%s] into a set of replacements",  # noqa: pycodestyle
                      snapshot.name)
         path = "replacements/mutations/{}".format(snapshot.name)
-        payload = {
-            'mutations': [m.to_dict() for m in mutations]
-        }
-
-        response = self.api.put(path, json=payload)
+        if not isinstance(mutations, MutationSet):
+            mutations = MutationSet.from_mutations(mutations)
+        headers = {'Content-Type': MEDIA_TYPE_MUTATIONS}
+        response = self.api.put(path,
+                                data=mutations.to_bytes(),
+                                headers=headers)
         if response.status_code == 200:
             replacements = [Replacement.from_dict(d) for d in response.json()]
             return replacements
@@ -150,7 +170,11 @@ class Client(object):
                   *,
                   language: Optional[Language] = None,
                   operators: Optional[List[Operator]] = None,
-                  restrict_to_lines: Optional[List[int]] = None
+                  restrict_to_lines: Optional[Iterable[int]] = None,
+                  covered_only: bool = False,
+                  sample: Optional[int] = None,
+                  seed: int = 0,
+                  stratify: Optional[str] = None
                   ) -> Iterator[Mutation]:
         """
         Returns an iterator over all of the mutations that can be applied to
@@ -167,6 +191,16 @@ class Client(object):
                 used to generate mutations. If no list is provided, then all
                 registered mutation operators for the specified language will
                 be used as a default.
+            restrict_to_lines: an optional set of line numbers. If given, only
+                mutations that begin on one of those lines are returned.
+            covered_only: if True, only mutations that begin on a line that is
+                covered by the test suite of the snapshot are returned.
+            sample: if given, a reproducible random sample of at most this
+                many mutations is returned.
+            seed: the seed that is used to draw the sample.
+            stratify: if given together with a sample size, the sample is
+                divided evenly between the mutations produced by each
+                operator ('operator') or beginning on each line ('line').
 
         Returns:
             an iterator over the possible mutations.
@@ -178,32 +212,240 @@ class Client(object):
             FileNotFound: if no file is found with the given name in the
                 snapshot.
         """
+        response = self._find_mutations(snapshot, filepath,
+                                        language=language,
+                                        operators=operators,
+                                        restrict_to_lines=restrict_to_lines,
+                                        covered_only=covered_only,
+                                        sample=sample,
+                                        seed=seed,
+                                        stratify=stratify)
+
+        if response.status_code == 200:
+            for mutation in decode_mutation_set(response):
+                logger.info("Found mutation: %s", repr(mutation))
+                yield mutation
+        else:
+            logger.info("An error occurred whilst attempting to find mutations.")  # noqa: pycodestyle
+            self.__api.handle_erroneous_response(response)
+
+    def mutation_set(self,
+                     snapshot: Bug,
+                     filepath: str,
+                     *,
+                     language: Optional[Language] = None,
+                     operators: Optional[List[Operator]] = None,
+                     restrict_to_lines: Optional[Iterable[int]] = None,
+                     covered_only: bool = False,
+                     sample: Optional[int] = None,
+                     seed: int = 0,
+                     stratify: Optional[str] = None
+                     ) -> MutationSet:
+        """
+        Finds all of the mutations that can be applied to a given file
+        belonging to a BugZoo snapshot, and decodes them directly into a
+        compact, columnar set. Accepts the same parameters as `mutations`.
+
+        Raises:
+            SnapshotNotFound: if the given snapshot does not appear to be
+                registered with the BugZoo server that is attached to this
+                boggart server.
+            FileNotFound: if no file is found with the given name in the
+                snapshot.
+        """
+        response = self._find_mutations(snapshot, filepath,
+                                        language=language,
+                                        operators=operators,
+                                        restrict_to_lines=restrict_to_lines,
+                                        covered_only=covered_only,
+                                        sample=sample,
+                                        seed=seed,
+                                        stratify=stratify)
+        if response.status_code != 200:
+            self.__api.handle_erroneous_response(response)
+        return decode_mutation_set(response)
+
+    def summarise_mutations(self,
+                            snapshot: Bug,
+                            filepath: str,
+                            *,
+                            language: Optional[Language] = None,
+                            operators: Optional[List[Operator]] = None,
+                            restrict_to_lines: Optional[Iterable[int]] = None,
+                            covered_only: bool = False
+                            ) -> MutationSummary:
+        """
+        Counts the mutations that can be applied to a given file belonging to
+        a BugZoo snapshot by operator, transformation and line, without
+        fetching the mutations themselves. Accepts the same parameters as
+        `mutations`.
+
+        Raises:
+            SnapshotNotFound: if the given snapshot does not appear to be
+                registered with the BugZoo server that is attached to this
+                boggart server.
+            FileNotFound: if no file is found with the given name in the
+                snapshot.
+        """
+        response = self._find_mutations(snapshot, filepath,
+                                        language=language,
+                                        operators=operators,
+                                        restrict_to_lines=restrict_to_lines,
+                                        covered_only=covered_only,
+                                        summary=True)
+        if response.status_code != 200:
+            self.__api.handle_erroneous_response(response)
+        return MutationSummary.from_dict(response.json())
+
+    def summarise_snapshot(self,
+                           snapshot: Bug,
+                           filepaths: Iterable[str],
+                           *,
+                           operators: Optional[List[Operator]] = None,
+                           covered_only: bool = False
+                           ) -> Dict[str, MutationSummary]:
+        """
+        Counts the mutations that can be applied to each of a given set of
+        files belonging to a BugZoo snapshot, using a single request.
+
+        Returns:
+            a mapping from each file to a summary of its mutations.
+
+        Raises:
+            SnapshotNotFound: if the given snapshot does not appear to be
+                registered with the BugZoo server that is attached to this
+                boggart server.
+            FileNotFound: if one of the files is not found in the snapshot.
+        """
+        params = {'files': ';'.join(filepaths)}  # type: Dict[str, Any]
+        if operators:
+            params['operators'] = ';'.join([op.name for op in operators])
+        if covered_only:
+            params['covered_only'] = 1
+        path = "summary/mutations/{}".format(snapshot.name)
+        response = self.api.get(path, params)
+        if response.status_code != 200:
+            self.__api.handle_erroneous_response(response)
+        return {fn: MutationSummary.from_dict(d)
+                for (fn, d) in response.json()['files'].items()}
+
+    def constraint_statistics(self,
+                              operators: Optional[List[Operator]] = None
+                              ) -> List[Dict[str, Any]]:
+        """
+        Reports how the constraints of each transformation of a given set of
+        operators, or of all operators, have behaved during the discovery of
+        mutations by the server.
+
+        Returns:
+            a list of reports, one for each transformation, that describe
+            each of its constraints, in the order that they are checked,
+            together with its cost class, the number of times that it was
+            evaluated, the number of matches that it rejected, and the total
+            number of seconds spent evaluating it.
+        """
+        params = {}  # type: Dict[str, Any]
+        if operators:
+            params['operators'] = ';'.join([op.name for op in operators])
+        response = self.api.get('statistics/constraints', params)
+        if response.status_code != 200:
+            self.__api.handle_erroneous_response(response)
+        return response.json()
+
+    def _find_mutations(self,
+                        snapshot: Bug,
+                        filepath: str,
+                        *,
+                        language: Optional[Language] = None,
+                        operators: Optional[List[Operator]] = None,
+                        restrict_to_lines: Optional[Iterable[int]] = None,
+                        covered_only: bool = False,
+                        sample: Optional[int] = None,
+                        seed: int = 0,
+                        stratify: Optional[str] = None,
+                        summary: bool = False
+                        ) -> requests.Response:
         assert operators is None or len(operators) > 0
 
         logger.info("Finding mutations in file '%s' belonging to snapshot '%s'.",  # noqa: pycodestyle
                     filepath,
                     snapshot.name)
         path = "mutations/{}/{}".format(snapshot.name, filepath)
-        params = {}
+        params = {}  # type: Dict[str, Any]
         if language:
             params['language'] = language.name
         if operators:
             params['operators'] = ';'.join([op.name for op in operators])
         if restrict_to_lines:
-            params['lines'] = ';'.join(map(str, sorted(restrict_to_lines)))
+            params['lines'] = encode_lines(restrict_to_lines)
+        if covered_only:
+            params['covered_only'] = 1
+        if sample is not None:
+            params['sample'] = sample
+            params['seed'] = seed
+            if stratify:
+                params['stratify'] = stratify
+        if summary:
+            params['summary'] = 1
+
+        headers = {'Accept': accept_header(MEDIA_TYPE_MUTATIONS)}
+        return self.api.get(path, params, headers=headers)
+
+    def mutation_delta(self,
+                       base: Bug,
+                       *,
+                       target: Optional[Bug] = None,
+                       files: Optional[Iterable[str]] = None,
+                       diff: Optional[Union[Patch, str]] = None,
+                       operators: Optional[List[Operator]] = None,
+                       context: int = 3
+                       ) -> Dict[str, MutationDelta]:
+        """
+        Determines how the mutations of a set of files change between a base
+        snapshot and a target, given either as another snapshot together
+        with the files that should be compared, or as a unified diff. Only
+        the changed regions of each file are searched for new mutations.
 
-        response = self.api.get(path, params)
+        Parameters:
+            base: the base snapshot.
+            target: the target snapshot.
+            files: the files that should be compared between the base and
+                target snapshots.
+            diff: a unified diff that transforms the base snapshot into the
+                target.
+            operators: an optional list of the mutation operators that should
+                be used. If omitted, all operators are used.
+            context: the number of unchanged lines surrounding each change
+                that should be searched for new mutations.
 
-        if response.status_code == 200:
-            for jsn_mutation in response.json():
-                logger.debug("Decoding mutation.",
-                             extra={'mutation': jsn_mutation})
-                mutation = Mutation.from_dict(jsn_mutation)
-                logger.info("Found mutation: %s", repr(mutation))
-                yield mutation
+        Returns:
+            a mapping from the path of each changed file to the mutations that
+            were added, removed and carried over to the target.
+
+        Raises:
+            SnapshotNotFound: if either snapshot is not registered with the
+                BugZoo server that is attached to this boggart server.
+            FileNotFound: if a given file is found in neither snapshot.
+            BadFormat: if the given diff does not apply to the base snapshot.
+        """
+        assert (target is None) != (diff is None)
+        payload = {'context': context}  # type: Dict[str, Any]
+        if diff is not None:
+            payload['diff'] = str(diff)
         else:
-            logger.info("An error occurred whilst attempting to find mutations.")  # noqa: pycodestyle
+            assert target is not None
+            assert files is not None
+            payload['target'] = target.name
+            payload['files'] = list(files)
+        if operators:
+            payload['operators'] = [op.name for op in operators]
+
+        path = "delta/mutations/{}".format(base.name)
+        response = self.api.put(path, json=payload)
+        if response.status_code != 200:
             self.__api.handle_erroneous_response(response)
+        return {fn: MutationDelta.from_dict(d)
+                for (fn, d) in response.json().items()}
 
     def mutate(self,
                snapshot: Bug,
@@ -221,7 +463,7 @@ class Client(object):
         """
         payload = {
             'snapshot': snapshot.name,
-            'mutations': [m.to_dict() for m in mutations]
+            'mutations': mutations_to_dicts(mutations)
         }
         logger.info("Applying mutations to snapshot '%s': %s",
                     snapshot.name,
@@ -240,6 +482,58 @@ class Client(object):
             logger.info("An error occurred whilst attempting to mutate snapshot.")  # noqa: pycodestyle
             self.__api.handle_erroneous_response(response)
 
+    def job(self, uid: str) -> Dict[str, Any]:
+        """
+        Describes the status of a background job on the server.
+
+        Returns:
+            a description of the job, including its status ('running',
+            'finished' or 'failed'), its progress, and, if it has finished,
+            its result.
+
+        Raises:
+            JobNotFound: if no job is found with the given identifier.
+        """
+        r = self.__api.get("jobs/{}".format(uid))
+        if r.status_code == 200:
+            return r.json()
+        self.__api.handle_erroneous_response(r)
+
+    def reload(self) -> str:
+        """
+        Asks the server to reload its languages and operators from its
+        configuration files.
+
+        Returns:
+            the digest of the new configuration of the server.
+        """
+        r = self.__api.post("reload")
+        if r.status_code == 200:
+            return r.json()['digest']
+        self.__api.handle_erroneous_response(r)
+
+    def warm_up(self, snapshots: Iterable[str]) -> str:
+        """
+        Asks the server to warm the caches used to find the mutations to the
+        source files of a given set of snapshots in the background.
+
+        Parameters:
+            snapshots: the names of the snapshots, which may be given as glob
+                patterns.
+
+        Returns:
+            the identifier of the background job that performs the warm-up.
+
+        Raises:
+            SnapshotNotFound: if a name that is not a pattern does not belong
+                to a registered snapshot.
+        """
+        params = {'snapshots': ';'.join(snapshots)}
+        r = self.__api.post("warmup", params=params)
+        if r.status_code == 202:
+            return r.json()['job']
+        self.__api.handle_erroneous_response(r)
+
     def shutdown(self) -> None:
         r = self.__api.post("shutdown")
         if r.status_code != 202:
@@ -0,0 +1,298 @@
+from typing import Optional, Dict, Iterable, List, Sequence, Any
+import asyncio
+import logging
+
+from bugzoo.core.patch import Patch
+from bugzoo.core.bug import Bug
+
+from .api import AsyncAPI
+from .languages import AsyncLanguageCollection
+from .operators import AsyncOperatorCollection
+from .mutants import AsyncMutantCollection
+from ..media import mutations_to_dicts, encode_lines
+from ...core import Operator, Language, Mutation, Mutant, Replacement
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['AsyncClient']
+
+
+class AsyncClient(object):
+    """
+    An asynchronous client for communicating with a boggart server.
+
+    Connections to the server are pooled and should be released by calling
+    `close` once the client is no longer needed. Alternatively, the client
+    may be used as an asynchronous context manager, which waits for the
+    server to become ready upon entry and releases all connections upon exit.
+    """
+    def __init__(self,
+                 base_url: str,
+                 *,
+                 timeout: int = 30,
+                 timeout_connection: int = 60,
+                 max_connections: int = 100
+                 ) -> None:
+        """
+        Constructs a new asynchronous client for communicating with a given
+        boggart server.
+
+        Parameters:
+            base_url: the URL of the boggart server.
+            timeout: the default timeout for API calls (in seconds).
+            timeout_connection: the maximum number of seconds to wait for the
+                server to become ready.
+            max_connections: the maximum number of simultaneous connections
+                that may be held open to the server.
+
+        Raises:
+            ValueError: if the provided URL lacks a scheme (e.g., 'http').
+        """
+        logger.info("constructing asynchronous client for boggart server: %s",
+                    base_url)
+        self.__api = AsyncAPI(base_url,
+                              timeout=timeout,
+                              timeout_connection=timeout_connection,
+                              max_connections=max_connections)
+        self.__languages = AsyncLanguageCollection(api=self.api)
+        self.__operators = AsyncOperatorCollection(api=self.api)
+        self.__mutants = AsyncMutantCollection(api=self.api)
+
+    async def __aenter__(self) -> 'AsyncClient':
+        try:
+            await self.api.connect()
+        except Exception:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, ex_type, ex_value, ex_traceback) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes all connections to the server.
+        """
+        await self.__api.close()
+
+    @property
+    def api(self) -> AsyncAPI:
+        """
+        The low-level client API used to communicate with the server.
+        """
+        return self.__api
+
+    @property
+    def languages(self) -> AsyncLanguageCollection:
+        """
+        The set of languages that are supported (i.e., can be mutated)
+        by the server.
+        """
+        return self.__languages
+
+    @property
+    def mutants(self) -> AsyncMutantCollection:
+        """
+        The set of mutants that are registered with the server.
+        """
+        return self.__mutants
+
+    @property
+    def operators(self) -> AsyncOperatorCollection:
+        """
+        The set of mutation operators that are supported by the server.
+        """
+        return self.__operators
+
+    async def mutations_to_diff(self,
+                                snapshot: Bug,
+                                mutations: List[Mutation]
+                                ) -> Patch:
+        """
+        Transforms a given set of mutations to a snapshot into a unified diff.
+        """
+        path = "diff/mutations/{}".format(snapshot.name)
+        payload = {
+            'mutations': mutations_to_dicts(mutations)
+        }
+        response = await self.api.put(path, json=payload)
+        if response.status_code == 200:
+            return Patch.from_unidiff(response.text)
+        logger.info("an error occurred whilst attempting to transform mutations to snapshot into a diff.")  # noqa: pycodestyle
+        self.__api.handle_erroneous_response(response)
+
+    async def mutations_to_replacements(self,
+                                        snapshot: Bug,
+                                        mutations: List[Mutation]
+                                        ) -> List[Replacement]:
+        """
+        Transforms a given set of mutations to list of replacements.
+        """
+        path = "replacements/mutations/{}".format(snapshot.name)
+        payload = {
+            'mutations': mutations_to_dicts(mutations)
+        }
+        response = await self.api.put(path, json=payload)
+        if response.status_code == 200:
+            return [Replacement.from_dict(d) for d in response.json()]
+        logger.info("an error occurred whilst attempting to transform mutations to snapshot into a set of replacements.")  # noqa: pycodestyle
+        self.__api.handle_erroneous_response(response)
+
+    async def mutations(self,
+                        snapshot: Bug,
+                        filepath: str,
+                        *,
+                        language: Optional[Language] = None,
+                        operators: Optional[List[Operator]] = None,
+                        restrict_to_lines: Optional[Iterable[int]] = None,
+                        covered_only: bool = False
+                        ) -> List[Mutation]:
+        """
+        Returns a list of all of the mutations that can be applied to a given
+        file belonging to a BugZoo snapshot. Accepts the same parameters as
+        `Client.mutations`.
+
+        Raises:
+            SnapshotNotFound: if the given snapshot does not appear to be
+                registered with the BugZoo server that is attached to this
+                boggart server.
+            FileNotFound: if no file is found with the given name in the
+                snapshot.
+        """
+        assert operators is None or len(operators) > 0
+
+        logger.info("Finding mutations in file '%s' belonging to snapshot '%s'.",  # noqa: pycodestyle
+                    filepath,
+                    snapshot.name)
+        path = "mutations/{}/{}".format(snapshot.name, filepath)
+        params = {}  # type: Dict[str, str]
+        if language:
+            params['language'] = language.name
+        if operators:
+            params['operators'] = ';'.join([op.name for op in operators])
+        if restrict_to_lines:
+            params['lines'] = encode_lines(restrict_to_lines)
+        if covered_only:
+            params['covered_only'] = '1'
+
+        response = await self.api.get(path, params)
+        if response.status_code == 200:
+            return [Mutation.from_dict(d) for d in response.json()]
+        logger.info("An error occurred whilst attempting to find mutations.")  # noqa: pycodestyle
+        self.__api.handle_erroneous_response(response)
+
+    async def mutations_many(self,
+                             snapshot: Bug,
+                             filepaths: Sequence[str],
+                             *,
+                             language: Optional[Language] = None,
+                             operators: Optional[List[Operator]] = None,
+                             covered_only: bool = False,
+                             concurrency: int = 8
+                             ) -> Dict[str, List[Mutation]]:
+        """
+        Finds all of the mutations that can be applied to each of a given
+        sequence of files belonging to a BugZoo snapshot, issuing at most a
+        fixed number of requests to the server at any one time.
+
+        Parameters:
+            snapshot: the BugZoo snapshot.
+            filepaths: the paths to the source code files inside the
+                snapshot, relative to its source directory.
+            language: the language that the source code files are written in.
+                If left unspecified, boggart will attempt to automatically
+                determine the language of each file based on its file ending.
+            operators: an optional list of mutation operators that should be
+                used to generate mutations.
+            covered_only: if True, only mutations that begin on a line that is
+                covered by the test suite of the snapshot are returned.
+            concurrency: the maximum number of concurrent requests.
+
+        Returns:
+            a mapping from each of the given files to the list of mutations
+            that can be applied to that file.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def find(filepath: str) -> List[Mutation]:
+            async with semaphore:
+                return await self.mutations(snapshot,
+                                            filepath,
+                                            language=language,
+                                            operators=operators,
+                                            covered_only=covered_only)
+
+        results = \
+            await asyncio.gather(*[find(fn) for fn in filepaths])
+        return dict(zip(filepaths, results))
+
+    async def mutate(self,
+                     snapshot: Bug,
+                     mutations: List[Mutation]
+                     ) -> Mutant:
+        """
+        Applies a given mutation to a snapshot.
+
+        Parameters:
+            snapshot: the snapshot that should be mutated.
+            mutations: the mutations to apply to the snapshot.
+
+        Returns:
+            a description of the generated mutant.
+        """
+        payload = {
+            'snapshot': snapshot.name,
+            'mutations': mutations_to_dicts(mutations)
+        }
+        logger.info("Applying mutations to snapshot '%s': %s",
+                    snapshot.name,
+                    ', '.join(repr(m) for m in mutations))
+        response = await self.api.post("mutants", json=payload)
+        if response.status_code == 200:
+            mutant = Mutant.from_dict(response.json())
+            logger.info("Applied mutations to snapshot '%s' to generate mutant: %s",  # noqa: pycodestyle
+                        snapshot.name,
+                        repr(mutant))
+            return mutant
+        logger.info("An error occurred whilst attempting to mutate snapshot.")  # noqa: pycodestyle
+        self.__api.handle_erroneous_response(response)
+
+    async def mutate_many(self,
+                          snapshot: Bug,
+                          mutations: Sequence[List[Mutation]],
+                          *,
+                          concurrency: int = 4,
+                          return_exceptions: bool = False
+                          ) -> List[Any]:
+        """
+        Generates a mutant of a given snapshot for each of a given sequence of
+        mutation lists, building at most a fixed number of mutants at any one
+        time.
+
+        Parameters:
+            snapshot: the snapshot that should be mutated.
+            mutations: a sequence of mutation lists, each of which describes
+                a single mutant.
+            concurrency: the maximum number of mutants that may be built
+                concurrently.
+            return_exceptions: if True, exceptions raised when generating a
+                mutant (e.g., BuildFailure) are returned in place of that
+                mutant, rather than being raised.
+
+        Returns:
+            a list of mutants (and, if `return_exceptions` is enabled,
+            exceptions), given in the same order as their mutations.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(mutations_mutant: List[Mutation]) -> Mutant:
+            async with semaphore:
+                return await self.mutate(snapshot, mutations_mutant)
+
+        return await asyncio.gather(*[generate(m) for m in mutations],
+                                    return_exceptions=return_exceptions)
+
+    async def shutdown(self) -> None:
+        r = await self.__api.post("shutdown")
+        if r.status_code != 202:
+            raise Exception("failed to shutdown server")
@@ -0,0 +1,198 @@
+from typing import Dict, Any, Optional
+try:
+    from typing import NoReturn
+except ImportError:
+    from mypy_extensions import NoReturn
+from urllib.parse import urljoin, urlparse
+from timeit import default_timer as timer
+import asyncio
+import json
+import logging
+
+import aiohttp
+
+from ...exceptions import ConnectionFailure, \
+                          ClientServerError, \
+                          UnexpectedResponse
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+__all__ = ['AsyncAPI', 'Response']
+
+
+class Response(object):
+    """
+    Provides a fully-read response from the server. Responses expose the same
+    attributes as those produced by `requests`, allowing them to be handled
+    in the same way as responses produced by the synchronous client.
+    """
+    def __init__(self,
+                 status_code: int,
+                 text: str,
+                 headers: Dict[str, str]
+                 ) -> None:
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class AsyncAPI(object):
+    def __init__(self,
+                 base_url: str,
+                 *,
+                 timeout: int = 30,
+                 timeout_connection: int = 60,
+                 max_connections: int = 100
+                 ) -> None:
+        """
+        Constructs a new low-level asynchronous API client for communicating
+        with a boggart server at a given address. Requests are made over a
+        pool of persistent connections that is opened when the first request
+        is made, and closed by `close`.
+
+        Parameters:
+            base_url: the base URL of the boggart server.
+            timeout: the default timeout for API calls (in seconds).
+            timeout_connection: the maximum numbers of seconds to wait when
+                attempting to connect to the server before raising a
+                ConnectionFailure exception.
+            max_connections: the maximum number of simultaneous connections
+                that may be held open to the server.
+
+        Raises:
+            ValueError: if the provided URL lacks a scheme (e.g., 'http').
+        """
+        if not urlparse(base_url).scheme:
+            logger.error("invalid base URL provided: missing scheme.")
+            raise ValueError("invalid base URL provided: missing scheme (e.g., 'http').")  # noqa: pycodestyle
+
+        self.__base_url = base_url
+        self.__timeout = timeout
+        self.__timeout_connection = timeout_connection
+        self.__max_connections = max_connections
+        self.__session = None  # type: Optional[aiohttp.ClientSession]
+
+    @property
+    def base_url(self) -> str:
+        """
+        The base URL of the server.
+        """
+        return self.__base_url
+
+    def _session(self) -> aiohttp.ClientSession:
+        """
+        Returns the pooled HTTP session for this client, creating it if
+        necessary. Must be called from within a running event loop.
+        """
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(limit=self.__max_connections)
+            timeout = aiohttp.ClientTimeout(total=self.__timeout)
+            self.__session = aiohttp.ClientSession(connector=connector,
+                                                   timeout=timeout)
+        return self.__session
+
+    async def connect(self) -> None:
+        """
+        Waits until the server is ready to accept requests.
+
+        Raises:
+            ConnectionFailure: if a connection to the server could not be
+                established within the connection timeout window.
+        """
+        base_url = self.__base_url
+        logger.info("attempting to establish connection to server '%s' with timeout of %d seconds",  # noqa: pycodestyle
+                    base_url,
+                    self.__timeout_connection)
+        url = self.url("status")
+        session = self._session()
+        time_started = timer()
+        while True:
+            time_left = self.__timeout_connection - (timer() - time_started)
+            if time_left <= 0.0:
+                logger.error("failed to connect to server: %s", base_url)
+                raise ConnectionFailure
+            try:
+                timeout = aiohttp.ClientTimeout(total=time_left)
+                async with session.get(url, timeout=timeout) as r:
+                    if r.status in (200, 204):
+                        logger.info("connected to server: %s", base_url)
+                        return
+            except aiohttp.ClientConnectionError:
+                await asyncio.sleep(1.0)
+            except asyncio.TimeoutError:
+                logger.error("failed to connect to server: %s", base_url)
+                raise ConnectionFailure
+            await asyncio.sleep(0.05)
+
+    async def close(self) -> None:
+        """
+        Closes all connections to the server.
+        """
+        if self.__session is not None:
+            await self.__session.close()
+            self.__session = None
+
+    def handle_erroneous_response(self,
+                                  response: Response
+                                  ) -> NoReturn:
+        """
+        Attempts to decode an erroneous response into an exception, and to
+        subsequently throw that exception.
+
+        Raises:
+            ClientServerError: the exception described by the error response.
+            UnexpectedResponse: if the response cannot be decoded to an
+                exception.
+        """
+        logger.debug("handling erroneous response [%d]:\n%s",
+                     response.status_code,
+                     response.text)
+        try:
+            err = ClientServerError.from_dict(response.json())
+            logger.debug("parsed erroneous response to: %s", repr(err))
+        except Exception:
+            logger.debug("unexpected response [%d]:\n%s",
+                         response.status_code,
+                         response.text)
+            err = UnexpectedResponse(response)
+        raise err
+
+    def url(self, path: str) -> str:
+        """
+        Computes the URL to a resource located at a given path on the server.
+        """
+        return urljoin(self.__base_url, path)
+
+    async def request(self,
+                      method: str,
+                      path: str,
+                      **kwargs
+                      ) -> Response:
+        """
+        Performs a request to a resource located at a given path on the
+        server, and reads the entirety of its response.
+        """
+        url = self.url(path)
+        async with self._session().request(method, url, **kwargs) as r:
+            text = await r.text()
+            return Response(r.status, text, dict(r.headers))
+
+    async def get(self,
+                  path: str,
+                  params: Optional[Dict[str, Any]] = None,
+                  **kwargs
+                  ) -> Response:
+        return await self.request('GET', path, params=params, **kwargs)
+
+    async def post(self, path: str, data=None, **kwargs) -> Response:
+        return await self.request('POST', path, data=data, **kwargs)
+
+    async def put(self, path: str, **kwargs) -> Response:
+        return await self.request('PUT', path, **kwargs)
+
+    async def delete(self, path: str, **kwargs) -> Response:
+        return await self.request('DELETE', path, **kwargs)
@@ -0,0 +1,67 @@
+from typing import Dict, Optional
+import asyncio
+
+from .api import AsyncAPI
+from .util import AsyncIterator
+from ...core import Language
+
+__all__ = ['AsyncLanguageCollection']
+
+
+class AsyncLanguageCollection(object):
+    """
+    Provides asynchronous read-only access to the set of languages supported
+    by a given server. The languages are fetched from the server when they
+    are first accessed.
+    """
+    def __init__(self, api: AsyncAPI) -> None:
+        """
+        Constructs a new language collection for a given server.
+
+        Parameters:
+            api: the low-level client API that should be used to interact
+                with the server.
+        """
+        self.__api = api
+        self.__contents = None  # type: Optional[Dict[str, Language]]
+        self.__lock = None  # type: Optional[asyncio.Lock]
+
+    async def _contents(self) -> Dict[str, Language]:
+        """
+        Returns the contents of this collection, indexed by name, fetching
+        them from the server if necessary.
+        """
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:
+            if self.__contents is None:
+                r = await self.__api.get("/languages")
+                if r.status_code != 200:
+                    self.__api.handle_erroneous_response(r)
+                languages = [Language.from_dict(d) for d in r.json()]
+                self.__contents = {lang.name: lang for lang in languages}
+        return self.__contents
+
+    def __aiter__(self) -> AsyncIterator[Language]:
+        """
+        Returns an asynchronous iterator over the languages within this
+        collection.
+        """
+        async def values():
+            return list((await self._contents()).values())
+        return AsyncIterator(values())
+
+    async def count(self) -> int:
+        """
+        Returns a count of the number of languages within this collection.
+        """
+        return len(await self._contents())
+
+    async def get(self, name: str) -> Language:
+        """
+        Returns the language associated with a given name.
+
+        Raises:
+            KeyError: if no language is found with the given name.
+        """
+        return (await self._contents())[name]
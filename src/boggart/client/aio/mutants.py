@@ -0,0 +1,175 @@
+__all__ = ['AsyncMutantCollection']
+
+from typing import List, Iterable, Optional, Dict, Any
+from uuid import UUID
+
+from .api import AsyncAPI
+from ..mutants import next_page_url
+from ...core import Mutant
+
+
+class _PagedUUIDs(object):
+    """
+    Asynchronously iterates over a paginated list of mutant UUIDs, fetching
+    each page from the server when it is needed.
+    """
+    def __init__(self, api: AsyncAPI, params: Dict[str, Any]) -> None:
+        self.__api = api
+        self.__path = "/mutants"  # type: Optional[str]
+        self.__params = params  # type: Optional[Dict[str, Any]]
+        self.__buffer = []  # type: List[UUID]
+
+    def __aiter__(self) -> '_PagedUUIDs':
+        return self
+
+    async def __anext__(self) -> UUID:
+        while not self.__buffer:
+            if self.__path is None:
+                raise StopAsyncIteration
+            r = await self.__api.get(self.__path, self.__params)
+            if r.status_code != 200:
+                self.__api.handle_erroneous_response(r)
+            self.__buffer = [UUID(hex=s) for s in reversed(r.json())]
+            self.__path = next_page_url(r.headers)
+            self.__params = None
+        return self.__buffer.pop()
+
+
+class AsyncMutantCollection(object):
+    """
+    Provides asynchronous access to the mutants that are registered with a
+    given server.
+    """
+    def __init__(self, api: AsyncAPI, *, page_size: int = 1000) -> None:
+        """
+        Constructs a new mutant collection for a given server.
+
+        Parameters:
+            api: the low-level client API that should be used to interact
+                with the server.
+            page_size: the number of mutants that should be fetched from the
+                server in each request.
+        """
+        assert page_size > 0
+        self.__api = api
+        self.__page_size = page_size
+
+    async def clear(self, *, workers: int = 8) -> Dict[UUID, str]:
+        """
+        Destroys all registered mutants.
+
+        Parameters:
+            workers: the maximum number of mutants that the server may
+                destroy in parallel.
+
+        Returns:
+            a mapping from the UUID of each mutant whose resources could not
+            be destroyed to a description of the failure.
+        """
+        params = {'workers': str(workers)}
+        r = await self.__api.delete("/mutants", params=params)
+        if r.status_code == 204:
+            return {}
+        if r.status_code == 200:
+            failures = r.json()['failures']
+            return {UUID(hex=k): v for (k, v) in failures.items()}
+        self.__api.handle_erroneous_response(r)
+
+    def __aiter__(self) -> _PagedUUIDs:
+        """
+        Returns an asynchronous iterator over the UUIDs of mutants within this
+        collection. UUIDs are fetched from the server one page at a time.
+        """
+        return self.find()
+
+    def find(self,
+             *,
+             base: Optional[str] = None,
+             operator: Optional[str] = None
+             ) -> _PagedUUIDs:
+        """
+        Returns an asynchronous iterator over the UUIDs of mutants within this
+        collection that satisfy a set of optional filters.
+
+        Parameters:
+            base: if given, only mutants of the snapshot with this name are
+                included.
+            operator: if given, only mutants that were generated using the
+                operator with this name are included.
+        """
+        params = {'limit': str(self.__page_size)}  # type: Dict[str, Any]
+        if base is not None:
+            params['base'] = base
+        if operator is not None:
+            params['operator'] = operator
+        return _PagedUUIDs(self.__api, params)
+
+    async def count(self,
+                    *,
+                    base: Optional[str] = None,
+                    operator: Optional[str] = None
+                    ) -> int:
+        """
+        Counts the number of mutants within this collection that satisfy a
+        set of optional filters.
+        """
+        params = {}  # type: Dict[str, str]
+        if base is not None:
+            params['base'] = base
+        if operator is not None:
+            params['operator'] = operator
+        r = await self.__api.get("/mutants/count", params)
+        if r.status_code != 200:
+            self.__api.handle_erroneous_response(r)
+        return r.json()
+
+    async def describe(self, uuids: Iterable[UUID]) -> List[Mutant]:
+        """
+        Returns descriptions of the mutants associated with a given sequence
+        of UUIDs, fetched using as few requests as possible.
+
+        Raises:
+            MutantNotFound: if no mutant is found for one of the given UUIDs.
+        """
+        uuids = list(uuids)
+        mutants = []  # type: List[Mutant]
+        for i in range(0, len(uuids), self.__page_size):
+            batch = uuids[i:i + self.__page_size]
+            params = {'uuids': ';'.join(uuid.hex for uuid in batch)}
+            r = await self.__api.get("/mutants", params)
+            if r.status_code != 200:
+                self.__api.handle_erroneous_response(r)
+            mutants += [Mutant.from_dict(d) for d in r.json()]
+        return mutants
+
+    async def delete(self, uuid: UUID) -> None:
+        """
+        Destroys the mutant associated with a given UUID.
+
+        Raises:
+            KeyError: if no mutant is found with the given UUID.
+        """
+        r = await self.__api.delete('mutants/{}'.format(uuid.hex))
+        if r.status_code == 204:
+            return
+        if r.status_code == 404:
+            msg = "no mutant found with given UUID: {}"
+            msg = msg.format(uuid.hex)
+            raise KeyError(msg)
+        self.__api.handle_erroneous_response(r)
+
+    async def get(self, uuid: UUID) -> Mutant:
+        """
+        Returns the mutant associated with a given UUID.
+
+        Raises:
+            KeyError: if no mutant is found with the given UUID.
+        """
+        r = await self.__api.get('mutants/{}'.format(uuid.hex))
+        if r.status_code == 200:
+            return Mutant.from_dict(r.json())
+        if r.status_code == 404:
+            msg = "no mutant found with given UUID: {}"
+            msg = msg.format(uuid.hex)
+            raise KeyError(msg)
+        self.__api.handle_erroneous_response(r)
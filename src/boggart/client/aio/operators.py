@@ -0,0 +1,67 @@
+from typing import Dict, Optional
+import asyncio
+
+from .api import AsyncAPI
+from .util import AsyncIterator
+from ...core import Operator
+
+__all__ = ['AsyncOperatorCollection']
+
+
+class AsyncOperatorCollection(object):
+    """
+    Provides asynchronous read-only access to the set of operators supported
+    by a given server. The operators are fetched from the server when they
+    are first accessed.
+    """
+    def __init__(self, api: AsyncAPI) -> None:
+        """
+        Constructs a new operator collection for a given server.
+
+        Parameters:
+            api: the low-level client API that should be used to interact
+                with the server.
+        """
+        self.__api = api
+        self.__contents = None  # type: Optional[Dict[str, Operator]]
+        self.__lock = None  # type: Optional[asyncio.Lock]
+
+    async def _contents(self) -> Dict[str, Operator]:
+        """
+        Returns the contents of this collection, indexed by name, fetching
+        them from the server if necessary.
+        """
+        if self.__lock is None:
+            self.__lock = asyncio.Lock()
+        async with self.__lock:
+            if self.__contents is None:
+                r = await self.__api.get("/operators")
+                if r.status_code != 200:
+                    self.__api.handle_erroneous_response(r)
+                operators = [Operator.from_dict(d) for d in r.json()]
+                self.__contents = {op.name: op for op in operators}
+        return self.__contents
+
+    def __aiter__(self) -> AsyncIterator[Operator]:
+        """
+        Returns an asynchronous iterator over the operators within this
+        collection.
+        """
+        async def values():
+            return list((await self._contents()).values())
+        return AsyncIterator(values())
+
+    async def count(self) -> int:
+        """
+        Returns a count of the number of operators within this collection.
+        """
+        return len(await self._contents())
+
+    async def get(self, name: str) -> Operator:
+        """
+        Returns the operator associated with a given name.
+
+        Raises:
+            KeyError: if no operator is found with the given name.
+        """
+        return (await self._contents())[name]
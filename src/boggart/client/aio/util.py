@@ -0,0 +1,27 @@
+from typing import Awaitable, Iterable, Iterator, Generic, TypeVar, Optional
+
+__all__ = ['AsyncIterator']
+
+T = TypeVar('T')
+
+
+class AsyncIterator(Generic[T]):
+    """
+    Provides an asynchronous iterator over the contents of an iterable that is
+    produced by a given awaitable. The awaitable is not awaited until the
+    first item is requested.
+    """
+    def __init__(self, contents: Awaitable[Iterable[T]]) -> None:
+        self.__contents = contents
+        self.__iterator = None  # type: Optional[Iterator[T]]
+
+    def __aiter__(self) -> 'AsyncIterator[T]':
+        return self
+
+    async def __anext__(self) -> T:
+        if self.__iterator is None:
+            self.__iterator = iter(await self.__contents)
+        try:
+            return next(self.__iterator)
+        except StopIteration:
+            raise StopAsyncIteration
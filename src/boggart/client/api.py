@@ -1,4 +1,4 @@
-from typing import Dict, Union, List, Any
+from typing import Dict, Union, List, Any, Optional
 try:
     from typing import NoReturn
 except ImportError:
@@ -10,6 +10,7 @@ import logging
 
 import requests
 
+from .cache import ResponseCache
 from ..exceptions import ConnectionFailure, \
                          ClientServerError, \
                          UnexpectedResponse
@@ -25,7 +26,9 @@ class API(object):
                  base_url: str,
                  *,
                  timeout: int = 30,
-                 timeout_connection: int = 60
+                 timeout_connection: int = 60,
+                 check_connection: bool = True,
+                 cache_size: int = 0
                  ) -> None:
         """
         Constructs a new low-level API client for communicating with a boggart
@@ -37,6 +40,13 @@ class API(object):
             timeout_connection: the maximum numbers of seconds to wait when
                 attempting to connect to the server before raising a
                 ConnectionFailure exception.
+            check_connection: if set to False, the client will not wait for
+                the server to become ready before returning. This avoids the
+                cost of a round-trip to the server when it is known to be
+                running.
+            cache_size: the maximum number of GET responses that should be
+                cached by the client and revalidated with the server using
+                their entity tags. If zero, responses are not cached.
 
         Raises:
             ValueError: if the provided URL lacks a scheme (e.g., 'http').
@@ -49,14 +59,30 @@ class API(object):
 
         self.__base_url = base_url
         self.__timeout = timeout
+        self.__cache = \
+            ResponseCache(cache_size) if cache_size > 0 else None  # type: Optional[ResponseCache]  # noqa: pycodestyle
+        if check_connection:
+            self.connect(timeout_connection)
 
+    def connect(self, timeout_connection: int = 60) -> None:
+        """
+        Waits until the server is ready to accept requests.
+
+        Parameters:
+            timeout_connection: the maximum numbers of seconds to wait for
+                the server.
+
+        Raises:
+            ConnectionFailure: if a connection to the server could not be
+                established within the connection timeout window.
+        """
+        base_url = self.__base_url
         logger.info("attempting to establish connection to server '%s' with timeout of %d seconds",  # noqa: pycodestyle
                     base_url,
-                    timeout)
+                    timeout_connection)
         url = self.url("status")
         time_started = timer()
-        connected = False
-        while not connected:
+        while True:
             time_running = timer() - time_started
             time_left = timeout_connection - time_running
             if time_left <= 0.0:
@@ -64,8 +90,9 @@ class API(object):
                 raise ConnectionFailure
             try:
                 r = requests.get(url, timeout=time_left)
-                connected = r.status_code == 204
-                logger.info("connected to server: %s", base_url)
+                if r.status_code in (200, 204):
+                    logger.info("connected to server: %s", base_url)
+                    return
             except requests.exceptions.ConnectionError:
                 time.sleep(1.0)
             except requests.exceptions.Timeout:
@@ -80,6 +107,13 @@ class API(object):
         """
         return self.__base_url
 
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """
+        The cache of responses held by this client, if any.
+        """
+        return self.__cache
+
     def handle_erroneous_response(self,
                                   response: requests.Response
                                   ) -> NoReturn:
@@ -113,11 +147,35 @@ class API(object):
 
     def get(self,
             path: str,
-            params: Dict[str, Any] = None,
+            params: Optional[Dict[str, Any]] = None,
             **kwargs
             ) -> requests.Response:
         url = self.url(path)
-        return requests.get(url, params, **kwargs)
+        cache = self.__cache
+        if cache is None:
+            return requests.get(url, params, **kwargs)
+
+        # revalidate any cached response with the server
+        accept = (kwargs.get('headers') or {}).get('Accept')
+        key = cache.key(url, params, accept)
+        etag = cache.etag(key)
+        if etag:
+            headers = dict(kwargs.pop('headers', None) or {})
+            headers['If-None-Match'] = etag
+            kwargs['headers'] = headers
+        response = requests.get(url, params, **kwargs)
+
+        if response.status_code == 304 and etag:
+            try:
+                logger.debug("using cached response for resource: %s", url)
+                return cache.get(key)
+            except KeyError:
+                # the cached response was evicted in the meantime
+                del kwargs['headers']['If-None-Match']
+                response = requests.get(url, params, **kwargs)
+        if response.status_code == 200 and 'ETag' in response.headers:
+            cache.put(key, response.headers['ETag'], response)
+        return response
 
     def post(self, path: str, data=None, **kwargs) -> requests.Response:
         url = self.url(path)
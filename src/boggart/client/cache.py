@@ -0,0 +1,86 @@
+from typing import Any, Dict, Hashable, Optional, Tuple
+from collections import OrderedDict
+import threading
+
+__all__ = ['ResponseCache']
+
+
+class ResponseCache(object):
+    """
+    A bounded, least-recently-used cache of responses that carry an entity
+    tag (ETag). Cached responses are revalidated with the server by sending
+    their tag in the If-None-Match header of subsequent requests; if the
+    server responds with 304 (Not Modified), the cached response is reused.
+    """
+    def __init__(self, max_size: int = 256) -> None:
+        """
+        Constructs a new, empty cache.
+
+        Parameters:
+            max_size: the maximum number of responses that may be held in
+                the cache at any one time.
+        """
+        assert max_size > 0
+        self.__max_size = max_size
+        self.__contents = OrderedDict()  # type: OrderedDict[Hashable, Tuple[str, Any]]  # noqa: pycodestyle
+        self.__lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of responses that are held in this cache.
+        """
+        return len(self.__contents)
+
+    @staticmethod
+    def key(url: str,
+            params: Optional[Dict[str, Any]] = None,
+            accept: Optional[str] = None
+            ) -> Hashable:
+        """
+        Computes the key under which the response to a given request is
+        stored. Since the server may provide different representations of the
+        same resource, the key includes the media types that are accepted by
+        the request.
+        """
+        items = tuple(sorted((params or {}).items()))
+        return (url, items, accept)
+
+    def etag(self, key: Hashable) -> Optional[str]:
+        """
+        Returns the entity tag of the response that is stored under a given
+        key, or None if there is no such response.
+        """
+        with self.__lock:
+            entry = self.__contents.get(key)
+            return entry[0] if entry else None
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Retrieves the response that is stored under a given key.
+
+        Raises:
+            KeyError: if no response is stored under the given key.
+        """
+        with self.__lock:
+            etag, response = self.__contents[key]
+            self.__contents.move_to_end(key)
+            return response
+
+    def put(self, key: Hashable, etag: str, response: Any) -> None:
+        """
+        Stores a given response, identified by its entity tag, under a
+        given key. If the cache is full, the least-recently-used response is
+        evicted.
+        """
+        with self.__lock:
+            self.__contents[key] = (etag, response)
+            self.__contents.move_to_end(key)
+            while len(self.__contents) > self.__max_size:
+                self.__contents.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Removes all responses from this cache.
+        """
+        with self.__lock:
+            self.__contents.clear()
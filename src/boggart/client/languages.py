@@ -1,4 +1,4 @@
-from typing import Iterator, Dict
+from typing import Iterator, Dict, Optional
 
 from .api import API
 from ..core import Language
@@ -13,28 +13,41 @@ class LanguageCollection(object):
     """
     def __init__(self, api: API) -> None:
         """
-        Constructs a new language collection for a given server.
+        Constructs a new language collection for a given server. The contents
+        of the collection are fetched from the server when they are first
+        accessed.
 
         Parameters:
             api: the low-level client API that should be used to interact
                 with the server.
         """
-        language_dict_list = api.get("/languages").json()
-        languages = [Language.from_dict(d) for d in language_dict_list]
-        self.__contents = \
-            {lang.name: lang for lang in languages}  # type: Dict[str, Language]  # noqa: pycodestyle
+        self.__api = api
+        self.__contents = None  # type: Optional[Dict[str, Language]]
+
+    def _contents(self) -> Dict[str, Language]:
+        """
+        Returns the contents of this collection, indexed by name, fetching
+        them from the server if necessary.
+        """
+        if self.__contents is None:
+            r = self.__api.get("/languages")
+            if r.status_code != 200:
+                self.__api.handle_erroneous_response(r)
+            languages = [Language.from_dict(d) for d in r.json()]
+            self.__contents = {lang.name: lang for lang in languages}
+        return self.__contents
 
     def __iter__(self) -> Iterator[Language]:
         """
         Returns an iterator over the languages within this collection.
         """
-        return self.__contents.values().__iter__()
+        return self._contents().values().__iter__()
 
     def __len__(self) -> int:
         """
         Returns a count of the number of languages within this collection.
         """
-        return len(self.__contents)
+        return len(self._contents())
 
     def __getitem__(self, name: str) -> Language:
         """
@@ -43,4 +56,4 @@ class LanguageCollection(object):
         Raises:
             KeyError: if no language is found with the given name.
         """
-        return self.__contents[name]
+        return self._contents()[name]
@@ -0,0 +1,65 @@
+__all__ = ['accept_header', 'is_media_type', 'decode_mutation_set',
+           'mutations_to_dicts', 'encode_lines']
+
+from typing import Any, Dict, Iterable, List
+
+import requests
+
+from ..core import Mutation, MutationSet, MEDIA_TYPE_MUTATIONS
+
+
+def mutations_to_dicts(mutations: Iterable[Mutation]
+                       ) -> List[Dict[str, Any]]:
+    """
+    Produces dictionary-based descriptions of a sequence of mutations, taking
+    advantage of the columnar layout of mutation sets, where possible.
+    """
+    if isinstance(mutations, MutationSet):
+        return mutations.to_dicts()
+    return [m.to_dict() for m in mutations]
+
+
+def accept_header(media_type: str) -> str:
+    """
+    Produces an Accept header that prefers a given media type to JSON.
+    """
+    return "{}, application/json;q=0.5".format(media_type)
+
+
+def is_media_type(response: requests.Response, media_type: str) -> bool:
+    """
+    Determines whether the body of a given response is of a given media type.
+    """
+    content_type = response.headers.get('Content-Type', '')
+    return content_type.split(';')[0].strip() == media_type
+
+
+def decode_mutation_set(response: requests.Response) -> MutationSet:
+    """
+    Decodes the set of mutations that is contained in the body of a given
+    response, which may either be binary- or JSON-encoded.
+    """
+    if is_media_type(response, MEDIA_TYPE_MUTATIONS):
+        return MutationSet.from_bytes(response.content)
+    return MutationSet.from_dicts(response.json())
+
+
+def encode_lines(lines: Iterable[int]) -> str:
+    """
+    Produces a compact, semi-colon delimited description of a set of line
+    numbers, in which runs of consecutive lines are written as inclusive
+    ranges (e.g., "10-40;55").
+    """
+    parts = []  # type: List[str]
+    ordered = sorted(set(lines))
+    i = 0
+    while i < len(ordered):
+        j = i
+        while j + 1 < len(ordered) and ordered[j + 1] == ordered[j] + 1:
+            j += 1
+        if i == j:
+            parts.append(str(ordered[i]))
+        else:
+            parts.append("{}-{}".format(ordered[i], ordered[j]))
+        i = j + 1
+    return ';'.join(parts)
@@ -1,47 +1,175 @@
 __all__ = ['MutantCollection']
 
-from typing import Iterator
+from typing import Iterator, Iterable, List, Mapping, Optional, Dict, Any
 from uuid import UUID
 
+from requests.utils import parse_header_links
+
 from .api import API
-from ..core import Mutant
+from .media import accept_header, is_media_type
+from ..core import Mutant, MEDIA_TYPE_MUTANTS
+
+
+def next_page_url(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    Extracts the URL of the next page of a paginated list from the headers of
+    a response, or returns None if there is no such page.
+    """
+    for link in parse_header_links(headers.get('Link', '')):
+        if link.get('rel') == 'next':
+            return link['url']
+    return None
 
 
 class MutantCollection(object):
     """
     Provides access to the mutants that are registered with a given server.
     """
-    def __init__(self, api: API) -> None:
+    def __init__(self, api: API, *, page_size: int = 1000) -> None:
         """
         Constructs a new mutant collection for a given server.
 
         Parameters:
             api: the low-level client API that should be used to interact
                 with the server.
+            page_size: the number of mutants that should be fetched from the
+                server in each request.
         """
+        assert page_size > 0
         self.__api = api
+        self.__page_size = page_size
 
-    def clear(self) -> None:
+    def clear(self, *, workers: int = 8) -> Dict[UUID, str]:
         """
         Destroys all registered mutants.
+
+        Parameters:
+            workers: the maximum number of mutants that the server may
+                destroy in parallel.
+
+        Returns:
+            a mapping from the UUID of each mutant whose resources could not
+            be destroyed to a description of the failure.
         """
-        r = self.__api.delete("/mutants")
-        if r.status_code != 204:
-            self.__api.handle_erroneous_response(r)
+        r = self.__api.delete("/mutants", params={'workers': workers})
+        if r.status_code == 204:
+            return {}
+        if r.status_code == 200:
+            failures = r.json()['failures']
+            return {UUID(hex=k): v for (k, v) in failures.items()}
+        self.__api.handle_erroneous_response(r)
+
+    def clear_in_background(self, *, workers: int = 8) -> str:
+        """
+        Instructs the server to destroy all registered mutants using a
+        background job.
+
+        Parameters:
+            workers: the maximum number of mutants that the server may
+                destroy in parallel.
+
+        Returns:
+            the identifier of the background job, which may be inspected via
+            `Client.job`.
+        """
+        params = {'workers': workers, 'async': 1}
+        r = self.__api.delete("/mutants", params=params)
+        if r.status_code == 202:
+            return r.json()['job']
+        self.__api.handle_erroneous_response(r)
 
     def __iter__(self) -> Iterator[UUID]:
         """
         Returns an iterator over the UUIDs of mutants within this collection.
+        UUIDs are fetched from the server one page at a time.
+        """
+        return self.find()
+
+    def find(self,
+             *,
+             base: Optional[str] = None,
+             operator: Optional[str] = None
+             ) -> Iterator[UUID]:
+        """
+        Returns an iterator over the UUIDs of mutants within this collection
+        that satisfy a set of optional filters. UUIDs are fetched from the
+        server one page at a time.
+
+        Parameters:
+            base: if given, only mutants of the snapshot with this name are
+                included.
+            operator: if given, only mutants that were generated using the
+                operator with this name are included.
+        """
+        filters = {'limit': self.__page_size}  # type: Dict[str, Any]
+        if base is not None:
+            filters['base'] = base
+        if operator is not None:
+            filters['operator'] = operator
+
+        path = "/mutants"  # type: Optional[str]
+        params = filters  # type: Optional[Dict[str, Any]]
+        while path:
+            r = self.__api.get(path, params)
+            if r.status_code != 200:
+                self.__api.handle_erroneous_response(r)
+            yield from (UUID(hex=s) for s in r.json())
+            # the link to the next page carries all of the parameters
+            path, params = next_page_url(r.headers), None
+
+    def count(self,
+              *,
+              base: Optional[str] = None,
+              operator: Optional[str] = None
+              ) -> int:
         """
-        uuid_str_list = self.__api.get("/mutants").json()
-        uuid_list = [UUID(hex=s) for s in uuid_str_list]
-        yield from uuid_list
+        Counts the number of mutants within this collection that satisfy a
+        set of optional filters.
+
+        Parameters:
+            base: if given, only mutants of the snapshot with this name are
+                counted.
+            operator: if given, only mutants that were generated using the
+                operator with this name are counted.
+        """
+        params = {}  # type: Dict[str, str]
+        if base is not None:
+            params['base'] = base
+        if operator is not None:
+            params['operator'] = operator
+        r = self.__api.get("/mutants/count", params)
+        if r.status_code != 200:
+            self.__api.handle_erroneous_response(r)
+        return r.json()
 
     def __len__(self) -> int:
         """
         Returns a count of the number of mutants in this collection.
         """
-        return len(list(self))
+        return self.count()
+
+    def describe(self, uuids: Iterable[UUID]) -> List[Mutant]:
+        """
+        Returns descriptions of the mutants associated with a given sequence
+        of UUIDs, fetched using as few requests as possible.
+
+        Raises:
+            MutantNotFound: if no mutant is found for one of the given UUIDs.
+        """
+        uuids = list(uuids)
+        mutants = []  # type: List[Mutant]
+        for i in range(0, len(uuids), self.__page_size):
+            batch = uuids[i:i + self.__page_size]
+            params = {'uuids': ';'.join(uuid.hex for uuid in batch)}
+            headers = {'Accept': accept_header(MEDIA_TYPE_MUTANTS)}
+            r = self.__api.get("/mutants", params, headers=headers)
+            if r.status_code != 200:
+                self.__api.handle_erroneous_response(r)
+            if is_media_type(r, MEDIA_TYPE_MUTANTS):
+                mutants += Mutant.list_from_bytes(r.content)
+            else:
+                mutants += [Mutant.from_dict(d) for d in r.json()]
+        return mutants
 
     def __delitem__(self, uuid: UUID) -> None:
         """
@@ -1,4 +1,4 @@
-from typing import Iterator, Dict
+from typing import Iterator, Dict, Optional
 
 from .api import API
 from ..core import Operator
@@ -11,28 +11,41 @@ class OperatorCollection(object):
     """
     def __init__(self, api: API) -> None:
         """
-        Constructs a new language collection for a given server.
+        Constructs a new operator collection for a given server. The contents
+        of the collection are fetched from the server when they are first
+        accessed.
 
         Parameters:
             api: the low-level client API that should be used to interact
                 with the server.
         """
-        dict_list = api.get("/operators").json()
-        operators = [Operator.from_dict(d) for d in dict_list]
-        self.__contents = \
-            {op.name: op for op in operators}  # type: Dict[str, Operator]
+        self.__api = api
+        self.__contents = None  # type: Optional[Dict[str, Operator]]
+
+    def _contents(self) -> Dict[str, Operator]:
+        """
+        Returns the contents of this collection, indexed by name, fetching
+        them from the server if necessary.
+        """
+        if self.__contents is None:
+            r = self.__api.get("/operators")
+            if r.status_code != 200:
+                self.__api.handle_erroneous_response(r)
+            operators = [Operator.from_dict(d) for d in r.json()]
+            self.__contents = {op.name: op for op in operators}
+        return self.__contents
 
     def __iter__(self) -> Iterator[Operator]:
         """
         Returns an iterator over the operators within this collection.
         """
-        return self.__contents.values().__iter__()
+        return self._contents().values().__iter__()
 
     def __len__(self) -> int:
         """
         Returns a count of the number of operators within this collection.
         """
-        return len(self.__contents)
+        return len(self._contents())
 
     def __getitem__(self, name: str) -> Operator:
         """
@@ -41,4 +54,4 @@ class OperatorCollection(object):
         Raises:
             KeyError: if no operator is found with the given name.
         """
-        return self.__contents[name]
+        return self._contents()[name]
@@ -1,10 +1,13 @@
 from typing import Optional
+import hashlib
+import json
 import logging
 
 import yaml
 
 from .languages import Languages
 from .operators import Operators
+from .sources import Sources, SourceRule
 from ..exceptions import BadConfigFile
 
 logger = logging.getLogger(__name__)
@@ -25,11 +28,12 @@ class Configuration(object):
         logger.debug("Using parent configuration: %s", config)
         languages = config.languages
         operators = config.operators
+        sources = config.sources
 
         logger.debug("Attempting to read contents of config file: %s",
                      filename)
         with open(filename, 'r') as f:
-            yml = yaml.load(f)
+            yml = yaml.safe_load(f)
         logger.debug("Read YAML contents of config file: %s",
                      filename)
 
@@ -51,19 +55,25 @@ class Configuration(object):
                                 languages=languages,
                                 base=operators)
         logger.debug("Loaded operators from config file.")
+        logger.debug("Loading sources from config file.")
+        sources = Sources.from_defs(yml.get('sources', []), sources)
+        logger.debug("Loaded sources from config file.")
         logger.debug("Loaded configuration from file: %s", filename)
-        return Configuration(languages, operators)
+        return Configuration(languages, operators, sources)
 
     def __init__(self,
                  languages: Optional[Languages] = None,
-                 operators: Optional[Operators] = None
+                 operators: Optional[Operators] = None,
+                 sources: Optional[Sources] = None
                  ) -> None:
         """
         Constructs a configuration that supports a given set of operators and
-        languages.
+        languages, and reads source files from a given set of sources.
         """
         self.__languages = languages if languages else Languages()
         self.__operators = operators if operators else Operators()
+        self.__sources = sources if sources else Sources()
+        self.__digest = None  # type: Optional[str]
 
     @property
     def languages(self) -> Languages:
@@ -78,3 +88,29 @@ class Configuration(object):
         The mutation operators defined by this configuration.
         """
         return self.__operators
+
+    @property
+    def sources(self) -> Sources:
+        """
+        The rules that determine where the source files of each snapshot are
+        read from.
+        """
+        return self.__sources
+
+    @property
+    def digest(self) -> str:
+        """
+        A hexadecimal digest of the contents of this configuration. Two
+        configurations that define the same languages and operators share the
+        same digest.
+        """
+        if self.__digest is None:
+            jsn = {
+                'languages': [lang.to_dict() for lang in self.languages],
+                'operators': [op.to_dict() for op in self.operators]
+            }
+            jsn['languages'].sort(key=lambda d: d['name'])
+            jsn['operators'].sort(key=lambda d: d['name'])
+            content = json.dumps(jsn, sort_keys=True).encode('utf-8')
+            self.__digest = hashlib.sha256(content).hexdigest()
+        return self.__digest
@@ -113,7 +113,7 @@ class Languages(object):
         """
         endings = set()  # type: Set[str]
         for language in self:
-            endings.union(language.file_endings)
+            endings.update(language.file_endings)
         return frozenset(endings)
 
     def detect(self, filename: str) -> Language:
@@ -0,0 +1,109 @@
+from typing import Iterator, Any, List, Optional, Dict
+import fnmatch
+import logging
+
+import attr
+
+from ..exceptions import IllegalConfig
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['Sources', 'SourceRule']
+
+#: The kinds of source provider that may be named by a configuration.
+SOURCE_TYPES = ('bugzoo', 'directory', 'git')
+
+
+@attr.s(frozen=True)
+class SourceRule(object):
+    """
+    Describes where the source files for snapshots whose names match a given
+    glob pattern should be read from. Occurrences of `{snapshot}` within the
+    path and revision are replaced by the name of the snapshot.
+    """
+    snapshots = attr.ib(type=str)
+    type = attr.ib(type=str)
+    path = attr.ib(type=Optional[str], default=None)
+    revision = attr.ib(type=Optional[str], default=None)
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'SourceRule':
+        """
+        Constructs a source rule from a dictionary-based description.
+
+        Raises:
+            IllegalConfig: if the description names an unknown type of
+                provider, or omits a path to a directory or git repository.
+        """
+        snapshots = d.get('snapshots', '*')
+        kind = d.get('type')
+        if kind not in SOURCE_TYPES:
+            msg = "unknown source type, '{}': expected one of {}."
+            raise IllegalConfig(msg.format(kind, ', '.join(SOURCE_TYPES)))
+        path = d.get('path')
+        if kind != 'bugzoo' and not path:
+            msg = "missing 'path' for '{}' source: {}"
+            raise IllegalConfig(msg.format(kind, snapshots))
+        if d.get('revision') and kind != 'git':
+            msg = "'revision' is only supported by 'git' sources: {}"
+            raise IllegalConfig(msg.format(snapshots))
+        return SourceRule(snapshots, kind, path, d.get('revision'))
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {'snapshots': self.snapshots, 'type': self.type}
+        if self.path:
+            d['path'] = self.path
+        if self.revision:
+            d['revision'] = self.revision
+        return d
+
+    def matches(self, snapshot_name: str) -> bool:
+        """
+        Determines whether this rule applies to a snapshot with a given name.
+        """
+        return fnmatch.fnmatchcase(snapshot_name, self.snapshots)
+
+
+class Sources(object):
+    """
+    Maintains the ordered rules that determine where the source files of
+    each snapshot are read from. Snapshots that are not matched by any rule
+    are read from BugZoo containers.
+    """
+    @staticmethod
+    def from_defs(defs: List[Any], base: 'Sources' = None) -> 'Sources':
+        """
+        Loads a collection of source rules from a list of definitions taken
+        from a configuration file, together with an optionally provided
+        parent (overall) configuration. Rules given by the definitions take
+        precedence over those of the parent.
+        """
+        logger.debug("Loading sources from definitions: %s", defs)
+        rules = [SourceRule.from_dict(d) for d in defs]
+        if base:
+            rules += list(base)
+        logger.debug("Loaded sources from definitions.")
+        return Sources(rules)
+
+    def __init__(self, rules: Optional[List[SourceRule]] = None) -> None:
+        self.__rules = list(rules) if rules else []
+
+    def __iter__(self) -> Iterator[SourceRule]:
+        """
+        Returns an iterator over the rules in this collection, in order of
+        precedence.
+        """
+        yield from self.__rules
+
+    def __len__(self) -> int:
+        return len(self.__rules)
+
+    def find(self, snapshot_name: str) -> Optional[SourceRule]:
+        """
+        Returns the first rule that applies to a snapshot with a given name,
+        or None if no rule applies.
+        """
+        for rule in self.__rules:
+            if rule.matches(snapshot_name):
+                return rule
+        return None
@@ -1,8 +1,15 @@
 from .language import Language
-from .location import Location, LocationRange, FileLocationRange, FileLine
+from .location import Location, LocationRange, FileLocationRange, FileLine, \
+    FileLocationRangeSet
 from .replacement import Replacement
 from .transformation import Transformation
 from .operator import Operator
 from .mutation import Mutation
-from .mutant import Mutant
+from .mutant import Mutant, MEDIA_TYPE_MUTANTS
+from .mutationset import MutationSet, MEDIA_TYPE_MUTATIONS
+from .delta import MutationDelta
+from .summary import MutationSummary
+from .lexical import LexicalMask
+from .tokens import TokenIndex
 from .constraint import Constraint
+from .plan import ConstraintPlan, ConstraintStatistics
@@ -1,33 +1,69 @@
-__all__ = ['Constraint', 'IsSingleTerm', 'PrecededBy']
+__all__ = ['Constraint', 'IsSingleTerm', 'PrecededBy', 'NotInComment',
+           'NotInString', 'NotInPreprocessor', 'WholeToken',
+           'COST_CHEAP', 'COST_MODERATE', 'COST_EXPENSIVE']
 
-from typing import Any, Dict, FrozenSet
+from typing import Any, Dict, FrozenSet, Optional
 import attr
 import logging
 
 from rooibos import Match
-from bugzoo import Bug as Snapshot
+
+from .lexical import LexicalMask, COMMENT, STRING, PREPROCESSOR
+from .tokens import TokenIndex
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
 
+#: Describes constraints that take constant time to check.
+COST_CHEAP = 0
+
+#: Describes constraints whose cost grows with the size of the match.
+COST_MODERATE = 1
+
+#: Describes constraints whose cost grows with the size of the file.
+COST_EXPENSIVE = 2
+
 
 @attr.s(frozen=True)
 class Constraint(object):
+    #: The cost class of this constraint, used to decide the order in which
+    #: constraints are checked.
+    COST = COST_EXPENSIVE
+
     @staticmethod
     def from_dict(d: dict) -> 'Constraint':
         if d['type'] == 'is-single-term':
             return IsSingleTerm.from_dict(d)
         if d['type'] == 'preceded-by':
             return PrecededBy.from_dict(d)
+        if d['type'] == 'not-in-comment':
+            return NotInComment()
+        if d['type'] == 'not-in-string':
+            return NotInString()
+        if d['type'] == 'not-in-preprocessor':
+            return NotInPreprocessor()
+        if d['type'] == 'whole-token':
+            return WholeToken()
         raise SyntaxError("unrecognized constraint")
 
     def is_satisfied_by(self,
                         match: Match,
                         content_file: str,
                         offset_start: int,
-                        offset_stop: int
+                        offset_stop: int,
+                        *,
+                        mask: Optional[LexicalMask] = None,
+                        tokens: Optional[TokenIndex] = None
                         ) -> bool:
         """
         Checks whether a given match satisfies this constraint.
+
+        Parameters:
+            match: the template match.
+            content_file: the contents of the file.
+            offset_start: the offset at which the match begins.
+            offset_stop: the offset at which the match ends.
+            mask: the lexical mask for the file, if known.
+            tokens: the token index for the file, if known.
         """
         raise NotImplementedError
 
@@ -37,6 +73,8 @@ class Constraint(object):
 
 @attr.s(frozen=True)
 class IsSingleTerm(Constraint):
+    COST = COST_MODERATE
+
     @staticmethod
     def from_dict(d: dict) -> 'IsSingleTerm':
         assert 'hole' in d
@@ -49,7 +87,10 @@ class IsSingleTerm(Constraint):
                         match: Match,
                         content_file: str,
                         offset_start: int,
-                        offset_stop: int
+                        offset_stop: int,
+                        *,
+                        mask: Optional[LexicalMask] = None,
+                        tokens: Optional[TokenIndex] = None
                         ) -> bool:
         # NOTE bug in rooibos causes empty terms to be omitted
         if self.hole not in match.environment:
@@ -65,6 +106,8 @@ class IsSingleTerm(Constraint):
 
 @attr.s(frozen=True)
 class PrecededBy(Constraint):
+    COST = COST_EXPENSIVE
+
     @staticmethod
     def from_dict(d: dict) -> 'PrecededBy':
         assert 'any-of' in d
@@ -80,11 +123,85 @@ class PrecededBy(Constraint):
                         match: Match,
                         content_file: str,
                         offset_start: int,
-                        offset_stop: int
+                        offset_stop: int,
+                        *,
+                        mask: Optional[LexicalMask] = None,
+                        tokens: Optional[TokenIndex] = None
                         ) -> bool:
         preceded_by = content_file[:offset_start].rstrip()
         return any(preceded_by.endswith(opt) for opt in self.options)
 
     def to_dict(self) -> Dict[str, Any]:
         return {'type': 'preceded-by',
-                'any-of': list(self.options)}
+                'any-of': sorted(self.options)}
+
+
+@attr.s(frozen=True)
+class _NotInRegion(Constraint):
+    """
+    Rejects matches that begin or end within a given kind of lexical region.
+    Matches are accepted when no lexical mask is available.
+    """
+    COST = COST_CHEAP
+    KIND = 0
+    NAME = ''
+
+    def is_satisfied_by(self,
+                        match: Match,
+                        content_file: str,
+                        offset_start: int,
+                        offset_stop: int,
+                        *,
+                        mask: Optional[LexicalMask] = None,
+                        tokens: Optional[TokenIndex] = None
+                        ) -> bool:
+        if mask is None:
+            return True
+        return not mask.touches(offset_start, offset_stop, self.KIND)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'type': self.NAME}
+
+
+@attr.s(frozen=True)
+class NotInComment(_NotInRegion):
+    KIND = COMMENT
+    NAME = 'not-in-comment'
+
+
+@attr.s(frozen=True)
+class NotInString(_NotInRegion):
+    KIND = STRING
+    NAME = 'not-in-string'
+
+
+@attr.s(frozen=True)
+class NotInPreprocessor(_NotInRegion):
+    KIND = PREPROCESSOR
+    NAME = 'not-in-preprocessor'
+
+
+@attr.s(frozen=True)
+class WholeToken(Constraint):
+    """
+    Rejects matches that begin or end part-way through a token, such as a
+    match of "<" within "<<" or "<=". Matches are accepted when no token
+    index is available.
+    """
+    COST = COST_CHEAP
+
+    def is_satisfied_by(self,
+                        match: Match,
+                        content_file: str,
+                        offset_start: int,
+                        offset_stop: int,
+                        *,
+                        mask: Optional[LexicalMask] = None,
+                        tokens: Optional[TokenIndex] = None
+                        ) -> bool:
+        if tokens is None:
+            return True
+        return tokens.is_whole(offset_start, offset_stop)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'type': 'whole-token'}
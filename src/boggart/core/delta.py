@@ -0,0 +1,55 @@
+from typing import Any, Dict
+
+import attr
+
+from .mutationset import MutationSet
+from ..exceptions import BadFormat
+
+__all__ = ['MutationDelta']
+
+
+@attr.s(frozen=True, slots=True, repr=False)
+class MutationDelta(object):
+    """
+    Describes how the mutations that can be applied to a file change between
+    a base version and a target version of that file.
+
+    Attributes:
+        added: mutations to the target version of the file that have no
+            counterpart in the base version.
+        removed: mutations to the base version of the file that no longer
+            apply to the target version.
+        carried: mutations to the base version of the file that also apply
+            to the target version, given at their locations in the target.
+    """
+    added = attr.ib(type=MutationSet)
+    removed = attr.ib(type=MutationSet)
+    carried = attr.ib(type=MutationSet)
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'MutationDelta':
+        """
+        Constructs a mutation delta from a dictionary-based description.
+
+        Raises:
+            BadFormat: if the provided dictionary does not match the expected
+                format.
+        """
+        try:
+            return MutationDelta(MutationSet.from_dicts(d['added']),
+                                 MutationSet.from_dicts(d['removed']),
+                                 MutationSet.from_dicts(d['carried']))
+        except (KeyError, TypeError):
+            raise BadFormat("expected 'added', 'removed' and 'carried' lists")
+
+    def __repr__(self) -> str:
+        s = "MutationDelta(added={}, removed={}, carried={})"
+        return s.format(len(self.added), len(self.removed), len(self.carried))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns a dictionary-based description of this delta.
+        """
+        return {'added': self.added.to_dicts(),
+                'removed': self.removed.to_dicts(),
+                'carried': self.carried.to_dicts()}
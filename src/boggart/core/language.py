@@ -1,11 +1,20 @@
-from typing import Iterable, List, Any
+from typing import FrozenSet
+
+import attr
 
 __all__ = ['Language']
 
 
+@attr.s(frozen=True, slots=True, cache_hash=True, repr=False)
 class Language(object):
     """
     Represents a programming language that is supported by boggart.
+
+    Attributes:
+        name: the name of the language.
+        file_endings: the set of known file endings used by this language.
+            These are used to automatically detect the language used by a
+            given file when language information is not explicitly provided.
     """
     @staticmethod
     def from_dict(d: dict) -> 'Language':
@@ -19,37 +28,13 @@ class Language(object):
         file_endings = d['file-endings']
         return Language(name, file_endings)
 
-    def __init__(self,
-                 name: str,
-                 file_endings: List[str]
-                 ) -> None:
-        self.__name = name
-        self.__file_endings = frozenset(file_endings)
-
-    def __eq__(self, other: Any) -> bool:
-        return isinstance(other, Language) and \
-               self.name == other.name and \
-               list(self.file_endings) == list(other.file_endings)
+    name = attr.ib(type=str)
+    file_endings = attr.ib(type=FrozenSet[str],
+                           converter=frozenset)  # type: ignore
 
     def __repr__(self) -> str:
         return "Language({self.name})".format(self=self)
 
-    @property
-    def name(self) -> str:
-        """
-        The name of the language.
-        """
-        return self.__name
-
-    @property
-    def file_endings(self) -> Iterable[str]:
-        """
-        A list of known file endings used by this language. These are used to
-        automatically detect the language used by a given file when language
-        information is not explicitly provided.
-        """
-        return self.__file_endings.__iter__()
-
     def to_dict(self) -> dict:
         """
         Provides a dictionary-based description of this language, ready to be
@@ -57,5 +42,5 @@ class Language(object):
         """
         return {
             'name': self.name,
-            'file-endings': list(self.file_endings)
+            'file-endings': sorted(self.file_endings)
         }
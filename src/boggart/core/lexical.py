@@ -0,0 +1,173 @@
+"""
+Provides a coarse lexical analysis of source files that marks the
+characters belonging to comments, string and character literals, and
+preprocessor directives.
+"""
+__all__ = ['LexicalMask', 'COMMENT', 'STRING', 'PREPROCESSOR']
+
+from typing import Callable, Dict, List, Tuple
+import re
+
+#: Flags the characters that belong to a comment.
+COMMENT = 1
+
+#: Flags the characters that belong to a string or character literal.
+STRING = 2
+
+#: Flags the characters that belong to a preprocessor directive.
+PREPROCESSOR = 4
+
+_PREPROCESSOR_TABLE = bytes(b | PREPROCESSOR for b in range(256))
+
+_Regions = List[Tuple[int, int, int]]
+
+
+def _end_of_line(text: str, offset: int) -> int:
+    stop = text.find('\n', offset)
+    return len(text) if stop == -1 else stop
+
+
+def _end_of_quote(text: str, offset: int, quote: str) -> int:
+    """
+    Finds the offset immediately after the closing quote of a literal that
+    begins at a given offset. Unless the quote is tripled, unterminated
+    literals end at the end of their line.
+    """
+    n = len(text)
+    i = offset + len(quote)
+    while i < n:
+        if text[i] == '\\':
+            i += 2
+        elif text.startswith(quote, i):
+            return i + len(quote)
+        elif text[i] == '\n' and len(quote) == 1:
+            return i
+        else:
+            i += 1
+    return n
+
+
+_C_TOKENS = re.compile(r'//|/\*|["\']|^[ \t]*#', re.MULTILINE)
+_PYTHON_TOKENS = re.compile(r'#|\'\'\'|"""|["\']')
+
+
+def _lex_c_family(text: str, preprocessor: bool) -> _Regions:
+    regions = []  # type: _Regions
+    n = len(text)
+    i = 0
+    while True:
+        m = _C_TOKENS.search(text, i)
+        if not m:
+            return regions
+        token = m.group()
+        start = m.start()
+        if token == '//':
+            stop = _end_of_line(text, start)
+            regions.append((start, stop, COMMENT))
+        elif token == '/*':
+            stop = text.find('*/', start + 2)
+            stop = n if stop == -1 else stop + 2
+            regions.append((start, stop, COMMENT))
+        elif token in ('"', "'"):
+            stop = _end_of_quote(text, start, token)
+            regions.append((start, stop, STRING))
+        else:
+            # directives continue onto the next line after a backslash, and
+            # may themselves contain comments and literals
+            stop = m.end()
+            if preprocessor:
+                start = stop - 1
+                end = _end_of_line(text, start)
+                while end < n and text[end - 1] == '\\':
+                    end = _end_of_line(text, end + 1)
+                regions.append((start, end, PREPROCESSOR))
+        i = stop
+
+
+def _lex_c(text: str) -> _Regions:
+    return _lex_c_family(text, preprocessor=True)
+
+
+def _lex_java(text: str) -> _Regions:
+    return _lex_c_family(text, preprocessor=False)
+
+
+def _lex_python(text: str) -> _Regions:
+    regions = []  # type: _Regions
+    i = 0
+    while True:
+        m = _PYTHON_TOKENS.search(text, i)
+        if not m:
+            return regions
+        token = m.group()
+        start = m.start()
+        if token == '#':
+            stop = _end_of_line(text, start)
+            regions.append((start, stop, COMMENT))
+        else:
+            stop = _end_of_quote(text, start, token)
+            regions.append((start, stop, STRING))
+        i = stop
+
+
+_LEXERS = {
+    'C': _lex_c,
+    'C++': _lex_c,
+    'Java': _lex_java,
+    'Python': _lex_python
+}  # type: Dict[str, Callable[[str], _Regions]]
+
+
+class LexicalMask(object):
+    """
+    Records, for each character of a source file, whether that character
+    belongs to a comment, a literal or a preprocessor directive, allowing
+    the lexical context of any character to be determined in constant time.
+    Files written in languages without a known lexical structure are left
+    unmasked.
+    """
+    @staticmethod
+    def build(text: str, language: str) -> 'LexicalMask':
+        """
+        Computes the lexical mask for a given text, written in the language
+        with a given name.
+        """
+        flags = bytearray(len(text))
+        lexer = _LEXERS.get(language)
+        if lexer is None:
+            return LexicalMask(flags)
+
+        directives = []  # type: List[Tuple[int, int]]
+        for (start, stop, kind) in lexer(text):
+            if kind == PREPROCESSOR:
+                directives.append((start, stop))
+            else:
+                flags[start:stop] = bytes((kind,)) * (stop - start)
+
+        # directives may contain comments and literals
+        table = _PREPROCESSOR_TABLE
+        for (start, stop) in directives:
+            flags[start:stop] = flags[start:stop].translate(table)
+        return LexicalMask(flags)
+
+    def __init__(self, flags: bytearray) -> None:
+        self.__flags = flags
+
+    def __len__(self) -> int:
+        return len(self.__flags)
+
+    def flags(self, offset: int) -> int:
+        """
+        Returns the flags for the character at a given offset.
+        """
+        if 0 <= offset < len(self.__flags):
+            return self.__flags[offset]
+        return 0
+
+    def touches(self, offset_start: int, offset_stop: int, kind: int) -> bool:
+        """
+        Determines whether the first or last character of a given range
+        carries a given flag.
+        """
+        last = max(offset_start, offset_stop - 1)
+        return bool((self.flags(offset_start) | self.flags(last)) & kind)
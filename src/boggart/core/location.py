@@ -1,4 +1,5 @@
-from typing import Any, List, Dict, Iterable, Iterator
+from typing import Any, List, Dict, FrozenSet, Iterable, Iterator, Tuple
+import bisect
 
 import attr
 
@@ -91,11 +92,13 @@ class LocationRange(object):
         """
         Determines whether a given location is contained within this range.
         """
-        left = loc.line > self.start.line \
-            or (loc.line == self.start.line and loc.col >= self.start.col)
-        right = loc.line < self.stop.line \
-            or (loc.line == self.stop.line and loc.col < self.stop.col)
-        return left and right
+        start, stop = self.start, self.stop
+        line = loc.line
+        if line < start.line or line > stop.line:
+            return False
+        if line == start.line and loc.col < start.col:
+            return False
+        return line < stop.line or loc.col < stop.col
 
 
 @attr.s(frozen=True, repr=False)
@@ -135,28 +138,211 @@ class FileLocationRange(object):
         return in_file and in_range
 
 
+def _key(line: int, col: int) -> int:
+    """
+    Encodes a line and column as a single integer that preserves the order of
+    locations.
+    """
+    return (line << 32) | col
+
+
+def _location(key: int) -> Location:
+    return Location(key >> 32, key & 0xFFFFFFFF)
+
+
 class FileLocationRangeSet(object):
+    """
+    Represents the set of locations that are covered by a collection of file
+    location ranges.
+
+    Ranges are indexed by file as sorted arrays of disjoint intervals, with
+    each location encoded as a single integer key. Point and overlap queries
+    are answered in logarithmic time by binary search. Overlapping and
+    adjacent ranges within a file are merged upon construction, and so
+    iterating over the set yields the smallest equivalent sequence of
+    disjoint ranges, ordered by file name and location.
+    """
+    @staticmethod
+    def from_offsets(filename: str,
+                     contents: str,
+                     offsets: Iterable[Tuple[int, int]]
+                     ) -> 'FileLocationRangeSet':
+        """
+        Constructs a set of ranges in a single file from a sequence of
+        character offset ranges.
+
+        Parameters:
+            filename: the name of the file.
+            contents: the contents of the file.
+            offsets: a sequence of start and stop character offsets, where
+                the stop offset is exclusive.
+        """
+        line_starts = [0]
+        offset = contents.find('\n')
+        while offset != -1:
+            line_starts.append(offset + 1)
+            offset = contents.find('\n', offset + 1)
+
+        def key(offset: int) -> int:
+            line = bisect.bisect_right(line_starts, offset)
+            return _key(line, offset - line_starts[line - 1])
+
+        intervals = [(key(start), key(stop)) for (start, stop) in offsets]
+        return FileLocationRangeSet._from_intervals({filename: intervals})
+
+    @staticmethod
+    def _from_intervals(fn_to_intervals: Dict[str, List[Tuple[int, int]]]
+                        ) -> 'FileLocationRangeSet':
+        range_set = FileLocationRangeSet([])
+        for filename, intervals in fn_to_intervals.items():
+            starts, stops = FileLocationRangeSet._merge(intervals)
+            if starts:
+                range_set.__fn_to_starts[filename] = starts
+                range_set.__fn_to_stops[filename] = stops
+        return range_set
+
+    @staticmethod
+    def _merge(intervals: Iterable[Tuple[int, int]]
+               ) -> Tuple[List[int], List[int]]:
+        """
+        Merges a sequence of intervals into sorted arrays of the starts and
+        stops of equivalent disjoint intervals. Empty intervals are dropped.
+        """
+        starts = []  # type: List[int]
+        stops = []  # type: List[int]
+        for start, stop in sorted(intervals):
+            if start >= stop:
+                continue
+            if stops and start <= stops[-1]:
+                stops[-1] = max(stops[-1], stop)
+            else:
+                starts.append(start)
+                stops.append(stop)
+        return starts, stops
+
     def __init__(self, ranges: Iterable[FileLocationRange]) -> None:
         """
-        Represents a set of file location ranges.
+        Constructs a set from a sequence of file location ranges.
         """
-        self.__fn_to_ranges = {}  # type: Dict[str, List[FileLocationRange]]
+        self.__fn_to_starts = {}  # type: Dict[str, List[int]]
+        self.__fn_to_stops = {}  # type: Dict[str, List[int]]
+        fn_to_intervals = {}  # type: Dict[str, List[Tuple[int, int]]]
         for r in ranges:
-            if r.filename not in self.__fn_to_ranges:
-                self.__fn_to_ranges[r.filename] = []
-            self.__fn_to_ranges[r.filename].append(r)
+            start = _key(r.start.line, r.start.col)
+            stop = _key(r.stop.line, r.stop.col)
+            fn_to_intervals.setdefault(r.filename, []).append((start, stop))
+        for filename, intervals in fn_to_intervals.items():
+            starts, stops = self._merge(intervals)
+            if starts:
+                self.__fn_to_starts[filename] = starts
+                self.__fn_to_stops[filename] = stops
+
+    def _intervals(self, filename: str) -> Iterator[Tuple[int, int]]:
+        starts = self.__fn_to_starts.get(filename, [])
+        stops = self.__fn_to_stops.get(filename, [])
+        return zip(starts, stops)
+
+    @property
+    def filenames(self) -> FrozenSet[str]:
+        """
+        The names of the files that contain at least one range in this set.
+        """
+        return frozenset(self.__fn_to_starts)
 
     def __iter__(self) -> Iterator[FileLocationRange]:
-        for f_ranges in self.__fn_to_ranges.values():
-            yield from f_ranges
+        for filename in sorted(self.__fn_to_starts):
+            for start, stop in self._intervals(filename):
+                location_range = LocationRange(_location(start),
+                                               _location(stop))
+                yield FileLocationRange(filename, location_range)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of disjoint ranges in this set.
+        """
+        return sum(len(starts) for starts in self.__fn_to_starts.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.__fn_to_starts)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, FileLocationRangeSet) and \
+            self.__fn_to_starts == other.__fn_to_starts and \
+            self.__fn_to_stops == other.__fn_to_stops
 
     def __repr__(self) -> str:
-        return "FileLocationRangeSet({})".format(self.__fn_to_ranges)
+        ranges = ', '.join(str(r) for r in self)
+        return "FileLocationRangeSet({})".format(ranges)
 
     def __contains__(self, location: FileLocation) -> bool:
         """
         Determines whether a given file location is contained in one of the
         ranges within this set.
         """
-        ranges = self.__fn_to_ranges.get(location.filename, [])
-        return any(location in r for r in ranges)
+        return self.contains(location.filename,
+                             location.line,
+                             location.col)
+
+    def contains(self, filename: str, line: int, col: int) -> bool:
+        """
+        Determines whether the location at a given line and column of a
+        given file is contained in one of the ranges within this set.
+        """
+        starts = self.__fn_to_starts.get(filename)
+        if not starts:
+            return False
+        key = _key(line, col)
+        i = bisect.bisect_right(starts, key) - 1
+        return i >= 0 and key < self.__fn_to_stops[filename][i]
+
+    def overlaps(self, location: FileLocationRange) -> bool:
+        """
+        Determines whether a given file location range overlaps with at least
+        one of the ranges within this set.
+        """
+        starts = self.__fn_to_starts.get(location.filename)
+        if not starts:
+            return False
+        start = _key(location.start.line, location.start.col)
+        stop = _key(location.stop.line, location.stop.col)
+        stops = self.__fn_to_stops[location.filename]
+        i = bisect.bisect_right(stops, start)
+        return i < len(starts) and starts[i] < stop
+
+    def union(self, other: 'FileLocationRangeSet') -> 'FileLocationRangeSet':
+        """
+        Returns the set of locations that belong to either this set or a
+        given set.
+        """
+        filenames = self.filenames | other.filenames
+        return FileLocationRangeSet._from_intervals({
+            fn: list(self._intervals(fn)) + list(other._intervals(fn))
+            for fn in filenames})
+
+    def intersection(self,
+                     other: 'FileLocationRangeSet'
+                     ) -> 'FileLocationRangeSet':
+        """
+        Returns the set of locations that belong to both this set and a given
+        set.
+        """
+        fn_to_intervals = {}  # type: Dict[str, List[Tuple[int, int]]]
+        for filename in self.filenames & other.filenames:
+            xs = list(self._intervals(filename))
+            ys = list(other._intervals(filename))
+            intervals = []  # type: List[Tuple[int, int]]
+            i = j = 0
+            while i < len(xs) and j < len(ys):
+                start = max(xs[i][0], ys[j][0])
+                stop = min(xs[i][1], ys[j][1])
+                if start < stop:
+                    intervals.append((start, stop))
+                if xs[i][1] < ys[j][1]:
+                    i += 1
+                else:
+                    j += 1
+            fn_to_intervals[filename] = intervals
+        return FileLocationRangeSet._from_intervals(fn_to_intervals)
+
+    __or__ = union
+    __and__ = intersection
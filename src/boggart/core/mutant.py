@@ -1,12 +1,41 @@
-from typing import List, Iterator, Dict, Any
+from typing import Tuple, Iterable, Iterator, Dict, List, Any
 from uuid import UUID
+import struct
+
+import attr
 
 from .mutation import Mutation
+from .mutationset import MutationSet
+from ..exceptions import BadFormat
+
+__all__ = ['Mutant', 'MEDIA_TYPE_MUTANTS']
+
+#: The media type of the binary encoding of a list of mutants.
+MEDIA_TYPE_MUTANTS = 'application/vnd.boggart.mutants'
 
-__all__ = ['Mutant']
+# binary encoding: a magic number, followed by the number of mutants, the
+# UUID of each mutant, the number of mutations applied by each mutant, the
+# byte length of the name of each base snapshot, the UTF-8 encoded names,
+# and finally the binary encoding of a set of all of the mutations, in order.
+_MAGIC = b'BGT\x01'
+_HEADER = struct.Struct('<4sI')
 
 
+def _to_mutations(mutations: Iterable[Mutation]) -> Tuple[Mutation, ...]:
+    return tuple(mutations)
+
+
+@attr.s(frozen=True, slots=True, cache_hash=True, repr=False)
 class Mutant(object):
+    """
+    Describes a mutant of a given snapshot.
+
+    Attributes:
+        uuid: the UUID for the mutant.
+        base: the name of the snapshot that was used to generate the mutant.
+        mutations: the sequence of mutations that were applied to the
+            snapshot.
+    """
     @staticmethod
     def from_dict(jsn: Any) -> 'Mutant':
         """
@@ -20,43 +49,76 @@ class Mutant(object):
 
         return Mutant(uuid, base, mutations)
 
-    def __init__(self,
-                 uuid: UUID,
-                 base: str,
-                 mutations: List[Mutation]
-                 ) -> None:
-        """
-        Constructs a new Mutant description.
-
-        Parameters:
-            uuid: the UUID for the mutant.
-            base: the name of the snapshot that was used to generate the
-                mutant.
-            mutations: the sequence of mutations that were applied to the
-                snapshot.
+    @staticmethod
+    def list_to_bytes(mutants: Iterable['Mutant']) -> bytes:
+        """
+        Produces a compact binary encoding of a list of mutants.
+        """
+        mutants = list(mutants)
+        bases = [m.base.encode('utf-8') for m in mutants]
+        mutations = MutationSet()
+        for mutant in mutants:
+            mutations.extend(mutant._mutations)
+        counts = struct.pack('<{}I'.format(len(mutants)),
+                             *[len(m._mutations) for m in mutants])
+        lengths = struct.pack('<{}I'.format(len(mutants)),
+                              *[len(b) for b in bases])
+        parts = [_HEADER.pack(_MAGIC, len(mutants))]
+        parts += [m.uuid.bytes for m in mutants]
+        parts += [counts, lengths]
+        parts += bases
+        parts.append(mutations.to_bytes())
+        return b''.join(parts)
+
+    @staticmethod
+    def list_from_bytes(data: bytes) -> List['Mutant']:
         """
-        self.__uuid = uuid
-        self.__base = base
-        self.__mutations = mutations
+        Decodes a list of mutants from its binary encoding, as produced by
+        `list_to_bytes`.
+
+        Raises:
+            BadFormat: if the given data is not a valid encoding.
+        """
+        try:
+            magic, num_mutants = _HEADER.unpack_from(data)
+            if magic != _MAGIC:
+                raise BadFormat("unrecognised encoding of mutants")
+            offset = _HEADER.size
+            uuids = [UUID(bytes=data[offset + 16 * i:offset + 16 * (i + 1)])
+                     for i in range(num_mutants)]
+            offset += 16 * num_mutants
+            fmt_counts = '<{}I'.format(num_mutants)
+            counts = struct.unpack_from(fmt_counts, data, offset)
+            offset += struct.calcsize(fmt_counts)
+            lengths = struct.unpack_from(fmt_counts, data, offset)
+            offset += struct.calcsize(fmt_counts)
+            bases = []  # type: List[str]
+            for length in lengths:
+                bases.append(str(data[offset:offset + length], 'utf-8'))
+                offset += length
+        except (struct.error, ValueError):
+            raise BadFormat("malformed encoding of mutants")
+
+        mutations = iter(MutationSet.from_bytes(data[offset:]))
+        mutants = []  # type: List[Mutant]
+        for uuid, base, count in zip(uuids, bases, counts):
+            applied = [m for (_, m) in zip(range(count), mutations)]
+            if len(applied) != count:
+                raise BadFormat("malformed encoding of mutants")
+            mutants.append(Mutant(uuid, base, applied))
+        if len(mutants) != num_mutants or next(mutations, None) is not None:
+            raise BadFormat("malformed encoding of mutants")
+        return mutants
+
+    uuid = attr.ib(type=UUID)
+    base = attr.ib(type=str)
+    _mutations = attr.ib(type=Tuple[Mutation, ...],
+                         converter=_to_mutations)
 
     def __repr__(self) -> str:
         return "Mutant({}, {}, {})".format(self.uuid,
                                            self.base,
-                                           repr(self.mutations))
-
-    @property
-    def uuid(self) -> UUID:
-        """
-        The UUID for this mutant.
-        """
-        return self.__uuid
-
-    @property
-    def base(self) -> str:
-        """
-        The name of the snapshot that was used to generate this mutant.
-        """
-        return self.__base
+                                           repr(list(self._mutations)))
 
     @property
     def snapshot(self) -> str:
@@ -78,7 +140,7 @@ class Mutant(object):
         Returns an iterator over the mutations that were applied to the
         snapshot in order to generate this mutant.
         """
-        return self.__mutations.__iter__()
+        return iter(self._mutations)
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -86,7 +148,7 @@ class Mutant(object):
         serialized as, for instance, YAML or JSON.
         """
         return {
-            'uuid': self.__uuid.hex,
-            'base': self.__base,
-            'mutations': [m.to_dict() for m in self.mutations]
+            'uuid': self.uuid.hex,
+            'base': self.base,
+            'mutations': [m.to_dict() for m in self._mutations]
         }
@@ -1,4 +1,7 @@
-from typing import Dict, Any
+from typing import Any, Mapping, Tuple
+from types import MappingProxyType
+
+import attr
 
 from .location import FileLocationRange
 from ..exceptions import BadFormat
@@ -6,10 +9,19 @@ from ..exceptions import BadFormat
 __all__ = ['Mutation']
 
 
+def _freeze_arguments(args: Mapping[str, str]) -> Mapping[str, str]:
+    return MappingProxyType(dict(args))
+
+
+@attr.s(frozen=True, slots=True, cache_hash=True, repr=False)
 class Mutation(object):
     """
     Describes a concrete application of a given mutation operator at a specific
     location (range) in a source code file.
+
+    Mutations are immutable and hashable. Their arguments are exposed as a
+    read-only view rather than a copy, and, since equal mutations must have
+    equal locations, the arguments are excluded from the (cached) hash.
     """
     @staticmethod
     def from_dict(d: dict) -> 'Mutation':
@@ -41,60 +53,33 @@ class Mutation(object):
 
         return Mutation(operator, transformation_index, location, arguments)
 
-    def __init__(self,
-                 operator: str,
-                 transformation_index: int,
-                 at: FileLocationRange,
-                 args: Dict[str, str]
-                 ) -> None:
-        self.__operator = operator
-        self.__transformation_index = transformation_index
-        self.__at = at
-        self.__args = dict(args)
+    operator = attr.ib(type=str)
+    transformation_index = attr.ib(type=int)
+    location = attr.ib(type=FileLocationRange)
+    arguments = attr.ib(type=Mapping[str, str],
+                        converter=_freeze_arguments,
+                        hash=False)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # the read-only view of the arguments cannot be pickled, so mutations
+        # are pickled (and copied) by reconstructing them from their fields
+        return (Mutation, (self.operator,
+                           self.transformation_index,
+                           self.location,
+                           dict(self.arguments)))
 
     def __repr__(self) -> str:
         return "Mutation({}, {}, {}, {})".format(self.operator,
                                                  self.transformation_index,
                                                  repr(self.at),
-                                                 repr(self.arguments))
-
-    def __eq__(self, other: Any) -> bool:
-        return isinstance(other, Mutation) and \
-               self.operator == other.operator and \
-               self.transformation_index == other.transformation_index and \
-               self.location == other.location and \
-               self.arguments == other.arguments
-
-    @property
-    def operator(self) -> str:
-        """
-        The name of the mutation operator that was applied.
-        """
-        return self.__operator
+                                                 repr(dict(self.arguments)))
 
     @property
-    def transformation_index(self) -> int:
-        """
-        The index of the transformation that was applied.
-        """
-        return self.__transformation_index
-
-    @property
-    def location(self) -> FileLocationRange:
+    def at(self) -> FileLocationRange:
         """
         The character range at which the operator was applied.
         """
-        return self.__at
-
-    at = location
-
-    @property
-    def arguments(self) -> Dict[str, str]:
-        """
-        A dictionary of named arguments that are supplied to the operator for
-        this mutation.
-        """
-        return self.__args.copy()
+        return self.location
 
     def to_dict(self) -> dict:
         """
@@ -105,5 +90,5 @@ class Mutation(object):
             'operator': self.operator,
             'transformation-index': self.transformation_index,
             'location': str(self.location),
-            'arguments': self.arguments
+            'arguments': dict(self.arguments)
         }
@@ -0,0 +1,416 @@
+__all__ = ['MutationSet', 'MEDIA_TYPE_MUTATIONS']
+
+from typing import (Any, Dict, Iterable, Iterator, List, Mapping, Sequence,
+                    Tuple, Union)
+from array import array
+from collections import Counter
+from itertools import compress
+import struct
+import sys
+
+from .location import Location, LocationRange, FileLocationRange
+from .mutation import Mutation
+from .summary import MutationSummary
+from ..exceptions import BadFormat
+
+#: The type code used by each of the integer columns.
+_TYPECODE = 'I'
+
+#: The media type of the binary encoding of mutation sets.
+MEDIA_TYPE_MUTATIONS = 'application/vnd.boggart.mutations'
+
+# binary encoding: a magic number, followed by the number of strings,
+# mutations and arguments, the byte length of each string, the UTF-8 encoded
+# strings, and finally each of the columns. All integers are encoded as
+# unsigned, 32-bit, little-endian integers.
+_MAGIC = b'BGM\x01'
+_HEADER = struct.Struct('<4sIII')
+assert array(_TYPECODE).itemsize == 4
+
+
+def _array_to_bytes(column: array) -> bytes:
+    if sys.byteorder == 'big':
+        column = array(_TYPECODE, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _array_from_bytes(data: memoryview, offset: int, size: int) -> array:
+    column = array(_TYPECODE)
+    stop = offset + size * column.itemsize
+    if stop > len(data):
+        raise BadFormat("unexpected end of encoded mutation set")
+    column.frombytes(data[offset:stop])
+    if sys.byteorder == 'big':
+        column.byteswap()
+    return column
+
+
+class MutationSet(object):
+    """
+    A compact, columnar container for large numbers of mutations.
+
+    Rather than holding a separate object for each mutation, its location
+    and its arguments, a mutation set stores the operator, transformation
+    index, file and start and stop line and column of each mutation as
+    typed integer arrays. Operator names, file names, and argument names
+    and values are interned in a string table that is shared by the set and
+    any sets that are derived from it via filtering. Mutation objects are
+    materialised on demand, when the set is indexed or iterated.
+    """
+    @staticmethod
+    def from_mutations(mutations: Iterable[Mutation]) -> 'MutationSet':
+        """
+        Constructs a mutation set from a sequence of mutations.
+        """
+        mutation_set = MutationSet()
+        mutation_set.extend(mutations)
+        return mutation_set
+
+    @staticmethod
+    def from_dicts(dicts: Iterable[Dict[str, Any]]) -> 'MutationSet':
+        """
+        Constructs a mutation set from a sequence of dictionary-based mutation
+        descriptions, as produced by `Mutation.to_dict`, without constructing
+        an intermediate object for each mutation.
+
+        Raises:
+            BadFormat: if a description does not match the expected format.
+        """
+        mutation_set = MutationSet()
+        for d in dicts:
+            try:
+                filename, _, s_range = d['location'].rpartition('@')
+                s_start, _, s_stop = s_range.partition('::')
+                start_line, _, start_col = s_start.partition(':')
+                stop_line, _, stop_col = s_stop.partition(':')
+                mutation_set.append(d['operator'],
+                                    d['transformation-index'],
+                                    filename,
+                                    int(start_line), int(start_col),
+                                    int(stop_line), int(stop_col),
+                                    d['arguments'])
+            except (KeyError, TypeError, ValueError, AttributeError):
+                raise BadFormat("failed to decode mutation: {}".format(d))
+        return mutation_set
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'MutationSet':
+        """
+        Decodes a mutation set from its binary encoding, as produced by
+        `to_bytes`.
+
+        Raises:
+            BadFormat: if the given data is not a valid encoding.
+        """
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            raise BadFormat("unexpected end of encoded mutation set")
+        magic, num_strings, num_mutations, num_args = \
+            _HEADER.unpack_from(view)
+        if magic != _MAGIC:
+            raise BadFormat("unrecognised encoding of mutation set")
+
+        offset = _HEADER.size
+        lengths = _array_from_bytes(view, offset, num_strings)
+        offset += len(lengths) * lengths.itemsize
+        strings = []  # type: List[str]
+        for length in lengths:
+            strings.append(str(view[offset:offset + length], 'utf-8'))
+            offset += length
+
+        mutation_set = MutationSet()
+        mutation_set.__strings = strings
+        mutation_set.__string_ids = {s: i for (i, s) in enumerate(strings)}
+        columns = []  # type: List[array]
+        for size in [num_mutations] * 7 + [num_mutations + 1] + [num_args] * 2:
+            column = _array_from_bytes(view, offset, size)
+            offset += size * column.itemsize
+            columns.append(column)
+        (mutation_set.__operators,
+         mutation_set.__transformations,
+         mutation_set.__files,
+         mutation_set.__start_lines,
+         mutation_set.__start_cols,
+         mutation_set.__stop_lines,
+         mutation_set.__stop_cols,
+         mutation_set.__args_start,
+         mutation_set.__arg_names,
+         mutation_set.__arg_values) = columns
+
+        if offset != len(view):
+            raise BadFormat("unexpected trailing data in encoded mutation set")
+        if any(i >= num_strings for i in mutation_set.__operators) or \
+           any(i >= num_strings for i in mutation_set.__files) or \
+           any(i >= num_strings for i in mutation_set.__arg_names) or \
+           any(i >= num_strings for i in mutation_set.__arg_values) or \
+           mutation_set.__args_start[-1] != num_args:
+            raise BadFormat("malformed encoding of mutation set")
+        return mutation_set
+
+    def __init__(self) -> None:
+        """
+        Constructs an empty mutation set.
+        """
+        self.__strings = []  # type: List[str]
+        self.__string_ids = {}  # type: Dict[str, int]
+        self.__operators = array(_TYPECODE)
+        self.__transformations = array(_TYPECODE)
+        self.__files = array(_TYPECODE)
+        self.__start_lines = array(_TYPECODE)
+        self.__start_cols = array(_TYPECODE)
+        self.__stop_lines = array(_TYPECODE)
+        self.__stop_cols = array(_TYPECODE)
+        # the arguments for mutation i are given by the interned names and
+        # values at positions args_start[i] to args_start[i + 1]
+        self.__args_start = array(_TYPECODE, [0])
+        self.__arg_names = array(_TYPECODE)
+        self.__arg_values = array(_TYPECODE)
+
+    def _intern(self, s: str) -> int:
+        try:
+            return self.__string_ids[s]
+        except KeyError:
+            uid = len(self.__strings)
+            self.__strings.append(s)
+            self.__string_ids[s] = uid
+            return uid
+
+    def __len__(self) -> int:
+        """
+        Returns the number of mutations in this set.
+        """
+        return len(self.__operators)
+
+    def __repr__(self) -> str:
+        return "MutationSet({} mutations)".format(len(self))
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, MutationSet) and \
+            len(self) == len(other) and \
+            all(x == y for (x, y) in zip(self, other))
+
+    def append(self,
+               operator: str,
+               transformation_index: int,
+               filename: str,
+               start_line: int,
+               start_col: int,
+               stop_line: int,
+               stop_col: int,
+               arguments: Mapping[str, str]
+               ) -> None:
+        """
+        Adds a mutation, described by its individual fields, to this set.
+        """
+        self.__operators.append(self._intern(operator))
+        self.__transformations.append(transformation_index)
+        self.__files.append(self._intern(filename))
+        self.__start_lines.append(start_line)
+        self.__start_cols.append(start_col)
+        self.__stop_lines.append(stop_line)
+        self.__stop_cols.append(stop_col)
+        for name, value in arguments.items():
+            self.__arg_names.append(self._intern(name))
+            self.__arg_values.append(self._intern(value))
+        self.__args_start.append(len(self.__arg_names))
+
+    def add(self, mutation: Mutation) -> None:
+        """
+        Adds a given mutation to this set.
+        """
+        location = mutation.location
+        self.append(mutation.operator,
+                    mutation.transformation_index,
+                    location.filename,
+                    location.start.line, location.start.col,
+                    location.stop.line, location.stop.col,
+                    mutation.arguments)
+
+    def extend(self, mutations: Iterable[Mutation]) -> None:
+        """
+        Adds a sequence of mutations to this set.
+        """
+        for mutation in mutations:
+            self.add(mutation)
+
+    def _materialise(self, i: int) -> Mutation:
+        strings = self.__strings
+        start = Location(self.__start_lines[i], self.__start_cols[i])
+        stop = Location(self.__stop_lines[i], self.__stop_cols[i])
+        location = FileLocationRange(strings[self.__files[i]],
+                                     LocationRange(start, stop))
+        lo, hi = self.__args_start[i], self.__args_start[i + 1]
+        args = {strings[self.__arg_names[j]]: strings[self.__arg_values[j]]
+                for j in range(lo, hi)}
+        return Mutation(strings[self.__operators[i]],
+                        self.__transformations[i],
+                        location,
+                        args)
+
+    def __getitem__(self, index: int) -> Mutation:
+        """
+        Materialises the mutation at a given position within this set.
+
+        Raises:
+            IndexError: if the index is out of range.
+        """
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("mutation set index out of range")
+        return self._materialise(index)
+
+    def __iter__(self) -> Iterator[Mutation]:
+        """
+        Returns an iterator that lazily materialises each mutation in this
+        set.
+        """
+        for i in range(len(self)):
+            yield self._materialise(i)
+
+    @property
+    def operators(self) -> Sequence[str]:
+        """
+        The name of the operator used by each mutation in this set.
+        """
+        return [self.__strings[i] for i in self.__operators]
+
+    @property
+    def filenames(self) -> Sequence[str]:
+        """
+        The name of the file targeted by each mutation in this set.
+        """
+        return [self.__strings[i] for i in self.__files]
+
+    @property
+    def lines(self) -> Sequence[int]:
+        """
+        The line at which each mutation in this set begins.
+        """
+        return self.__start_lines
+
+    def summary(self) -> MutationSummary:
+        """
+        Counts the mutations in this set by operator, transformation and
+        line, directly from its columns.
+        """
+        strings = self.__strings
+        by_transformation = Counter(zip(self.__operators,
+                                        self.__transformations))
+        transformations = {}  # type: Dict[Tuple[str, int], int]
+        operators = {}  # type: Dict[str, int]
+        for ((op, idx), count) in by_transformation.items():
+            name = strings[op]
+            transformations[(name, idx)] = count
+            operators[name] = operators.get(name, 0) + count
+        return MutationSummary(len(self),
+                               operators,
+                               transformations,
+                               dict(Counter(self.__start_lines)))
+
+    def select(self, mask: Iterable[Union[bool, int]]) -> 'MutationSet':
+        """
+        Returns the subset of the mutations in this set that are selected by
+        a given mask. The returned set shares the string table of this set.
+
+        Parameters:
+            mask: a sequence of truth values, one for each mutation in this
+                set, indicating whether that mutation should be selected.
+        """
+        mask = list(mask)
+        assert len(mask) == len(self)
+        subset = MutationSet()
+        subset.__strings = self.__strings
+        subset.__string_ids = self.__string_ids
+        subset.__operators = array(_TYPECODE, compress(self.__operators, mask))
+        subset.__transformations = \
+            array(_TYPECODE, compress(self.__transformations, mask))
+        subset.__files = array(_TYPECODE, compress(self.__files, mask))
+        subset.__start_lines = \
+            array(_TYPECODE, compress(self.__start_lines, mask))
+        subset.__start_cols = \
+            array(_TYPECODE, compress(self.__start_cols, mask))
+        subset.__stop_lines = \
+            array(_TYPECODE, compress(self.__stop_lines, mask))
+        subset.__stop_cols = array(_TYPECODE, compress(self.__stop_cols, mask))
+
+        args_start = self.__args_start
+        for i in compress(range(len(self)), mask):
+            lo, hi = args_start[i], args_start[i + 1]
+            subset.__arg_names.extend(self.__arg_names[lo:hi])
+            subset.__arg_values.extend(self.__arg_values[lo:hi])
+            subset.__args_start.append(len(subset.__arg_names))
+        return subset
+
+    def with_operators(self, *names: str) -> 'MutationSet':
+        """
+        Returns the subset of mutations in this set that were produced by any
+        of the given operators.
+        """
+        ids = {self.__string_ids[n] for n in names if n in self.__string_ids}
+        return self.select(i in ids for i in self.__operators)
+
+    def in_file(self, filename: str) -> 'MutationSet':
+        """
+        Returns the subset of mutations in this set that belong to a given
+        file.
+        """
+        uid = self.__string_ids.get(filename, -1)
+        return self.select(i == uid for i in self.__files)
+
+    def within_lines(self, first: int, last: int) -> 'MutationSet':
+        """
+        Returns the subset of mutations in this set that begin within a given
+        range of lines, inclusive.
+        """
+        return self.select(first <= line <= last
+                           for line in self.__start_lines)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Produces dictionary-based descriptions of the mutations in this set,
+        in the same format as `Mutation.to_dict`.
+        """
+        strings = self.__strings
+        dicts = []  # type: List[Dict[str, Any]]
+        for i in range(len(self)):
+            lo, hi = self.__args_start[i], self.__args_start[i + 1]
+            location = "{}@{}:{}::{}:{}".format(strings[self.__files[i]],
+                                                self.__start_lines[i],
+                                                self.__start_cols[i],
+                                                self.__stop_lines[i],
+                                                self.__stop_cols[i])
+            args = {strings[self.__arg_names[j]]: strings[self.__arg_values[j]]
+                    for j in range(lo, hi)}
+            dicts.append({'operator': strings[self.__operators[i]],
+                          'transformation-index': self.__transformations[i],
+                          'location': location,
+                          'arguments': args})
+        return dicts
+
+    def to_bytes(self) -> bytes:
+        """
+        Produces a compact binary encoding of this mutation set.
+        """
+        encoded = [s.encode('utf-8') for s in self.__strings]
+        lengths = array(_TYPECODE, [len(s) for s in encoded])
+        parts = [_HEADER.pack(_MAGIC,
+                              len(encoded),
+                              len(self),
+                              len(self.__arg_names)),
+                 _array_to_bytes(lengths)]
+        parts += encoded
+        parts += [_array_to_bytes(column) for column in (
+            self.__operators,
+            self.__transformations,
+            self.__files,
+            self.__start_lines,
+            self.__start_cols,
+            self.__stop_lines,
+            self.__stop_cols,
+            self.__args_start,
+            self.__arg_names,
+            self.__arg_values)]
+        return b''.join(parts)
@@ -84,6 +84,6 @@ class Operator(object):
         """
         return {
             'name': self.name,
-            'languages': list(self.languages),
+            'languages': sorted(self.languages),
             'transformations': [t.to_dict() for t in self.transformations]
         }
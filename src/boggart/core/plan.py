@@ -0,0 +1,170 @@
+"""
+Provides evaluation plans, which decide the order in which the constraints
+of a transformation are checked, and record how each constraint behaves.
+"""
+__all__ = ['ConstraintPlan', 'ConstraintStatistics']
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+from rooibos import Match
+
+from .constraint import Constraint
+from .lexical import LexicalMask
+from .tokens import TokenIndex
+
+
+class ConstraintStatistics(object):
+    """
+    Records the number of times that a constraint has been evaluated, the
+    number of times that it has rejected a match, and the total time spent
+    evaluating it.
+    """
+    __slots__ = ('evaluations', 'rejections', 'seconds')
+
+    def __init__(self) -> None:
+        self.evaluations = 0
+        self.rejections = 0
+        self.seconds = 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        """
+        An estimate of the probability that the constraint rejects a match
+        that reaches it. Constraints that have yet to be evaluated are
+        assumed to reject half of all matches.
+        """
+        return (self.rejections + 1) / (self.evaluations + 2)
+
+    def copy(self) -> 'ConstraintStatistics':
+        copied = ConstraintStatistics()
+        copied.evaluations = self.evaluations
+        copied.rejections = self.rejections
+        copied.seconds = self.seconds
+        return copied
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'evaluations': self.evaluations,
+                'rejections': self.rejections,
+                'seconds': self.seconds}
+
+
+class ConstraintPlan(object):
+    """
+    Evaluates a set of constraints in order of their cost class, with the
+    constraints of each class that most often reject matches evaluated
+    first. The order is revised periodically as statistics accumulate.
+    Since evaluation stops at the first rejection, the statistics of each
+    constraint describe only those matches that reached it.
+
+    Plans may be shared between threads: constraints are evaluated without
+    holding a lock, but the statistics and the order are only updated while
+    holding the lock of the plan.
+    """
+    #: The number of evaluations between revisions of the order.
+    REORDER_INTERVAL = 1024
+
+    def __init__(self, constraints: Iterable[Constraint]) -> None:
+        steps = [(c, ConstraintStatistics()) for c in constraints]
+        steps.sort(key=lambda s: (s[0].COST, repr(s[0])))
+        self.__lock = threading.Lock()
+        self.__steps = tuple(steps)
+        self.__until_reorder = self.REORDER_INTERVAL
+
+    @property
+    def order(self) -> List[Constraint]:
+        """
+        The constraints of this plan, in the order that they are evaluated.
+        """
+        return [c for (c, _) in self.__steps]
+
+    def statistics(self) -> List[Tuple[Constraint, ConstraintStatistics]]:
+        """
+        Returns a copy of the statistics for each constraint of this plan,
+        in the order that they are evaluated.
+        """
+        with self.__lock:
+            return [(c, stats.copy()) for (c, stats) in self.__steps]
+
+    def record(self,
+               statistics: List[Tuple[Constraint, ConstraintStatistics]]
+               ) -> None:
+        """
+        Adds statistics that were gathered elsewhere (e.g., by a copy of
+        this plan in another process) to the statistics of this plan.
+        """
+        with self.__lock:
+            mine = dict(self.__steps)
+            for (constraint, stats) in statistics:
+                if constraint in mine:
+                    mine[constraint].evaluations += stats.evaluations
+                    mine[constraint].rejections += stats.rejections
+                    mine[constraint].seconds += stats.seconds
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # copies of a plan keep its order, but gather their own statistics
+        return {'order': self.order}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        steps = [(c, ConstraintStatistics()) for c in state['order']]
+        self.__lock = threading.Lock()
+        self.__steps = tuple(steps)
+        self.__until_reorder = self.REORDER_INTERVAL
+
+    def reorder(self) -> None:
+        """
+        Revises the order of evaluation in light of the rejection rates that
+        have been observed so far.
+        """
+        with self.__lock:
+            self._reorder()
+
+    def _reorder(self) -> None:
+        # should only be called while holding the lock
+        steps = sorted(self.__steps,
+                       key=lambda s: (s[0].COST, -s[1].rejection_rate))
+        self.__steps = tuple(steps)
+        self.__until_reorder = self.REORDER_INTERVAL
+
+    def evaluate(self,
+                 match: Match,
+                 content_file: str,
+                 offset_start: int,
+                 offset_stop: int,
+                 *,
+                 mask: Optional[LexicalMask] = None,
+                 tokens: Optional[TokenIndex] = None
+                 ) -> bool:
+        """
+        Checks whether a given match satisfies each of the constraints of
+        this plan.
+        """
+        # the timings of each constraint are gathered locally, and are added
+        # to the statistics of the plan once the match has been checked
+        clock = time.perf_counter
+        steps = self.__steps
+        timings = []  # type: List[Tuple[ConstraintStatistics, float]]
+        is_sat = True
+        for (constraint, stats) in steps:
+            time_start = clock()
+            is_sat = constraint.is_satisfied_by(match,
+                                                content_file,
+                                                offset_start,
+                                                offset_stop,
+                                                mask=mask,
+                                                tokens=tokens)
+            timings.append((stats, clock() - time_start))
+            if not is_sat:
+                break
+
+        with self.__lock:
+            for (stats, seconds) in timings:
+                stats.seconds += seconds
+                stats.evaluations += 1
+            if not is_sat:
+                timings[-1][0].rejections += 1
+            self.__until_reorder -= 1
+            if self.__until_reorder <= 0:
+                self._reorder()
+        return is_sat
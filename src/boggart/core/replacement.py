@@ -3,14 +3,20 @@ __all__ = ['Replacement']
 from typing import Dict, List, Sequence
 import functools
 
+import attr
+
 from .location import FileLocationRange
 
 
-# FIXME: use attrs
+@attr.s(frozen=True, slots=True, cache_hash=True, repr=False)
 class Replacement(object):
     """
     Describes the replacement of a contiguous body of text in a single source
     code file with a provided text.
+
+    Attributes:
+        location: the contiguous range of text that should be replaced.
+        text: the source text that should be used as a replacement.
     """
     @staticmethod
     def from_dict(d: Dict[str, str]) -> 'Replacement':
@@ -66,12 +72,8 @@ class Replacement(object):
             resolved += reps
         return resolved
 
-    def __init__(self,
-                 location: FileLocationRange,
-                 text: str
-                 ) -> None:
-        self.__location = location
-        self.__text = text
+    location = attr.ib(type=FileLocationRange)
+    text = attr.ib(type=str)
 
     def __repr__(self) -> str:
         return "Replacement({}, {})".format(repr(self.location),
@@ -82,21 +84,7 @@ class Replacement(object):
         """
         The name of the file in which the replacement should be made.
         """
-        return self.__location.filename
-
-    @property
-    def location(self) -> FileLocationRange:
-        """
-        The contiguous range of text that should be replaced.
-        """
-        return self.__location
-
-    @property
-    def text(self) -> str:
-        """
-        The source text that should be used as a replacement.
-        """
-        return self.__text
+        return self.location.filename
 
     def to_dict(self) -> Dict[str, str]:
         return {'location': str(self.location),
@@ -0,0 +1,64 @@
+from typing import Any, Dict, Tuple
+
+import attr
+
+from ..exceptions import BadFormat
+
+__all__ = ['MutationSummary']
+
+
+@attr.s(frozen=True, slots=True, repr=False)
+class MutationSummary(object):
+    """
+    Counts the mutations that can be applied to a file without describing
+    the mutations themselves.
+
+    Attributes:
+        total: the number of mutations.
+        operators: the number of mutations produced by each operator.
+        transformations: the number of mutations produced by each
+            transformation, keyed by the name of its operator and its index.
+        lines: the number of mutations that begin on each line.
+    """
+    total = attr.ib(type=int)
+    operators = attr.ib(type=Dict[str, int])
+    transformations = attr.ib(type=Dict[Tuple[str, int], int])
+    lines = attr.ib(type=Dict[int, int])
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'MutationSummary':
+        """
+        Constructs a summary from a dictionary-based description.
+
+        Raises:
+            BadFormat: if the provided dictionary does not match the expected
+                format.
+        """
+        try:
+            transformations = {(op, int(idx)): count
+                               for (op, counts) in d['transformations'].items()
+                               for (idx, count) in counts.items()}
+            lines = {int(line): count for (line, count) in d['lines'].items()}
+            return MutationSummary(d['total'],
+                                   dict(d['operators']),
+                                   transformations,
+                                   lines)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            raise BadFormat("failed to decode mutation summary: {}".format(d))
+
+    def __repr__(self) -> str:
+        s = "MutationSummary(total={}, operators={})"
+        return s.format(self.total, self.operators)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns a dictionary-based description of this summary.
+        """
+        transformations = {}  # type: Dict[str, Dict[str, int]]
+        for ((op, idx), count) in sorted(self.transformations.items()):
+            transformations.setdefault(op, {})[str(idx)] = count
+        return {'total': self.total,
+                'operators': dict(sorted(self.operators.items())),
+                'transformations': transformations,
+                'lines': {str(line): count
+                          for (line, count) in sorted(self.lines.items())}}
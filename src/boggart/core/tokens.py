@@ -0,0 +1,88 @@
+"""
+Provides an index of the token boundaries within source files, allowing
+template matches that begin or end part-way through a token (e.g., the "<"
+in "<<") to be detected.
+"""
+__all__ = ['TokenIndex']
+
+from typing import Dict, Optional, Pattern
+import re
+
+_START = 1
+_LAST = 2
+
+# tokens are recognised by maximal munch: longer punctuators are listed
+# before their prefixes, and numbers follow the C preprocessing-number rule
+# so that exponents such as "1e-5" form a single token.
+_C_FAMILY = re.compile(r"""
+    //[^\n]*
+  | /\*[\s\S]*?(?:\*/|\Z)
+  | "(?:\\.|[^"\\\n])*"?
+  | '(?:\\.|[^'\\\n])*'?
+  | [A-Za-z_$][A-Za-z0-9_$]*
+  | \.?[0-9](?:[eEpP][+-]|[A-Za-z0-9_.'])*
+  | >>>= | <<= | >>= | >>> | \.\.\. | ->\* | <=>
+  | -> | \+\+ | -- | << | >> | <= | >= | == | != | && | \|\|
+  | \+= | -= | \*= | /= | %= | &= | \|= | \^= | :: | \#\#
+  | \S
+""", re.VERBOSE)
+
+_PYTHON = re.compile(r"""
+    \#[^\n]*
+  | [rRbBuUfF]{0,2}(?:'''[\s\S]*?(?:'''|\Z)|\"\"\"[\s\S]*?(?:\"\"\"|\Z))
+  | [rRbBuUfF]{0,2}(?:"(?:\\.|[^"\\\n])*"?|'(?:\\.|[^'\\\n])*'?)
+  | [A-Za-z_][A-Za-z0-9_]*
+  | \.?[0-9](?:[eE][+-]|[A-Za-z0-9_.])*
+  | \*\*= | //= | >>= | <<= | \.\.\.
+  | -> | := | \*\* | // | << | >> | <= | >= | == | != | <>
+  | \+= | -= | \*= | /= | %= | &= | \|= | \^= | @=
+  | \S
+""", re.VERBOSE)
+
+_TOKENIZERS = {
+    'C': _C_FAMILY,
+    'C++': _C_FAMILY,
+    'Java': _C_FAMILY,
+    'Python': _PYTHON
+}  # type: Dict[str, Pattern]
+
+
+class TokenIndex(object):
+    """
+    Records, for each character of a source file, whether a token begins or
+    ends at that character, allowing token boundaries to be checked in
+    constant time. Files written in languages without a known tokenizer are
+    treated as though every range were a whole token.
+    """
+    @staticmethod
+    def build(text: str, language: str) -> 'TokenIndex':
+        """
+        Computes the token index for a given text, written in the language
+        with a given name.
+        """
+        tokenizer = _TOKENIZERS.get(language)
+        if tokenizer is None:
+            return TokenIndex(None)
+
+        flags = bytearray(len(text))
+        for m in tokenizer.finditer(text):
+            start, stop = m.span()
+            flags[start] |= _START
+            flags[stop - 1] |= _LAST
+        return TokenIndex(flags)
+
+    def __init__(self, flags: Optional[bytearray]) -> None:
+        self.__flags = flags
+
+    def is_whole(self, offset_start: int, offset_stop: int) -> bool:
+        """
+        Determines whether a given range of characters begins at the start of
+        a token and ends at the end of a token.
+        """
+        flags = self.__flags
+        if flags is None:
+            return True
+        if not 0 <= offset_start < offset_stop <= len(flags):
+            return False
+        return bool(flags[offset_start] & _START) and \
+            bool(flags[offset_stop - 1] & _LAST)
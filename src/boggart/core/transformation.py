@@ -1,10 +1,13 @@
 __all__ = ['Transformation']
 
-from typing import Any, Dict, FrozenSet
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 import attr
 import logging
 
 from .constraint import Constraint
+from .lexical import LexicalMask
+from .plan import ConstraintPlan, ConstraintStatistics
+from .tokens import TokenIndex
 
 from rooibos import Match
 
@@ -21,6 +24,30 @@ class Transformation(object):
     rewrite = attr.ib(type=str)
     constraints = attr.ib(type=FrozenSet[Constraint],
                           converter=frozenset)  # type: ignore
+    is_literal = attr.ib(type=bool,
+                         init=False,
+                         repr=False,
+                         eq=False,
+                         hash=False)
+    _plan = attr.ib(type=ConstraintPlan,
+                    init=False,
+                    repr=False,
+                    eq=False,
+                    hash=False)
+
+    @is_literal.default
+    def _classify_template(self) -> bool:
+        """
+        Determines whether the match template of this transformation is
+        literal: that is, whether it contains neither holes nor whitespace,
+        and can therefore be matched without the help of Rooibos.
+        """
+        return bool(self.match) and ':[' not in self.match and \
+            not any(c.isspace() for c in self.match)
+
+    @_plan.default
+    def _compile_plan(self) -> ConstraintPlan:
+        return ConstraintPlan(self.constraints)
 
     @staticmethod
     def from_dict(d: dict) -> 'Transformation':
@@ -40,17 +67,42 @@ class Transformation(object):
                               match: Match,
                               content_file: str,
                               offset_start: int,
-                              offset_stop: int
+                              offset_stop: int,
+                              *,
+                              mask: Optional[LexicalMask] = None,
+                              tokens: Optional[TokenIndex] = None
                               ) -> bool:
         """
         Checks whether a given match satisfies the constraints of this
-        transformation.
+        transformation. Constraints are checked in the order given by the
+        evaluation plan of this transformation.
+        """
+        return self._plan.evaluate(match,
+                                   content_file,
+                                   offset_start,
+                                   offset_stop,
+                                   mask=mask,
+                                   tokens=tokens)
+
+    def constraint_statistics(self
+                              ) -> List[Tuple[Constraint,
+                                              ConstraintStatistics]]:
+        """
+        Returns the statistics for each constraint of this transformation,
+        in the order that the constraints are currently checked.
+        """
+        return self._plan.statistics()
+
+    def record_constraint_statistics(self,
+                                     statistics: List[Tuple[Constraint,
+                                                            ConstraintStatistics]]  # noqa: pycodestyle
+                                     ) -> None:
+        """
+        Adds statistics that were gathered by a copy of this transformation,
+        such as one that was sent to another process, to the statistics of
+        this transformation.
         """
-        return all(c.is_satisfied_by(match,
-                                     content_file,
-                                     offset_start,
-                                     offset_stop)
-                   for c in self.constraints)
+        self._plan.record(statistics)
 
     def to_dict(self) -> dict:
         """
@@ -59,4 +111,5 @@ class Transformation(object):
         """
         return {'match': self.match,
                 'rewrite': self.rewrite,
-                'constraints': [c.to_dict() for c in self.constraints]}
+                'constraints': sorted((c.to_dict() for c in self.constraints),
+                                      key=repr)}
@@ -3,8 +3,6 @@
 #
 from typing import Any, Dict, Tuple
 
-import flask
-
 __all__ = [
     'BoggartException',
     'UnexpectedResponse',
@@ -17,6 +15,7 @@ __all__ = [
     'IllegalConfig',
     'FileNotFound',
     'MutantNotFound',
+    'JobNotFound',
     'SnapshotNotFound',
     'ConnectionFailure',
     'BadFormat',
@@ -56,7 +55,7 @@ class UnexpectedResponse(BoggartException):
     The server produced an unexpected response that the client does not know
     how to interpret or decode.
     """
-    def __init__(self, response: flask.Response) -> None:
+    def __init__(self, response: Any) -> None:
         msg = "Server produced an unexpected response [{}]:\n{}"
         msg = msg.format(response.status_code, response.text)
         super().__init__(msg)
@@ -79,7 +78,15 @@ class ClientServerError(BoggartException):
         # TODO use metaprogramming to avoid having to maintain this list
         cls = ({
             'OperatorNameAlreadyExists': OperatorNameAlreadyExists,
+            'OperatorNotFound': OperatorNotFound,
             'LanguageNotFound': LanguageNotFound,
+            'LanguageNotDetected': LanguageNotDetected,
+            'SnapshotNotFound': SnapshotNotFound,
+            'MutantNotFound': MutantNotFound,
+            'JobNotFound': JobNotFound,
+            'FileNotFound': FileNotFound,
+            'BadFormat': BadFormat,
+            'BuildFailure': BuildFailure,
             'BadConfigFile': BadConfigFile,
             'IllegalConfig': IllegalConfig,
             'UnexpectedServerError': UnexpectedServerError
@@ -363,6 +370,36 @@ class MutantNotFound(ClientServerError):
         return {'uuid': self.uuid}
 
 
+class JobNotFound(ClientServerError):
+    """
+    Used to indicate that no background job was found with a given ID.
+    """
+    @staticmethod
+    def from_data(data: dict) -> 'JobNotFound':
+        assert 'id' in data
+        return JobNotFound(data['id'])
+
+    def __init__(self,
+                 uid: str,
+                 *,
+                 status_code: int = 404
+                 ) -> None:
+        self.__uid = uid
+        msg = "job not found: {}".format(uid)
+        super().__init__(status_code, msg)
+
+    @property
+    def uid(self) -> str:
+        """
+        The ID of the missing job.
+        """
+        return self.__uid
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'id': self.uid}
+
+
 class FileNotFound(ClientServerError):
     """
     Used to indicate that the requested file was not found.
@@ -1,8 +1,11 @@
-from typing import Optional, List, Dict, Any, Iterator
+from typing import Optional, List, Dict, Any, Iterator, Set
 from functools import wraps
 from contextlib import contextmanager
+from urllib.parse import urlencode
 from uuid import UUID
 import argparse
+import hashlib
+import json
 import os
 import signal
 import subprocess
@@ -21,9 +24,14 @@ import requests
 from flask_api import FlaskAPI
 from bugzoo.util import report_system_resources, report_resource_limits
 
+from . import sampling
+from .diff import apply_file_change, parse_unified_diff
 from .installation import Installation
+from .jobs import Job
+from .watch import ConfigWatcher
 from ..exceptions import *
-from ..core import Language, Operator, Mutation
+from ..core import Language, Operator, Mutation, Mutant, MutationSet, \
+                   MEDIA_TYPE_MUTANTS, MEDIA_TYPE_MUTATIONS
 from ..client import Client
 from ..version import __version__
 
@@ -123,6 +131,121 @@ def ephemeral_stack(*,
                 yield client_boggart
 
 
+def compute_etag(*parts: str) -> str:
+    """
+    Computes a strong entity tag for a response whose contents are entirely
+    determined by a given sequence of strings.
+    """
+    content = '\0'.join(parts).encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+
+def is_not_modified(etag: str) -> bool:
+    """
+    Determines whether the client already holds the version of a resource
+    that is identified by a given entity tag (i.e., whether the tag appears
+    in the If-None-Match header of the current request).
+    """
+    return flask.request.if_none_match.contains(etag)
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    """
+    Produces the headers that attach a given entity tag to a response.
+    """
+    return {'ETag': '"{}"'.format(etag)}
+
+
+def parse_lines(s: str, num_lines: int) -> Set[int]:
+    """
+    Parses a semi-colon delimited list of line numbers and inclusive line
+    ranges (e.g., "10-40;55") into a set of line numbers. Lines beyond the
+    end of the file are ignored.
+
+    Raises:
+        BadFormat: if the given string is malformed.
+    """
+    lines = set()  # type: Set[int]
+    for part in s.split(';'):
+        first, sep, last = part.partition('-')
+        try:
+            start = int(first)
+            stop = int(last) if sep else start
+        except ValueError:
+            raise BadFormat("expected a line number or range: {}".format(part))
+        if start < 1 or stop < start:
+            raise BadFormat("illegal line range: {}".format(part))
+        lines.update(range(start, min(stop, num_lines) + 1))
+    return lines
+
+
+def prefers(media_type: str) -> bool:
+    """
+    Determines whether the client prefers a response of a given media type
+    to a JSON-encoded response, according to the Accept header of the current
+    request.
+    """
+    accept = flask.request.accept_mimetypes
+    best = accept.best_match(['application/json', media_type])
+    return best == media_type
+
+
+def mutations_from_request() -> List[Mutation]:
+    """
+    Extracts the mutations that are contained in the body of the current
+    request, which may either be a binary-encoded mutation set or a JSON
+    object with a list of mutations.
+
+    Raises:
+        BadFormat: if the mutations could not be decoded.
+    """
+    request = flask.request
+    if request.mimetype == MEDIA_TYPE_MUTATIONS:
+        return list(MutationSet.from_bytes(request.get_data()))
+    body = request.get_json(silent=True)
+    if body is None:
+        raise BadFormat("expected a JSON-encoded list of mutations")
+    try:
+        return [Mutation.from_dict(m) for m in body['mutations']]
+    except (KeyError, TypeError):
+        raise BadFormat("expected a JSON-encoded list of mutations")
+
+
+def find_snapshot(name: str) -> Any:
+    """
+    Finds the BugZoo snapshot with a given name.
+
+    Raises:
+        SnapshotNotFound: if no snapshot is found with the given name.
+    """
+    logger.debug("attempting to retrieve snapshot: %s", name)
+    try:
+        return installation.bugzoo.bugs[name]
+    except KeyError:
+        logger.exception("failed to find snapshot: %s", name)
+        raise SnapshotNotFound(name)
+
+
+def find_operators(names: List[str]) -> List[Operator]:
+    """
+    Finds the operators with a given list of names.
+
+    Raises:
+        OperatorNotFound: if no operator is found for one of the names.
+    """
+    operators = []  # type: List[Operator]
+    for name in names:
+        try:
+            logger.debug("looking for operator: %s", name)
+            op = installation.operators[name]
+            logger.debug("found operator with name %s: %s", name, op)
+            operators.append(op)
+        except KeyError:
+            logger.exception("failed to find operator: %s", name)
+            raise OperatorNotFound(name)
+    return operators
+
+
 def throws_errors(func):
     """
     Wraps a function responsible for implementing an API endpoint such that
@@ -142,6 +265,22 @@ def throws_errors(func):
     return wrapper
 
 
+@app.before_request
+def begin_request() -> None:
+    # requests keep the configuration with which they began, even if the
+    # configuration is reloaded while they are in flight
+    if installation is not None:
+        installation.pin()
+        installation.warmup.request_started()
+
+
+@app.teardown_request
+def end_request(exc: Optional[BaseException]) -> None:
+    if installation is not None:
+        installation.warmup.request_finished()
+        installation.unpin()
+
+
 @app.route('/shutdown', methods=['POST'])
 def shutdown():
     installation.mutants.clear()
@@ -164,9 +303,66 @@ def shutdown():
 def status():
     """
     Produces a diagnostic summary of the health of the server.
+
+    Returns:
+        204 if the server is running and no warm-up is in progress, or 200
+        and a description of each running warm-up job, including its
+        progress.
     """
     logger.info("inspecting server health")
-    return '', 204
+    jobs = installation.warmup.jobs
+    if not jobs:
+        return '', 204
+    return {'warmup': [job.to_dict() for job in jobs]}, 200
+
+
+@app.route('/reload', methods=['POST'])
+@throws_errors
+def reload_config():
+    """
+    Reloads the languages and operators of the server from its system and
+    user configuration files. Requests that are in flight continue to use
+    the previous configuration. Mutations that were found by operators that
+    are unchanged by the reload remain cached.
+
+    Returns:
+        200 and the digest of the new configuration, together with the
+        number of languages and operators that it defines.
+    """
+    config = installation.reload()
+    return {'digest': config.digest,
+            'languages': len(list(config.languages)),
+            'operators': len(config.operators)}, 200
+
+
+@app.route('/warmup', methods=['POST'])
+@throws_errors
+def warm_up():
+    """
+    Warms the caches used to find the mutations to the source files of a
+    given set of snapshots in the background.
+
+    URL-encoded Parameters:
+        snapshots: A semi-colon delimited list of the names of the
+            snapshots whose caches should be warmed. Names may be given as
+            glob patterns.
+
+    Returns:
+        202 and the identifier of the background job that performs the
+        warm-up, whose progress is also reported by the status endpoint.
+
+    Raises:
+        SnapshotNotFound: if a name that is not a pattern does not belong to
+            a registered snapshot.
+        BadFormat: if no snapshots are given.
+    """
+    args = flask.request.args
+    patterns = [p for p in args.get('snapshots', '').split(';') if p]
+    if not patterns:
+        raise BadFormat("expected a semi-colon delimited list of snapshots")
+    job = installation.warmup.submit(patterns)
+    headers = {'Location': '/jobs/{}'.format(job.uid)}
+    return {'job': job.uid}, 202, headers
 
 
 @app.route('/languages/<name>', methods=['GET'])
@@ -195,7 +391,11 @@ def list_languages():
     Produces a list of all languages that are supported by this server.
     """
     logger.info("retrieving list of supported languages")
-    return [lang.to_dict() for lang in installation.languages]
+    etag = compute_etag('languages', installation.config.digest)
+    if is_not_modified(etag):
+        return '', 304, etag_headers(etag)
+    jsn = [lang.to_dict() for lang in installation.languages]
+    return jsn, 200, etag_headers(etag)
 
 
 @app.route('/operators/<name>', methods=['GET'])
@@ -208,10 +408,13 @@ def describe_operator(name: str):
     try:
         operator = installation.operators[name]
         logger.info("found operator with name %s: %s", name, operator)
-        return operator.to_dict()
     except KeyError:
         logger.error("failed to find operator: %s", name)
         raise OperatorNotFound(name)
+    etag = compute_etag('operator', name, installation.config.digest)
+    if is_not_modified(etag):
+        return '', 304, etag_headers(etag)
+    return operator.to_dict(), 200, etag_headers(etag)
 
 
 @app.route('/operators', methods=['GET'])
@@ -230,6 +433,11 @@ def list_operators():
     if args is None:
         args = {}
     logger.info("requesting list of operators", extra=args)
+    etag = compute_etag('operators',
+                        installation.config.digest,
+                        json.dumps(args, sort_keys=True))
+    if is_not_modified(etag):
+        return '', 304, etag_headers(etag)
 
     # get a list of all registered operators
     op_list = list(installation.operators)  # type: List[Operator]
@@ -248,7 +456,41 @@ def list_operators():
     logger.info("operators that satisfy given constraints: [%s]",
                 ', '.join([op.name for op in op_list]),
                 extra={'operators': jsn_op_list})
-    return jsn_op_list
+    return jsn_op_list, 200, etag_headers(etag)
+
+
+@app.route('/statistics/constraints', methods=['GET'])
+@throws_errors
+def constraint_statistics():
+    """
+    Reports, for each transformation of each operator, the order in which
+    its constraints are currently checked, together with the number of
+    times each constraint has been evaluated, the number of matches that it
+    has rejected, and the time spent evaluating it.
+
+    Params:
+        operators: If supplied, restricts the report to a semi-colon
+            delimited list of operators, given by their names.
+    """
+    names = flask.request.args.get('operators')
+    if names:
+        op_list = find_operators(names.split(';'))
+    else:
+        op_list = list(installation.operators)
+
+    jsn = []  # type: List[Dict[str, Any]]
+    for op in op_list:
+        for (idx, transformation) in enumerate(op.transformations):
+            jsn_constraints = []
+            for (constraint, stats) in transformation.constraint_statistics():
+                jsn_constraint = stats.to_dict()
+                jsn_constraint['constraint'] = constraint.to_dict()
+                jsn_constraint['cost'] = constraint.COST
+                jsn_constraints.append(jsn_constraint)
+            jsn.append({'operator': op.name,
+                        'transformation': idx,
+                        'constraints': jsn_constraints})
+    return jsn, 200
 
 
 @app.route('/diff/mutations/<name_snapshot>', methods=['PUT'])
@@ -267,12 +509,7 @@ def mutations_to_diff(name_snapshot: str):
         raise SnapshotNotFound(name_snapshot)
 
     logger.debug("extracting mutations from payload")
-    try:
-        mutations = \
-            [Mutation.from_dict(m) for m in flask.request.json['mutations']]
-    except KeyError:
-        logger.exception("failed to transform mutations into unified diff: failed to read mutations from payload.")  # noqa: pycodestyle
-        raise BadFormat("expected a JSON-encoded list of mutations")
+    mutations = mutations_from_request()
     logger.debug("extracted mutations from payload")
 
     diff = sources.mutations_to_diff(snapshot, mutations)
@@ -297,12 +534,7 @@ def mutations_to_replacements(name_snapshot: str):
         raise SnapshotNotFound(name_snapshot)
 
     logger.debug("extracting mutations from payload")
-    try:
-        mutations = \
-            [Mutation.from_dict(m) for m in flask.request.json['mutations']]
-    except KeyError:
-        logger.exception("failed to transform mutations into unified diff: failed to read mutations from payload")  # noqa: pycodestyle
-        raise BadFormat("expected a JSON-encoded list of mutations")
+    mutations = mutations_from_request()
     logger.debug("extracted mutations from payload")
 
     fn_to_replacements = sources.mutations_to_replacements(snapshot, mutations)
@@ -313,15 +545,97 @@ def mutations_to_replacements(name_snapshot: str):
     return flask.jsonify(jsn), 200
 
 
+def list_mutants():
+    """
+    Produces a list of the mutants that are registered with this server.
+
+    URL-encoded Parameters:
+        uuids: An optional semi-colon delimited list of mutant UUIDs. If
+            supplied, a full description of each of the given mutants is
+            produced, and all other parameters are ignored.
+        base: If supplied, restricts the list to mutants of the snapshot with
+            the given name.
+        operator: If supplied, restricts the list to mutants that were
+            generated by the operator with the given name.
+        limit: The maximum number of mutants that should be listed. If
+            further mutants remain, a link to the next page of the list is
+            provided in the Link header of the response.
+        cursor: The UUID of the last mutant in the previous page of the list.
+
+    Raises:
+        MutantNotFound: if one of the given UUIDs does not belong to a
+            registered mutant.
+        BadFormat: if one of the parameters is malformed.
+    """
+    args = flask.request.args
+    mutants = installation.mutants
+
+    if 'uuids' in args:
+        described = []  # type: List[Mutant]
+        for uuid_hex in args['uuids'].split(';'):
+            try:
+                mutant = mutants[UUID(hex=uuid_hex)]
+            except (KeyError, ValueError):
+                logger.error("failed to find mutant: %s", uuid_hex)
+                raise MutantNotFound(uuid_hex)
+            described.append(mutant)
+        if prefers(MEDIA_TYPE_MUTANTS):
+            return flask.Response(Mutant.list_to_bytes(described),
+                                  status=200,
+                                  mimetype=MEDIA_TYPE_MUTANTS,
+                                  headers={'Vary': 'Accept'})
+        descriptions = [mutant.to_dict() for mutant in described]
+        return flask.jsonify(descriptions), 200, {'Vary': 'Accept'}
+
+    try:
+        limit = int(args['limit']) if 'limit' in args else None
+        after = UUID(hex=args['cursor']) if 'cursor' in args else None
+    except ValueError:
+        raise BadFormat("expected an integer limit and a UUID cursor")
+    if limit is not None and limit < 1:
+        raise BadFormat("expected a positive limit")
+
+    logger.info("request list of mutants", extra={'arguments': args})
+    uuids, cursor = mutants.page(after=after,
+                                 limit=limit,
+                                 base=args.get('base'),
+                                 operator=args.get('operator'))
+    list_uuid = [uuid.hex for uuid in uuids]
+    logger.info("%d mutants: %s", len(list_uuid), list_uuid,
+                extra={'mutants': list_uuid})
+
+    headers = {}  # type: Dict[str, str]
+    if cursor is not None:
+        params = args.to_dict()
+        params['cursor'] = cursor.hex
+        url_next = "{}?{}".format(flask.request.path, urlencode(params))
+        headers['Link'] = '<{}>; rel="next"'.format(url_next)
+    return flask.jsonify(list_uuid), 200, headers
+
+
+@app.route('/mutants/count', methods=['GET'])
+@throws_errors
+def count_mutants():
+    """
+    Counts the number of mutants that are registered with this server.
+
+    URL-encoded Parameters:
+        base: If supplied, only mutants of the snapshot with the given name
+            are counted.
+        operator: If supplied, only mutants that were generated by the
+            operator with the given name are counted.
+    """
+    args = flask.request.args
+    num_mutants = installation.mutants.count(base=args.get('base'),
+                                             operator=args.get('operator'))
+    return flask.jsonify(num_mutants), 200
+
+
 @app.route('/mutants', methods=['GET', 'POST'])
 @throws_errors
 def interact_with_mutants():
     if flask.request.method == 'GET':
-        logger.info("request list of mutants")
-        list_uuid = [m.uuid for m in installation.mutants]
-        logger.info("%d mutants: %s", len(list_uuid), list_uuid,
-                    extra={'mutants': list_uuid})
-        return flask.jsonify(list_uuid), 200
+        return list_mutants()
 
     if flask.request.method == 'POST':
         description = flask.request.json
@@ -349,10 +663,63 @@ def interact_with_mutants():
 @app.route('/mutants', methods=['DELETE'])
 @throws_errors
 def clear_mutants():
-    installation.mutants.clear()
+    """
+    Destroys all registered mutants.
+
+    URL-encoded Parameters:
+        async: If set to 1, the mutants are destroyed by a background job,
+            and the server responds immediately with the identifier of that
+            job.
+        workers: The maximum number of mutants that may be destroyed in
+            parallel.
+
+    Returns:
+        204 if all mutants were destroyed; 200 and a mapping from the UUID of
+        each mutant that could not be destroyed to a description of the
+        failure; or, if destruction was performed asynchronously, 202 and
+        the identifier of the background job.
+    """
+    args = flask.request.args
+    try:
+        workers = int(args.get('workers', 8))
+    except ValueError:
+        raise BadFormat("expected an integer number of workers")
+    if workers < 1:
+        raise BadFormat("expected a positive number of workers")
+
+    def clear(job: Optional[Job] = None) -> Dict[str, str]:
+        on_progress = None
+        if job:
+            def on_progress(num_destroyed: int, num_mutants: int) -> None:
+                job.report(destroyed=num_destroyed, total=num_mutants)
+        failures = installation.mutants.clear(workers=workers,
+                                              on_progress=on_progress)
+        return {uuid.hex: str(err) for (uuid, err) in failures.items()}
+
+    if args.get('async') == '1':
+        job = installation.jobs.submit("destroy all mutants", clear)
+        headers = {'Location': '/jobs/{}'.format(job.uid)}
+        return flask.jsonify({'job': job.uid}), 202, headers
+
+    failures = clear()
+    if failures:
+        return flask.jsonify({'failures': failures}), 200
     return '', 204
 
 
+@app.route('/jobs/<uid>', methods=['GET'])
+@throws_errors
+def describe_job(uid: str):
+    """
+    Describes the status of a given background job.
+    """
+    try:
+        job = installation.jobs[uid]
+    except KeyError:
+        raise JobNotFound(uid)
+    return flask.jsonify(job.to_dict()), 200
+
+
 @app.route('/mutants/<uuid_hex>', methods=['GET'])
 @throws_errors
 def interact_with_mutant(uuid_hex: str):
@@ -374,9 +741,9 @@ def delete_mutant(uuid_hex: str):
     uuid = UUID(hex=uuid_hex)
     logger.info("destroying mutant: %s", uuid_hex)
     try:
-        mutant = installation.mutants[uuid]
+        del installation.mutants[uuid]
         logger.info("destroyed mutant: %s", uuid_hex)
-    except Exception:
+    except KeyError:
         logger.exception("failed to find mutant: %s", uuid_hex)
         raise MutantNotFound(uuid_hex)
     return '', 204
@@ -402,6 +769,25 @@ def mutations(name_snapshot: str, filepath: str):
             to specify which mutation operators should be used. If left
             unspecified, all available mutation operators for the language used
             by the given file will be used.
+        lines: An optional semi-colon delimited list of line numbers and
+            inclusive line ranges (e.g., "10-40;55"). If supplied, only
+            mutations that begin on one of those lines are produced.
+        covered_only: If set to 1, only mutations that begin on a line that
+            is covered by the test suite of the snapshot are produced.
+        sample: An optional budget. If supplied, a reproducible random
+            sample of at most this many mutations is produced.
+        seed: The seed used to draw the sample. Defaults to 0.
+        stratify: If supplied together with a budget, the sample is divided
+            evenly between mutations produced by each operator ("operator")
+            or beginning on each line ("line").
+        summary: If set to 1, the number of mutations produced by each
+            operator and transformation and beginning on each line is
+            returned instead of the mutations themselves.
+
+    Returns:
+        a list of mutations, encoded either as JSON or, if preferred by the
+        Accept header of the request, as a binary-encoded mutation set, or,
+        if requested, a summary of those mutations.
 
     Raises:
         SnapshotNotFound: if no snapshot can be found with the given name.
@@ -439,37 +825,74 @@ def mutations(name_snapshot: str, filepath: str):
 
     # determine the set of operators that should be used
     if 'operators' in args:
-        operators = []
         operator_names = args['operators'].split(';')
         logger.info("finding operators specified by argument: %s",
                     args['operators'],
                     extra={'operators': operator_names})
-        for name in operator_names:
-            try:
-                logger.debug("looking for operator: %s", name)
-                op = installation.operators[name]
-                logger.debug("found operator with name %s: %s", name, op)
-                operators.append(op)
-            except KeyError:
-                logger.exception("failed to find operator: %s", name)
-                raise OperatorNotFound(name)
+        operators = find_operators(operator_names)
     else:
         logger.info("using all available operators to generate mutations")
         operators = list(installation.operators)
 
-    # TODO implement line restriction
-    lines = None  # type: Optional[List[int]]
+    lines = None  # type: Optional[Set[int]]
     if 'lines' in args:
-        lines = [int(l) for l in args['lines'].split(';')]
-        logger.debug("restricting mutations to lines: %s", lines)
+        num_lines = installation.sources.num_lines(snapshot, filepath)
+        lines = parse_lines(args['lines'], num_lines)
+        logger.debug("restricting mutations to lines: %s", args['lines'])
+
+    covered_only = args.get('covered_only') == '1'
+
+    sample_size = None  # type: Optional[int]
+    if 'sample' in args:
+        try:
+            sample_size = int(args['sample'])
+            seed = int(args.get('seed', 0))
+        except ValueError:
+            raise BadFormat("expected 'sample' and 'seed' to be integers")
+        if sample_size < 0:
+            raise BadFormat("expected 'sample' to be a non-negative integer")
+    stratify = args.get('stratify')
+    if stratify is not None and stratify not in sampling.STRATA:
+        msg = "unsupported stratification: {} (expected one of: {})"
+        raise BadFormat(msg.format(stratify, ', '.join(sampling.STRATA)))
+
+    # the mutations are entirely determined by the configuration, the contents
+    # of the file, and the arguments to this request
+    summary = args.get('summary') == '1'
+    binary = not summary and prefers(MEDIA_TYPE_MUTATIONS)
+    media_type = MEDIA_TYPE_MUTATIONS if binary else 'application/json'
+    etag = compute_etag('mutations',
+                        installation.config.digest,
+                        filepath,
+                        installation.sources.digest(snapshot, filepath),
+                        json.dumps(sorted(args.items(multi=True))),
+                        media_type)
+    headers = etag_headers(etag)
+    headers['Vary'] = 'Accept'
+    if is_not_modified(etag):
+        logger.info("mutations to file '%s' in snapshot '%s' have not been modified",  # noqa: pycodestyle
+                    filepath, name_snapshot)
+        return flask.Response(status=304, headers=headers)
+
     try:
-        generator_mutations = \
-            installation.mutations(snapshot,
-                                   filepath,
-                                   language=language,
-                                   operators=operators,
-                                   restrict_to_lines=lines)
-        mutations = list(generator_mutations)
+        if sample_size is not None:
+            mutations = \
+                installation.sample_mutations(snapshot,
+                                              filepath,
+                                              sample_size,
+                                              seed=seed,
+                                              stratify=stratify,
+                                              language=language,
+                                              operators=operators,
+                                              restrict_to_lines=lines,
+                                              covered_only=covered_only)
+        else:
+            mutations = installation.mutation_set(snapshot,
+                                                  filepath,
+                                                  language=language,
+                                                  operators=operators,
+                                                  restrict_to_lines=lines,
+                                                  covered_only=covered_only)
     except BoggartException as e:
         logger.exception("failed to find mutations due to error: %s", e.message)  # noqa: pycodestyle
         raise
@@ -482,10 +905,173 @@ def mutations(name_snapshot: str, filepath: str):
                 filepath,
                 name_snapshot)
 
+    if summary:
+        return mutations.summary().to_dict(), 200, headers
+
     logger.debug("serialising discovered mutations")
-    jsn = [m.to_dict() for m in mutations]
+    if binary:
+        encoded = mutations.to_bytes()
+        logger.debug("serialised discovered mutations")
+        return flask.Response(encoded,
+                              status=200,
+                              mimetype=MEDIA_TYPE_MUTATIONS,
+                              headers=headers)
+    jsn = mutations.to_dicts()
     logger.debug("serialised discovered mutations")
-    return jsn
+    return jsn, 200, headers
+
+
+@app.route('/summary/mutations/<name_snapshot>', methods=['GET'])
+@throws_errors
+def summarise_mutations(name_snapshot: str):
+    """
+    Counts the possible single-order mutations to each of a given set of
+    files belonging to a BugZoo snapshot.
+
+    Path Parameters:
+        name_snapshot: The name of the BugZoo snapshot.
+
+    URL-encoded Parameters:
+        files: A semi-colon delimited list of the files that should be
+            summarised.
+        operators: An optional semi-colon delimited list of the mutation
+            operators that should be used. If left unspecified, all
+            available mutation operators will be used.
+        covered_only: If set to 1, only mutations that begin on a line that
+            is covered by the test suite of the snapshot are counted.
+
+    Returns:
+        the total number of mutations, together with a summary of the
+        mutations to each file.
+
+    Raises:
+        SnapshotNotFound: if no snapshot can be found with the given name.
+        FileNotFound: if one of the files is not found inside the snapshot.
+        BadFormat: if no files are given.
+    """
+    args = flask.request.args
+    snapshot = find_snapshot(name_snapshot)
+    filepaths = [fn for fn in args.get('files', '').split(';') if fn]
+    if not filepaths:
+        raise BadFormat("expected a semi-colon delimited list of files")
+    operators = None  # type: Optional[List[Operator]]
+    if 'operators' in args:
+        operators = find_operators(args['operators'].split(';'))
+    covered_only = args.get('covered_only') == '1'
+
+    sources = installation.sources
+    etag = compute_etag('summary',
+                        installation.config.digest,
+                        *[sources.digest(snapshot, fn) for fn in filepaths],
+                        json.dumps(sorted(args.items(multi=True))))
+    headers = etag_headers(etag)
+    if is_not_modified(etag):
+        return flask.Response(status=304, headers=headers)
+
+    total = 0
+    file_to_summary = {}  # type: Dict[str, Any]
+    for filepath in filepaths:
+        summary = installation.mutation_set(snapshot, filepath,
+                                            operators=operators,
+                                            covered_only=covered_only
+                                            ).summary()
+        total += summary.total
+        file_to_summary[filepath] = summary.to_dict()
+    logger.info("counted %d mutations to %d files in snapshot '%s'",
+                total, len(filepaths), name_snapshot)
+    return {'total': total, 'files': file_to_summary}, 200, headers
+
+
+@app.route('/delta/mutations/<name_snapshot>', methods=['PUT'])
+@throws_errors
+def mutation_delta(name_snapshot: str):
+    """
+    Computes the changes to the set of possible single-order mutations of
+    each file that is modified between a given base snapshot and a target,
+    which is given either as another snapshot or as a unified diff.
+
+    Path Parameters:
+        name_snapshot: The name of the base BugZoo snapshot.
+
+    JSON Body:
+        target: The name of the target snapshot. Must be accompanied by a
+            list of files that should be compared.
+        files: The files that should be compared between the base and target
+            snapshots.
+        diff: A unified diff that transforms the base snapshot into the
+            target. May be given instead of a target snapshot.
+        operators: An optional list of the names of the mutation operators
+            that should be used. If omitted, all operators are used.
+        context: The number of unchanged lines surrounding each change that
+            should be searched for new mutations. Defaults to 3.
+
+    Returns:
+        a mapping from the path of each file to the mutations that were
+        added, removed and carried over to the target.
+
+    Raises:
+        SnapshotNotFound: if either snapshot cannot be found.
+        FileNotFound: if a given file is found in neither snapshot.
+        BadFormat: if the body of the request is malformed, or if the diff
+            does not apply to the base snapshot.
+    """
+    body = flask.request.get_json(silent=True)
+    if not isinstance(body, dict):
+        raise BadFormat("expected a JSON object")
+    base = find_snapshot(name_snapshot)
+
+    operators = None  # type: Optional[List[Operator]]
+    if 'operators' in body:
+        if not isinstance(body['operators'], list):
+            raise BadFormat("expected 'operators' to be a list")
+        operators = find_operators(body['operators'])
+    context = body.get('context', 3)
+    if not isinstance(context, int) or context < 0:
+        raise BadFormat("expected 'context' to be a non-negative integer")
+
+    # determine the base and target versions of each changed file
+    changes = []  # type: List[Any]
+    sources = installation.sources
+    old_fn = None  # type: Optional[str]
+    new_fn = None  # type: Optional[str]
+    if 'diff' in body:
+        if not isinstance(body['diff'], str):
+            raise BadFormat("expected 'diff' to be a string")
+        for change in parse_unified_diff(body['diff']):
+            old_fn = change.old_filename
+            base_text = sources.read_file(base, old_fn) if old_fn else ''
+            target_text, blocks = apply_file_change(base_text, change)
+            changes.append((old_fn, change.new_filename, target_text, blocks))
+    elif 'target' in body:
+        target = find_snapshot(body['target'])
+        filepaths = body.get('files')
+        if not isinstance(filepaths, list) or \
+           not all(isinstance(fn, str) for fn in filepaths):
+            raise BadFormat("expected 'files' to be a list of file paths")
+        for filepath in filepaths:
+            old_fn = new_fn = filepath
+            try:
+                sources.read_file(base, filepath)
+            except FileNotFound:
+                old_fn = None
+            try:
+                target_text = sources.read_file(target, filepath)
+            except FileNotFound:
+                if old_fn is None:
+                    raise
+                new_fn, target_text = None, ''
+            changes.append((old_fn, new_fn, target_text, None))
+    else:
+        raise BadFormat("expected either a 'target' snapshot or a 'diff'")
+
+    jsn = {}  # type: Dict[str, Any]
+    for (old_fn, new_fn, target_text, blocks) in changes:
+        delta = installation.mutation_delta(base, old_fn, new_fn, target_text,
+                                            blocks=blocks,
+                                            operators=operators,
+                                            context=context)
+        jsn[new_fn or old_fn] = delta.to_dict()
+    return jsn, 200
 
 
 def launch(port: int = 8000,
@@ -493,7 +1079,12 @@ def launch(port: int = 8000,
            url_rooibos: str = 'http://host.docker.internal:8888',
            host: str = '0.0.0.0',
            log_filename: Optional[str] = None,
-           log_level: str = 'info'
+           log_level: str = 'info',
+           num_workers: int = 0,
+           blob_dir: Optional[str] = None,
+           discovery_max_capacity: int = 4096,
+           warm_up: Optional[List[str]] = None,
+           watch_config: bool = False
            ) -> None:
     global installation, log_to_file
 
@@ -548,14 +1139,27 @@ def launch(port: int = 8000,
                 url_rooibos)
     client_rooibos = rooibos.Client(url_rooibos, timeout_connection=60)
     logger.info("connected to Rooibos server")
+    watcher = None  # type: Optional[ConfigWatcher]
     try:
-        installation = Installation.load(client_bugzoo, client_rooibos)
+        installation = Installation.load(
+            client_bugzoo, client_rooibos,
+            num_workers=num_workers,
+            blob_dir=blob_dir,
+            discovery_max_capacity=discovery_max_capacity)
+        if warm_up:
+            installation.warmup.submit(warm_up)
+        if watch_config:
+            watcher = ConfigWatcher(installation)
+            watcher.start()
         report_system_resources(logger)
         report_resource_limits(logger)
         logger.info("launching HTTP server at %s:%d", host, port)
         app.run(port=port, host=host, debug=False)
     finally:
+        if watcher:
+            watcher.stop()
         installation.mutants.clear()
+        installation.close()
 
 
 def main() -> None:
@@ -589,11 +1193,34 @@ def main() -> None:
                         type=str,
                         default='0.0.0.0',
                         help='the IP address of the host.')
+    parser.add_argument('--workers',
+                        type=int,
+                        default=0,
+                        help='the number of worker processes to which CPU-bound work should be offloaded.')  # noqa: pycodestyle
+    parser.add_argument('--blob-dir',
+                        type=str,
+                        help='the directory in which the contents of source files should be stored as files. If omitted, contents are kept in memory.')  # noqa: pycodestyle
+    parser.add_argument('--max-discovery-cache-size',
+                        type=int,
+                        default=4096,
+                        help='the largest number of files whose mutations may be cached when caches are warmed.')  # noqa: pycodestyle
+    parser.add_argument('--warm-up',
+                        type=str,
+                        help='a semi-colon delimited list of the names, or glob patterns, of the snapshots whose caches should be warmed in the background at startup.')  # noqa: pycodestyle
+    parser.add_argument('--watch-config',
+                        action='store_true',
+                        help='reload the configuration whenever the configuration files change.')  # noqa: pycodestyle
     args = parser.parse_args()
+    warm_up = args.warm_up.split(';') if args.warm_up else None
 
     launch(port=args.port,
            url_bugzoo=args.bugzoo,
            url_rooibos=args.rooibos,
            host=args.host,
            log_filename=args.log_file,
-           log_level=args.log_level)
+           log_level=args.log_level,
+           num_workers=args.workers,
+           blob_dir=args.blob_dir,
+           discovery_max_capacity=args.max_discovery_cache_size,
+           warm_up=warm_up,
+           watch_config=args.watch_config)
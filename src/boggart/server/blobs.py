@@ -0,0 +1,170 @@
+"""
+Provides a content-addressed store for the contents of source files, in which
+each distinct file content is stored once, regardless of the number of
+snapshots and paths at which it appears.
+"""
+__all__ = ['BlobStore']
+
+from typing import Dict, Optional, Set
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+
+class BlobStore(object):
+    """
+    Stores texts by the digests of their contents. By default, texts are
+    kept in memory. If a directory is given, each text is instead written to
+    a file within that directory, named after its digest, so that worker
+    processes can read the text from the page cache rather than receive a
+    copy. Only a bounded number of decoded texts are then kept in memory;
+    other texts are read back from their files on demand. No files are held
+    open between reads.
+    """
+    def __init__(self,
+                 directory: Optional[str] = None,
+                 cache_size: int = 256
+                 ) -> None:
+        """
+        Parameters:
+            directory: the directory in which texts should be stored. If
+                omitted, texts are stored in memory.
+            cache_size: the maximum number of decoded texts that are kept in
+                memory when texts are stored in a directory.
+        """
+        if directory is not None:
+            directory = os.path.abspath(directory)
+            os.makedirs(directory, exist_ok=True)
+        self.__directory = directory
+        self.__cache_size = cache_size
+        self.__lock = threading.Lock()
+        self.__texts = OrderedDict()  # type: OrderedDict[str, str]
+        self.__on_disk = set()  # type: Set[str]
+        self.__sizes = {}  # type: Dict[str, int]
+
+    @property
+    def directory(self) -> Optional[str]:
+        """
+        The directory in which texts are stored, if any.
+        """
+        return self.__directory
+
+    def __len__(self) -> int:
+        """
+        Returns the number of distinct texts in this store.
+        """
+        return len(self.__sizes)
+
+    def __contains__(self, digest: str) -> bool:
+        """
+        Determines whether a text with a given digest is in this store.
+        """
+        return digest in self.__sizes
+
+    @property
+    def num_bytes(self) -> int:
+        """
+        The total size, in bytes, of the UTF-8 encodings of the distinct
+        texts in this store.
+        """
+        return sum(self.__sizes.values())
+
+    def path(self, digest: str) -> Optional[str]:
+        """
+        Returns the path to the file that holds the UTF-8 encoding of the
+        text with a given digest, or None if texts are kept in memory.
+        """
+        if self.__directory is None or digest not in self.__on_disk:
+            return None
+        return os.path.join(self.__directory, digest)
+
+    def put(self, text: str) -> str:
+        """
+        Adds a given text to this store, if it is not already present.
+
+        Returns:
+            the digest of the text.
+        """
+        contents = text.encode('utf-8')
+        digest = hashlib.sha256(contents).hexdigest()
+        with self.__lock:
+            if digest in self.__sizes:
+                return digest
+            # empty files are kept in memory, since they cost nothing to copy
+            if self.__directory is None or not contents:
+                self.__texts[digest] = text
+            else:
+                self._write(digest, contents)
+                self.__on_disk.add(digest)
+                self._remember(digest, text)
+            # the digest is only recorded once the text has been stored
+            self.__sizes[digest] = len(contents)
+        logger.debug("stored blob [%s] (%d bytes)", digest, len(contents))
+        return digest
+
+    def get(self, digest: str) -> str:
+        """
+        Returns the text with a given digest.
+
+        Raises:
+            KeyError: if there is no text with the given digest.
+        """
+        with self.__lock:
+            if digest in self.__texts:
+                if digest in self.__on_disk:
+                    self.__texts.move_to_end(digest)
+                return self.__texts[digest]
+            if digest not in self.__on_disk:
+                raise KeyError(digest)
+            path = self.path(digest)
+        assert path is not None
+        with open(path, 'rb') as f:
+            text = f.read().decode('utf-8')
+        with self.__lock:
+            self._remember(digest, text)
+        return text
+
+    def _remember(self, digest: str, text: str) -> None:
+        """
+        Keeps the decoded form of a text that is stored on disk, evicting the
+        least recently used decoded texts beyond the size of the cache.
+        """
+        self.__texts[digest] = text
+        self.__texts.move_to_end(digest)
+        stored = [d for d in self.__texts if d in self.__on_disk]
+        for evicted in stored[:max(0, len(stored) - self.__cache_size)]:
+            del self.__texts[evicted]
+
+    def _write(self, digest: str, contents: bytes) -> None:
+        """
+        Writes the contents of a blob to disk, unless a file for that blob
+        already exists.
+        """
+        assert self.__directory is not None
+        path = os.path.join(self.__directory, digest)
+        if os.path.exists(path):
+            return
+        # the file is written in full before it becomes visible
+        fd, tmp_path = tempfile.mkstemp(dir=self.__directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(contents)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def close(self) -> None:
+        """
+        Forgets the texts held by this store. Any files are left on disk.
+        """
+        with self.__lock:
+            self.__on_disk.clear()
+            self.__texts.clear()
+            self.__sizes.clear()
@@ -0,0 +1,76 @@
+"""
+Splits large source files into overlapping chunks of lines that can be
+matched independently.
+"""
+__all__ = ['Chunk', 'plan_chunks']
+
+from typing import List, Sequence
+
+import attr
+
+
+@attr.s(frozen=True, slots=True)
+class Chunk(object):
+    """
+    Describes a chunk of a file by a range of one-indexed lines.
+
+    Attributes:
+        first: the first line of the chunk.
+        last: the last line that is owned by the chunk. Each line of the
+            file is owned by exactly one chunk, and only matches that begin
+            on a line owned by the chunk are reported for it.
+        stop: the last line of the chunk, including any lines of overlap
+            with the following chunk.
+    """
+    first = attr.ib(type=int)
+    last = attr.ib(type=int)
+    stop = attr.ib(type=int)
+
+
+def plan_chunks(line_starts: Sequence[int],
+                size_text: int,
+                first: int,
+                last: int,
+                size: int,
+                overlap: int
+                ) -> List[Chunk]:
+    """
+    Splits an inclusive range of lines within a text into chunks of
+    approximately a given number of characters. Chunks are split at the
+    start of a line, preferring the line after a blank line when one is
+    found within the preceding lines of overlap, and each chunk extends a
+    given number of lines into the next so that matches that span several
+    lines are not lost.
+
+    Parameters:
+        line_starts: the offset at which each line of the text begins.
+        size_text: the number of characters in the text.
+        first: the first line of the range.
+        last: the last line of the range.
+        size: the preferred number of characters in each chunk.
+        overlap: the number of lines of overlap between chunks.
+    """
+    def offset(line: int) -> int:
+        return line_starts[line - 1] if line <= len(line_starts) else size_text
+
+    def is_blank(line: int) -> bool:
+        return offset(line + 1) - offset(line) <= 1
+
+    chunks = []  # type: List[Chunk]
+    while first <= last:
+        # find the last line that ends within the preferred size
+        limit = offset(first) + size
+        end = first
+        while end < last and offset(end + 2) <= limit:
+            end += 1
+
+        if end < last:
+            for line in range(end, max(first, end - overlap), -1):
+                if is_blank(line):
+                    end = line
+                    break
+
+        stop = min(last, end + overlap)
+        chunks.append(Chunk(first, end, stop))
+        first = end + 1
+    return chunks
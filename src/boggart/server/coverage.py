@@ -0,0 +1,63 @@
+from typing import Dict, FrozenSet
+import logging
+import threading
+
+from bugzoo.client import Client as BugZooClient
+from bugzoo.core.bug import Bug
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['CoverageManager']
+
+
+class CoverageManager(object):
+    """
+    Provides the lines of each source file that are covered by the test
+    suite of a given snapshot. Coverage is computed by BugZoo once per
+    snapshot, and is then cached.
+    """
+    def __init__(self, client_bugzoo: BugZooClient) -> None:
+        self.__bugzoo = client_bugzoo
+        self.__lock = threading.Lock()
+        self.__snapshot_locks = {}  # type: Dict[str, threading.Lock]
+        self.__cache = {}  # type: Dict[str, Dict[str, FrozenSet[int]]]
+
+    def _file_to_lines(self, snapshot: Bug) -> Dict[str, FrozenSet[int]]:
+        # coverage is computed while holding a lock for the snapshot alone,
+        # so that computing the coverage of one snapshot does not block
+        # requests for the (cached) coverage of any other snapshot
+        name = snapshot.name
+        with self.__lock:
+            if name in self.__cache:
+                return self.__cache[name]
+            lock = self.__snapshot_locks.setdefault(name, threading.Lock())
+
+        with lock:
+            with self.__lock:
+                if name in self.__cache:
+                    return self.__cache[name]
+
+            logger.info("computing test suite coverage for snapshot: %s",
+                        name)
+            lines = self.__bugzoo.bugs.coverage(snapshot).lines
+            file_to_lines = {fn: frozenset(line.num for line in lines[fn])
+                             for fn in lines.files}
+            logger.info("computed test suite coverage for snapshot: %s",
+                        name)
+            with self.__lock:
+                self.__cache[name] = file_to_lines
+            return file_to_lines
+
+    def lines(self, snapshot: Bug, filepath: str) -> FrozenSet[int]:
+        """
+        Returns the set of lines within a given file that are executed by at
+        least one test in the test suite of a given snapshot.
+        """
+        return self._file_to_lines(snapshot).get(filepath, frozenset())
+
+    def forget(self, snapshot: Bug) -> None:
+        """
+        Discards any cached coverage information for a given snapshot.
+        """
+        with self.__lock:
+            self.__cache.pop(snapshot.name, None)
@@ -0,0 +1,297 @@
+"""
+Provides the means to describe, parse and apply changes to the lines of a
+source file, and to map line numbers across such changes.
+"""
+__all__ = ['ChangedBlock', 'FileChange', 'LineMapping', 'parse_unified_diff',
+           'changed_blocks', 'apply_file_change']
+
+from typing import List, Optional, Sequence, Tuple
+import bisect
+import difflib
+import re
+
+import attr
+
+from ..exceptions import BadFormat
+
+_HUNK_HEADER = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+
+
+@attr.s(frozen=True, slots=True)
+class ChangedBlock(object):
+    """
+    Describes a contiguous block of lines that were replaced, inserted or
+    deleted by a change to a file. Lines are given as zero-indexed, half-open
+    ranges in the old and new versions of the file. An empty old range
+    describes an insertion; an empty new range describes a deletion.
+    """
+    old_start = attr.ib(type=int)
+    old_stop = attr.ib(type=int)
+    new_start = attr.ib(type=int)
+    new_stop = attr.ib(type=int)
+
+
+@attr.s(frozen=True, slots=True)
+class Hunk(object):
+    """
+    Describes a single hunk of a unified diff as the (one-indexed) line at
+    which it begins in the old file, followed by a sequence of tagged lines,
+    where each tag is either ' ', '-' or '+'. A hunk also records whether the
+    last line of the old or new file lacks a trailing newline.
+    """
+    old_start = attr.ib(type=int)
+    lines = attr.ib(type=Tuple[Tuple[str, str], ...])
+    old_missing_eol = attr.ib(type=bool, default=False)
+    new_missing_eol = attr.ib(type=bool, default=False)
+
+
+@attr.s(frozen=True, slots=True)
+class FileChange(object):
+    """
+    Describes the changes made to a single file by a unified diff. The old
+    or new name of the file is None if the file was created or deleted,
+    respectively.
+    """
+    old_filename = attr.ib(type=Optional[str])
+    new_filename = attr.ib(type=Optional[str])
+    hunks = attr.ib(type=Tuple[Hunk, ...])
+
+
+def _filename(header: str) -> Optional[str]:
+    name = header[4:].split('\t')[0].strip()
+    if name == '/dev/null':
+        return None
+    if name.startswith('a/') or name.startswith('b/'):
+        name = name[2:]
+    return name
+
+
+def parse_unified_diff(diff: str) -> List[FileChange]:
+    """
+    Parses a unified diff into a description of the changes that it makes to
+    each file.
+
+    Raises:
+        BadFormat: if the given diff is malformed.
+    """
+    changes = []  # type: List[FileChange]
+    lines = diff.split('\n')
+    i = 0
+    while i < len(lines):
+        if not lines[i].startswith('--- '):
+            i += 1
+            continue
+        if i + 1 >= len(lines) or not lines[i + 1].startswith('+++ '):
+            raise BadFormat("expected '+++' line after '---' line in diff")
+        old_filename = _filename(lines[i])
+        new_filename = _filename(lines[i + 1])
+        i += 2
+
+        hunks = []  # type: List[Hunk]
+        while i < len(lines) and lines[i].startswith('@@'):
+            m = _HUNK_HEADER.match(lines[i])
+            if not m:
+                raise BadFormat("malformed hunk header: {}".format(lines[i]))
+            old_start = int(m.group(1))
+            num_old = int(m.group(2)) if m.group(2) is not None else 1
+            num_new = int(m.group(4)) if m.group(4) is not None else 1
+            i += 1
+
+            body = []  # type: List[Tuple[str, str]]
+            old_missing_eol = new_missing_eol = False
+            while num_old > 0 or num_new > 0 or \
+                    (i < len(lines) and lines[i].startswith('\\')):
+                if i >= len(lines):
+                    raise BadFormat("unexpected end of hunk in diff")
+                line = lines[i]
+                i += 1
+                tag, content = line[:1] or ' ', line[1:]
+                if tag == '\\':
+                    # "\ No newline at end of file" refers to the last line
+                    if not body:
+                        raise BadFormat("unexpected marker in diff")
+                    last_tag = body[-1][0]
+                    old_missing_eol |= last_tag in ' -'
+                    new_missing_eol |= last_tag in ' +'
+                    continue
+                if tag not in ' -+':
+                    raise BadFormat("malformed line in hunk: {}".format(line))
+                if tag in ' -':
+                    num_old -= 1
+                if tag in ' +':
+                    num_new -= 1
+                if num_old < 0 or num_new < 0:
+                    raise BadFormat("hunk is longer than its header states")
+                body.append((tag, content))
+            hunks.append(Hunk(old_start, tuple(body),
+                              old_missing_eol, new_missing_eol))
+        changes.append(FileChange(old_filename, new_filename, tuple(hunks)))
+    return changes
+
+
+def _split_lines(text: str) -> Tuple[List[str], bool]:
+    """
+    Splits a text into its lines, without line endings, and reports whether
+    the last line is terminated by a newline.
+    """
+    if not text:
+        return [], True
+    lines = text.split('\n')
+    if lines[-1] == '':
+        lines.pop()
+        return lines, True
+    return lines, False
+
+
+def apply_file_change(text: str,
+                      change: FileChange
+                      ) -> Tuple[str, List[ChangedBlock]]:
+    """
+    Applies the changes described by a unified diff to the contents of a
+    file.
+
+    Returns:
+        the contents of the changed file, together with the blocks of lines
+        that were changed.
+
+    Raises:
+        BadFormat: if the changes do not apply cleanly to the given text.
+    """
+    old_lines, has_eol = _split_lines(text)
+    new_lines = []  # type: List[str]
+    blocks = []  # type: List[ChangedBlock]
+    i = 0  # the index of the next unconsumed line in the old file
+    for hunk in sorted(change.hunks, key=lambda h: h.old_start):
+        # an empty range in the old file starts after the given line
+        start = hunk.old_start - 1
+        if not any(tag in ' -' for (tag, _) in hunk.lines):
+            start = hunk.old_start
+        if start < i or start > len(old_lines):
+            raise BadFormat("hunk does not apply at line {}".format(start))
+        new_lines += old_lines[i:start]
+        i = start
+
+        block = None  # type: Optional[List[int]]
+        for tag, content in hunk.lines:
+            if tag == ' ':
+                if block:
+                    blocks.append(ChangedBlock(*block))
+                    block = None
+                if i >= len(old_lines) or old_lines[i] != content:
+                    msg = "context does not match at line {}"
+                    raise BadFormat(msg.format(i + 1))
+                new_lines.append(content)
+                i += 1
+                continue
+            if not block:
+                block = [i, i, len(new_lines), len(new_lines)]
+            if tag == '-':
+                if i >= len(old_lines) or old_lines[i] != content:
+                    msg = "deleted line does not match at line {}"
+                    raise BadFormat(msg.format(i + 1))
+                i += 1
+                block[1] = i
+            else:
+                new_lines.append(content)
+                block[3] = len(new_lines)
+        if block:
+            blocks.append(ChangedBlock(*block))
+        if hunk.lines and hunk.lines[-1][0] in ' +' and i == len(old_lines):
+            has_eol = not hunk.new_missing_eol
+
+    new_lines += old_lines[i:]
+    new_text = '\n'.join(new_lines)
+    if new_lines and has_eol:
+        new_text += '\n'
+    return new_text, blocks
+
+
+def changed_blocks(old_text: str, new_text: str) -> List[ChangedBlock]:
+    """
+    Computes the blocks of lines that differ between two versions of a file.
+    """
+    old_lines = old_text.split('\n')
+    new_lines = new_text.split('\n')
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines,
+                                      autojunk=False)
+    return [ChangedBlock(i1, i2, j1, j2)
+            for (tag, i1, i2, j1, j2) in matcher.get_opcodes()
+            if tag != 'equal']
+
+
+class LineMapping(object):
+    """
+    Maps spans of lines between the old and new versions of a file, given
+    the blocks of lines that were changed. A span is only mapped if none of
+    its lines were changed and no lines were inserted or deleted within it.
+    Lines are one-indexed.
+    """
+    def __init__(self, blocks: Sequence[ChangedBlock]) -> None:
+        blocks = sorted(blocks, key=lambda b: (b.old_start, b.new_start))
+        self.__old = ([b.old_start for b in blocks],
+                      [b.old_stop for b in blocks])
+        self.__new = ([b.new_start for b in blocks],
+                      [b.new_stop for b in blocks])
+
+    @staticmethod
+    def _map(line_first: int,
+             line_last: int,
+             source: Tuple[List[int], List[int]],
+             target: Tuple[List[int], List[int]]
+             ) -> Optional[int]:
+        starts, stops = source
+        first, last = line_first - 1, line_last - 1
+
+        # only the last block that starts at or before the end of the span
+        # may intersect with it; all earlier blocks lie before that block
+        idx = bisect.bisect_right(starts, last)
+        if idx == 0:
+            return line_first
+        start, stop = starts[idx - 1], stops[idx - 1]
+        if start < stop and stop > first:
+            return None
+        if start == stop and first < start <= last:
+            return None
+        return line_first + target[1][idx - 1] - stop
+
+    def old_to_new(self, first: int, last: int) -> Optional[int]:
+        """
+        Returns the first line, in the new version of the file, of a span of
+        lines in the old version, or None if that span was changed.
+        """
+        return self._map(first, last, self.__old, self.__new)
+
+    def new_to_old(self, first: int, last: int) -> Optional[int]:
+        """
+        Returns the first line, in the old version of the file, of a span of
+        lines in the new version, or None if that span was changed.
+        """
+        return self._map(first, last, self.__new, self.__old)
+
+    def changed_regions(self,
+                        num_lines: int,
+                        context: int = 0
+                        ) -> List[Tuple[int, int]]:
+        """
+        Computes the regions of the new version of the file that contain
+        changed lines, padded by a number of lines of context and merged
+        where they overlap.
+
+        Returns:
+            a list of inclusive, one-indexed ranges of lines.
+        """
+        regions = []  # type: List[Tuple[int, int]]
+        starts, stops = self.__new
+        for start, stop in zip(starts, stops):
+            # a deletion affects the lines on either side of it
+            first, last = (start + 1, stop) if start < stop \
+                else (start, start + 1)
+            first = max(1, first - context)
+            last = min(num_lines, last + context)
+            if first > last:
+                continue
+            if regions and first <= regions[-1][1] + 1:
+                regions[-1] = (regions[-1][0], max(last, regions[-1][1]))
+            else:
+                regions.append((first, last))
+        return regions
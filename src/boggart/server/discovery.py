@@ -0,0 +1,106 @@
+from typing import Hashable, Optional
+from collections import OrderedDict
+import logging
+import threading
+
+from ..core import MutationSet
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['DiscoveryCache']
+
+
+class DiscoveryCache(object):
+    """
+    Stores the complete sets of mutations that were discovered in source
+    files, so that they may be reused by later requests. Entries are keyed by
+    the digest of the file contents rather than by snapshot, allowing files
+    that are shared by several snapshots to be analysed once. When the cache
+    is full, the least recently used entry is discarded.
+
+    The capacity of the cache may be grown on demand (e.g., to hold the
+    mutations of a snapshot whose caches are being warmed), but never beyond
+    a fixed maximum capacity.
+    """
+    def __init__(self, capacity: int = 256, max_capacity: int = 4096) -> None:
+        """
+        Parameters:
+            capacity: the initial number of entries that the cache holds.
+            max_capacity: the number of entries to which the capacity of the
+                cache may be grown.
+        """
+        assert capacity > 0
+        assert max_capacity >= capacity
+        self.__capacity = capacity
+        self.__max_capacity = max_capacity
+        self.__lock = threading.Lock()
+        self.__entries = OrderedDict()  # type: OrderedDict
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    @property
+    def capacity(self) -> int:
+        """
+        The maximum number of entries that this cache holds.
+        """
+        return self.__capacity
+
+    @property
+    def max_capacity(self) -> int:
+        """
+        The number of entries to which the capacity of this cache may be
+        grown.
+        """
+        return self.__max_capacity
+
+    def reserve(self, num_entries: int) -> int:
+        """
+        Grows the capacity of this cache, if necessary and as far as its
+        maximum capacity allows, so that a given number of entries can be
+        added without evicting any of the current entries.
+
+        Returns:
+            the number of entries, up to the given number, that can be added
+            without evicting any of the current entries.
+        """
+        with self.__lock:
+            needed = min(len(self.__entries) + num_entries,
+                         self.__max_capacity)
+            if needed > self.__capacity:
+                logger.debug("growing discovery cache from %d to %d entries",
+                             self.__capacity, needed)
+                self.__capacity = needed
+            room = max(0, self.__capacity - len(self.__entries))
+            return min(num_entries, room)
+
+    def get(self, key: Hashable) -> Optional[MutationSet]:
+        """
+        Returns the set of mutations stored under a given key, or None if
+        there is no such entry. Returned sets are shared and must not be
+        modified.
+        """
+        with self.__lock:
+            mutations = self.__entries.get(key)
+            if mutations is not None:
+                self.__entries.move_to_end(key)
+            return mutations
+
+    def put(self, key: Hashable, mutations: MutationSet) -> None:
+        """
+        Stores a set of mutations under a given key.
+        """
+        with self.__lock:
+            self.__entries[key] = mutations
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__capacity:
+                evicted, _ = self.__entries.popitem(last=False)
+                logger.debug("evicted discovered mutations from cache: %s",
+                             evicted)
+
+    def clear(self) -> None:
+        """
+        Discards all stored mutations.
+        """
+        with self.__lock:
+            self.__entries.clear()
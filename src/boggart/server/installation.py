@@ -1,18 +1,34 @@
-from typing import Optional, Tuple, Dict, Iterator, List
+from typing import (Optional, Tuple, Dict, FrozenSet, Iterable, Iterator,
+                    List, Sequence, Hashable, Set)
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import os
 import logging
+import threading
 
 import rooibos
 from bugzoo.client import Client as BugZooClient
 from bugzoo.core.bug import Bug
 from bugzoo.core.fileline import FileLine
-from rooibos import Client as RooibosClient
+from rooibos import Client as RooibosClient, Match
 
+from . import sampling
+from .blobs import BlobStore
+from .chunking import Chunk, plan_chunks
+from .coverage import CoverageManager
+from .diff import ChangedBlock, LineMapping, changed_blocks
+from .discovery import DiscoveryCache
+from .jobs import JobManager
+from .literal import find_literal
 from .mutant import MutantManager
+from .providers import SourceProvider, build_provider
 from .sourcefile import SourceFileManager
+from .warmup import WarmUpManager
+from .workers import WorkerPool
 from ..exceptions import *
 from ..core import Language, Mutation, Operator, Mutant, FileLocationRange, \
-                   Location, LocationRange
+                   Location, LocationRange, MutationSet, MutationDelta, \
+                   LexicalMask, TokenIndex, Transformation
 from ..config import Configuration, Languages, Operators
 
 logger = logging.getLogger(__name__)
@@ -51,7 +67,10 @@ class Installation(object):
              client_bugzoo: BugZooClient,
              client_rooibos: RooibosClient,
              *,
-             user_config_path: Optional[str] = None
+             user_config_path: Optional[str] = None,
+             num_workers: int = 0,
+             blob_dir: Optional[str] = None,
+             discovery_max_capacity: int = 4096
              ) -> 'Installation':
         """
         Loads a boggart installation.
@@ -62,8 +81,34 @@ class Installation(object):
             config_filepath: The path to the user configuration file for
                 boggart. If left unspecified,
                 `Installation.default_user_config_path` will be used instead.
+            num_workers: The number of processes in the pool to which
+                CPU-bound work is offloaded. If zero, no pool is used.
+            blob_dir: The directory in which the contents of source files
+                are stored. If omitted, contents are kept in memory.
+            discovery_max_capacity: The largest number of files whose
+                mutations may be cached.
         """
         logger.info("loading boggart installation")
+        config = cls.load_config(user_config_path)
+        return Installation(config, client_bugzoo, client_rooibos,
+                            num_workers=num_workers,
+                            blob_dir=blob_dir,
+                            discovery_max_capacity=discovery_max_capacity,
+                            user_config_path=user_config_path)
+
+    @classmethod
+    def load_config(cls,
+                    user_config_path: Optional[str] = None
+                    ) -> Configuration:
+        """
+        Loads the system configuration, extended by the user configuration,
+        if one exists.
+
+        Parameters:
+            user_config_path: The path to the user configuration file for
+                boggart. If left unspecified,
+                `Installation.default_user_config_path` will be used instead.
+        """
         if not user_config_path:
             user_config_path = Installation.default_user_config_path()
             logger.info("no user config path provided -- using default user config path, '%s', instead",  # noqa: pycodestyle
@@ -77,30 +122,195 @@ class Installation(object):
         if not os.path.isfile(user_config_path):
             logger.info("no user configuration file found at %s",
                         user_config_path)
-            return Installation(system_cfg, client_bugzoo, client_rooibos)
+            return system_cfg
 
         logger.info("loading user configuration from file: %s",
                     user_config_path)
         user_cfg = Configuration.from_file(user_config_path, system_cfg)
         logger.info("loaded user configuration from file: %s",
                     user_config_path)
-        return Installation(user_cfg, client_bugzoo, client_rooibos)
+        return user_cfg
 
     def __init__(self,
                  config: Configuration,
                  client_bugzoo: BugZooClient,
-                 client_rooibos: RooibosClient
+                 client_rooibos: RooibosClient,
+                 *,
+                 chunk_size: int = 512 * 1024,
+                 chunk_overlap: int = 50,
+                 num_chunk_workers: int = 4,
+                 num_workers: int = 0,
+                 offload_threshold: int = 64 * 1024,
+                 provider: Optional[SourceProvider] = None,
+                 blob_dir: Optional[str] = None,
+                 discovery_capacity: int = 256,
+                 discovery_max_capacity: int = 4096,
+                 user_config_path: Optional[str] = None
                  ) -> None:
+        """
+        Parameters:
+            config: the configuration for this installation.
+            client_bugzoo: a connection to the BugZoo server.
+            client_rooibos: a connection to the Rooibos server.
+            chunk_size: files, or regions of files, with more than this many
+                characters are split into chunks of approximately this size
+                before they are sent to Rooibos.
+            chunk_overlap: the number of lines by which consecutive chunks
+                overlap. Matches that span more lines than this may be
+                missed when a file is split into chunks.
+            num_chunk_workers: the maximum number of chunks that are matched
+                in parallel.
+            num_workers: the number of processes in the pool to which
+                CPU-bound work, such as checking constraints and rendering
+                diffs, is offloaded. If zero, no pool is used.
+            offload_threshold: the smallest number of characters in a file
+                for which work is offloaded to the pool.
+            provider: the provider of the contents of source files. If
+                omitted, the provider is chosen for each snapshot by the
+                source rules of the configuration, and files belonging to
+                snapshots without a rule are read from BugZoo containers.
+            blob_dir: the directory in which the contents of source files
+                are stored, once for each distinct content, as files that
+                worker processes can read directly. If omitted, contents are
+                kept in memory.
+            discovery_capacity: the number of files whose mutations are
+                cached.
+            discovery_max_capacity: the number of files to which the cache of
+                mutations may be grown when the caches for a snapshot are
+                warmed.
+            user_config_path: the path to the user configuration file from
+                which the configuration is reloaded. If omitted,
+                `Installation.default_user_config_path` is used.
+        """
         self.__config = config
+        self.__config_lock = threading.Lock()
+        self.__pins = threading.local()
+        self.__user_config_path = user_config_path
+        self.__fixed_provider = provider is not None
+        self.__chunk_size = chunk_size
+        self.__chunk_overlap = chunk_overlap
+        self.__num_chunk_workers = num_chunk_workers
         self.__bugzoo = client_bugzoo
         self.__rooibos = client_rooibos
+        self.__workers = None  # type: Optional[WorkerPool]
+        if num_workers > 0:
+            self.__workers = WorkerPool(num_workers, offload_threshold)
+        if provider is None:
+            provider = build_provider(config.sources, client_bugzoo)
+        self.__blobs = BlobStore(blob_dir)
         self.__sources = SourceFileManager(client_bugzoo,
                                            client_rooibos,
-                                           config.operators)
+                                           lambda: self.operators,
+                                           self.__workers,
+                                           provider,
+                                           self.__blobs)
         self.__mutants = MutantManager(client_bugzoo,
                                        client_rooibos,
                                        config.operators,
                                        self.__sources)
+        self.__jobs = JobManager()
+        self.__coverage = CoverageManager(client_bugzoo)
+        self.__discovery = DiscoveryCache(discovery_capacity,
+                                          discovery_max_capacity)
+        self.__warmup = WarmUpManager(self)
+
+    def close(self) -> None:
+        """
+        Releases the resources used by this installation, including its
+        worker processes and its store of file contents.
+        """
+        if self.__workers:
+            self.__workers.shutdown()
+            self.__workers = None
+        self.__blobs.close()
+
+    @property
+    def workers(self) -> Optional[WorkerPool]:
+        """
+        The pool of worker processes used by this installation, if any.
+        """
+        return self.__workers
+
+    @property
+    def config(self) -> Configuration:
+        """
+        The configuration used by this installation. If the configuration
+        has been pinned by the calling thread, the pinned configuration is
+        returned, even if the configuration has since been reloaded.
+        """
+        pinned = getattr(self.__pins, 'config', None)
+        return pinned if pinned is not None else self.__config
+
+    def config_paths(self) -> List[str]:
+        """
+        The paths to the configuration files from which the configuration of
+        this installation is reloaded.
+        """
+        user_config_path = self.__user_config_path or \
+            Installation.default_user_config_path()
+        return [Installation.sys_config_path(), user_config_path]
+
+    def pin(self) -> Configuration:
+        """
+        Pins the current configuration to the calling thread, so that the
+        thread continues to use that configuration until it is unpinned,
+        even if the configuration is reloaded in the meantime. Pins may be
+        nested.
+        """
+        depth = getattr(self.__pins, 'depth', 0)
+        if depth == 0:
+            self.__pins.config = self.__config
+        self.__pins.depth = depth + 1
+        return self.__pins.config
+
+    def unpin(self) -> None:
+        """
+        Releases the configuration most recently pinned by the calling
+        thread.
+        """
+        depth = getattr(self.__pins, 'depth', 0) - 1
+        self.__pins.depth = max(depth, 0)
+        if depth <= 0:
+            self.__pins.config = None
+
+    def reload(self,
+               config: Optional[Configuration] = None
+               ) -> Configuration:
+        """
+        Atomically replaces the configuration of this installation. Threads
+        that have pinned the previous configuration continue to use it until
+        they unpin it. Cached mutations are keyed by the contents of the
+        transformations of each operator, rather than by the configuration,
+        and so remain valid for operators that are unchanged.
+
+        Parameters:
+            config: the new configuration. If omitted, the configuration is
+                loaded from the system and user configuration files.
+
+        Returns:
+            the new configuration.
+
+        Raises:
+            BadConfigFile: if a configuration file is ill-formed, in which
+                case the current configuration is kept.
+            IllegalConfig: if a configuration file describes an illegal
+                configuration, in which case the current configuration is
+                kept.
+        """
+        if config is None:
+            config = Installation.load_config(self.__user_config_path)
+        with self.__config_lock:
+            previous = self.__config
+            sources_changed = list(config.sources) != list(previous.sources)
+            if sources_changed and not self.__fixed_provider:
+                provider = build_provider(config.sources, self.__bugzoo)
+                self.__sources.use_provider(provider)
+            self.__config = config
+        logger.info("reloaded configuration: %d languages, %d operators (%s)",
+                    len(list(config.languages)),
+                    len(config.operators),
+                    config.digest)
+        return config
 
     @property
     def bugzoo(self) -> BugZooClient:
@@ -126,19 +336,48 @@ class Installation(object):
         """
         return self.__sources
 
+    @property
+    def coverage(self) -> CoverageManager:
+        """
+        Provides the lines that are covered by the test suites of snapshots.
+        """
+        return self.__coverage
+
+    @property
+    def discovery(self) -> DiscoveryCache:
+        """
+        Caches the complete sets of mutations that have been discovered in
+        source files.
+        """
+        return self.__discovery
+
+    @property
+    def jobs(self) -> JobManager:
+        """
+        The background jobs that have been launched by this installation.
+        """
+        return self.__jobs
+
+    @property
+    def warmup(self) -> WarmUpManager:
+        """
+        The manager for background warm-up of the caches of this server.
+        """
+        return self.__warmup
+
     @property
     def languages(self) -> Languages:
         """
         The languages registered with this installation.
         """
-        return self.__config.languages
+        return self.config.languages
 
     @property
     def operators(self) -> Operators:
         """
         The mutation operators registered with this installation.
         """
-        return self.__config.operators
+        return self.config.operators
 
     @property
     def mutants(self) -> MutantManager:
@@ -153,12 +392,26 @@ class Installation(object):
                   *,
                   language: Language = None,
                   operators: List[Operator] = None,
-                  restrict_to_lines: Optional[List[int]] = None
+                  restrict_to_lines: Optional[Iterable[int]] = None,
+                  covered_only: bool = False
                   ) -> Iterator[Mutation]:
         """
         Computes all of the first-order mutations that can be applied to a
         given file belonging to a specified BugZoo snapshot.
 
+        Parameters:
+            snapshot: the BugZoo snapshot.
+            filepath: the path to the file, relative to the source directory
+                of the snapshot.
+            language: the language used by the file. If omitted, the language
+                is detected automatically.
+            operators: the operators that should be used. If omitted, all
+                operators are used.
+            restrict_to_lines: if given, only mutations that begin on one of
+                these lines are produced.
+            covered_only: if True, only mutations that begin on a line that
+                is covered by the test suite of the snapshot are produced.
+
         Returns:
             an iterator over the possible mutations.
 
@@ -167,15 +420,12 @@ class Installation(object):
                 used by the file cannot be automatically determined.
             FileNotFound: if the given file is not found inside the snapshot.
         """
-        logger.info("Computing mutations to file, '%s', in snapshot, '%s'",
-                    filepath,
-                    snapshot.name)
-        sources = self.sources
-
-        def match_to_mutation(op_name: str,
-                              transformation_index: int,
-                              match: rooibos.Match
-                              ) -> Mutation:
+        matches = self._matches(snapshot, filepath,
+                                language=language,
+                                operators=operators,
+                                restrict_to_lines=restrict_to_lines,
+                                covered_only=covered_only)
+        for (op_name, transformation_index, match) in matches:
             logger.debug("Transforming template match to mutation: %s", match)
             start = Location(match.location.start.line,
                              match.location.start.col)
@@ -190,55 +440,600 @@ class Installation(object):
 
             mut = Mutation(op_name, transformation_index, location, args)
             logger.debug("Transformed match, %s, to mutation: %s", match, mut)
-            return mut
+            yield mut
+
+    def mutation_set(self,
+                     snapshot: Bug,
+                     filepath: str,
+                     *,
+                     language: Language = None,
+                     operators: List[Operator] = None,
+                     restrict_to_lines: Optional[Iterable[int]] = None,
+                     covered_only: bool = False
+                     ) -> MutationSet:
+        """
+        Computes all of the first-order mutations that can be applied to a
+        given file belonging to a specified BugZoo snapshot, and stores them
+        in a compact, columnar set without constructing an object for each
+        mutation.
+
+        The complete set of mutations for each file is cached. Requests that
+        are restricted to particular lines are answered from that cache when
+        possible, but do not populate it.
 
+        Raises:
+            LanguageNotDetected: if no language is specified and the language
+                used by the file cannot be automatically determined.
+            FileNotFound: if the given file is not found inside the snapshot.
+        """
+        language, operators = self._resolve(filepath, language, operators)
+        key = self._discovery_key(snapshot, filepath, language, operators)
+        cached = self.__discovery.get(key)
+        if cached is None:
+            text = self.sources.read_file(snapshot, filepath)
+            mask = self.sources.lexical_mask(snapshot, filepath, language)
+            tokens = self.sources.token_index(snapshot, filepath, language)
+            lines = self._permitted_lines(snapshot, filepath,
+                                          restrict_to_lines, covered_only)
+            line_starts = self.sources.line_offsets(snapshot, filepath)
+            blob = self.sources.blob_path(snapshot, filepath)
+            matches = self._matches_in_text(text, operators,
+                                            lines=lines,
+                                            line_starts=line_starts,
+                                            mask=mask,
+                                            tokens=tokens,
+                                            language=language,
+                                            blob=blob)
+            mutations = self._to_mutation_set(filepath, matches)
+            if lines is not None:
+                return mutations
+            self.__discovery.put(key, mutations)
+            return mutations
+
+        logger.debug("Using cached mutations for file: %s", filepath)
+        lines = self._permitted_lines(snapshot, filepath,
+                                      restrict_to_lines, covered_only)
+        if lines is None:
+            return cached
+        return cached.select(line in lines for line in cached.lines)
+
+    def sample_mutations(self,
+                         snapshot: Bug,
+                         filepath: str,
+                         size: int,
+                         *,
+                         seed: int = 0,
+                         stratify: Optional[str] = None,
+                         language: Language = None,
+                         operators: List[Operator] = None,
+                         restrict_to_lines: Optional[Iterable[int]] = None,
+                         covered_only: bool = False
+                         ) -> MutationSet:
+        """
+        Draws a reproducible random sample of the first-order mutations that
+        can be applied to a given file. If the complete set of mutations for
+        the file is cached, the sample is drawn from that set; otherwise, it
+        is drawn directly from the stream of discovered matches, without
+        storing the complete set. Both yield the same sample for a given
+        seed.
+
+        Parameters:
+            size: the maximum number of mutations in the sample.
+            seed: the seed for the random number generator.
+            stratify: if given, the sample is divided evenly between the
+                mutations produced by each operator ('operator') or beginning
+                on each line ('line').
+
+        Raises:
+            LanguageNotDetected: if no language is specified and the language
+                used by the file cannot be automatically determined.
+            FileNotFound: if the given file is not found inside the snapshot.
+        """
+        assert stratify is None or stratify in sampling.STRATA
+        language, operators = self._resolve(filepath, language, operators)
+        key = self._discovery_key(snapshot, filepath, language, operators)
+        cached = self.__discovery.get(key)
+        if cached is not None:
+            logger.debug("Sampling cached mutations for file: %s", filepath)
+            lines = self._permitted_lines(snapshot, filepath,
+                                          restrict_to_lines, covered_only)
+            all_lines = cached.lines
+            all_operators = cached.operators
+            items = (i for i in range(len(cached))
+                     if lines is None or all_lines[i] in lines)
+            if stratify == 'operator':
+                chosen = sampling.stratified_sample(
+                    items, size, lambda i: all_operators[i], seed)
+            elif stratify == 'line':
+                chosen = sampling.stratified_sample(
+                    items, size, lambda i: all_lines[i], seed)
+            else:
+                chosen = sampling.sample(items, size, seed)
+            mask = [False] * len(cached)
+            for i in chosen:
+                mask[i] = True
+            return cached.select(mask)
+
+        matches = self._matches(snapshot, filepath,
+                                language=language,
+                                operators=operators,
+                                restrict_to_lines=restrict_to_lines,
+                                covered_only=covered_only)
+        if stratify == 'operator':
+            sampled = sampling.stratified_sample(matches, size,
+                                                 lambda m: m[0], seed)
+        elif stratify == 'line':
+            sampled = sampling.stratified_sample(
+                matches, size, lambda m: m[2].location.start.line, seed)
+        else:
+            sampled = sampling.sample(matches, size, seed)
+        return self._to_mutation_set(filepath, sampled)
+
+    def mutation_delta(self,
+                       base: Bug,
+                       base_filepath: Optional[str],
+                       target_filepath: Optional[str],
+                       target_text: str,
+                       *,
+                       blocks: Optional[Sequence[ChangedBlock]] = None,
+                       language: Language = None,
+                       operators: List[Operator] = None,
+                       context: int = 3
+                       ) -> MutationDelta:
+        """
+        Computes the changes to the first-order mutations of a file between
+        its version in a base snapshot and a given target version.
+
+        Mutations to lines of the base file that were left untouched are
+        carried over to the target by shifting their line numbers, and the
+        mutations of the base file are taken from the cache wherever
+        possible. Only the changed regions of the target file, padded by a
+        number of lines of context, are searched for new mutations.
+
+        Parameters:
+            base: the base snapshot.
+            base_filepath: the path to the file in the base snapshot, or None
+                if the file does not exist in that snapshot.
+            target_filepath: the path to the target version of the file, or
+                None if the file was deleted.
+            target_text: the contents of the target version of the file.
+            blocks: the blocks of lines that differ between the base and
+                target versions of the file. If omitted, the blocks are
+                computed by comparing the two versions.
+            language: the language used by the file. If omitted, the language
+                is detected automatically.
+            operators: the operators that should be used. If omitted, all
+                operators are used.
+            context: the number of unchanged lines surrounding each changed
+                block that should be searched for new mutations.
+
+        Raises:
+            LanguageNotDetected: if no language is specified and the language
+                used by the file cannot be automatically determined.
+            FileNotFound: if the given file is not found inside the snapshot.
+        """
+        filepath = target_filepath or base_filepath
+        assert filepath is not None
+        language, operators = self._resolve(filepath, language, operators)
+        added = MutationSet()
+        removed = MutationSet()
+        carried = MutationSet()
+
+        if base_filepath is None:
+            base_text = ''
+            base_mutations = MutationSet()
+        else:
+            base_text = self.sources.read_file(base, base_filepath)
+            base_mutations = self.mutation_set(base, base_filepath,
+                                               language=language,
+                                               operators=operators)
+        if target_filepath is None:
+            return MutationDelta(added, base_mutations, carried)
+
+        if blocks is None:
+            blocks = changed_blocks(base_text, target_text)
+        mapping = LineMapping(blocks)
+        line_starts = _line_starts(target_text)
+        mask = LexicalMask.build(target_text, language.name)
+        tokens = TokenIndex.build(target_text, language.name)
+        operator_by_name = {op.name: op for op in operators}
+
+        # a mutation to unchanged lines may nonetheless be invalidated by a
+        # change elsewhere in the file (e.g., a new comment opener), so the
+        # constraints of each carried mutation are checked against the target
+        carried_at = set()  # type: Set[Tuple[str, int, int, int, int, int]]
+        for mutation in base_mutations:
+            start = mutation.location.start
+            stop = mutation.location.stop
+            line = mapping.old_to_new(start.line, stop.line)
+            if line is None:
+                removed.add(mutation)
+                continue
+            last = line + stop.line - start.line
+            operator = operator_by_name[mutation.operator]
+            transformation = \
+                operator.transformations[mutation.transformation_index]
+            match = _mutation_to_match(mutation, line)
+            offset_start = line_starts[line - 1] + start.col
+            offset_stop = line_starts[last - 1] + stop.col
+            if not transformation.satisfies_constraints(match,
+                                                        target_text,
+                                                        offset_start,
+                                                        offset_stop,
+                                                        mask=mask,
+                                                        tokens=tokens):
+                removed.add(mutation)
+                continue
+            carried.append(mutation.operator, mutation.transformation_index,
+                           target_filepath,
+                           line, start.col, last, stop.col,
+                           mutation.arguments)
+            carried_at.add((mutation.operator, mutation.transformation_index,
+                            line, start.col, last, stop.col))
+
+        # matches to the unchanged lines that surround each changed block are
+        # only added if they were not carried over, since they may have
+        # become valid due to a change to their context
+        for region in mapping.changed_regions(len(line_starts), context):
+            logger.debug("Finding mutations to changed lines %d-%d of %s",
+                         region[0], region[1], target_filepath)
+            matches = self._matches_in_text(target_text, operators,
+                                            region=region,
+                                            line_starts=line_starts,
+                                            mask=mask,
+                                            tokens=tokens,
+                                            language=language)
+            for (op_name, transformation_index, match) in matches:
+                start, stop = match.location.start, match.location.stop
+                at = (op_name, transformation_index,
+                      start.line, start.col, stop.line, stop.col)
+                if at in carried_at:
+                    continue
+                args = {term: match.environment[term].fragment
+                        for term in match.environment}
+                added.append(op_name, transformation_index, target_filepath,
+                             start.line, start.col, stop.line, stop.col,
+                             args)
+
+        logger.info("Computed mutation delta for %s: %d added, %d removed, %d carried",  # noqa: pycodestyle
+                    target_filepath, len(added), len(removed), len(carried))
+        return MutationDelta(added, removed, carried)
+
+    def _discovery_key(self,
+                       snapshot: Bug,
+                       filepath: str,
+                       language: Language,
+                       operators: List[Operator]
+                       ) -> Tuple[Hashable, ...]:
+        """
+        Computes the key under which the complete set of mutations to a given
+        file is cached. Operators are identified by their names together with
+        the contents of their transformations, so that cached mutations
+        survive reloads of the configuration for unchanged operators.
+        """
+        return (self.sources.digest(snapshot, filepath),
+                filepath,
+                language.name,
+                tuple((op.name, tuple(op.transformations))
+                      for op in operators))
+
+    @staticmethod
+    def _to_mutation_set(filepath: str,
+                         matches: Iterable[Tuple[str, int, Match]]
+                         ) -> MutationSet:
+        mutations = MutationSet()
+        for (op_name, transformation_index, match) in matches:
+            start, stop = match.location.start, match.location.stop
+            args = {term: match.environment[term].fragment
+                    for term in match.environment}
+            mutations.append(op_name, transformation_index, filepath,
+                             start.line, start.col, stop.line, stop.col,
+                             args)
+        return mutations
+
+    def _resolve(self,
+                 filepath: str,
+                 language: Optional[Language],
+                 operators: Optional[List[Operator]]
+                 ) -> Tuple[Language, List[Operator]]:
+        """
+        Determines the language and operators that should be used to find
+        mutations in a given file, where either may have been left
+        unspecified.
+        """
         if operators is None:
             logger.info("No mutation operators specified -- attempting to use all available operators.")  # noqa: pycodestyle
             operators = list(self.operators)
         logger.info("Using mutation operators: %s",
                     ', '.join([op.name for op in operators]))
 
-        logger.debug("Obtaining source code for specified file: %s", filepath)
-        text = sources.read_file(snapshot, filepath)
-        logger.debug("Obtained source code for file %s", filepath)
-
         if language is None:
             logger.debug("Attempting to automatically detect language used by file: %s",  # noqa: pycodestyle
                          filepath)
             language = self.languages.detect(filepath)
         logger.debug("Treating '%s' as a %s file.", filepath, language.name)
+        return language, operators
 
-        for operator in operators:
-            logger.debug("Using operator to find mutations: %s", operator.name)
-            for (idx, transformation) in enumerate(operator.transformations):
-                logger.debug("Finding all instances of match template in source code: %s",  # noqa: pycodestyle
-                             transformation.match)
-                for match in self.rooibos.matches(text, transformation.match):
-                    line = match.location.start.line
-                    if restrict_to_lines and line not in restrict_to_lines:
-                        continue
-
-                    # FIXME this is a horrible hack
-                    offset_start = \
-                        sources.line_col_to_offset(snapshot,
-                                                   filepath,
-                                                   match.location.start.line,
-                                                   match.location.start.col)
-                    offset_stop = \
-                        sources.line_col_to_offset(snapshot,
-                                                   filepath,
-                                                   match.location.stop.line,
-                                                   match.location.stop.col)
-                    content_match = text[offset_start:offset_stop]
-
-                    logger.debug("Found possible template match:\n%s",
-                                 content_match)
-                    is_sat = \
-                        transformation.satisfies_constraints(match,
-                                                             text,
-                                                             offset_start,
-                                                             offset_stop)
-                    if is_sat:
-                        yield match_to_mutation(operator.name, idx, match)
-                    else:
-                        logger.debug("Template match doesn't satisfy transformation constraints: %s", match)  # noqa: pycodestyle
+    def _permitted_lines(self,
+                         snapshot: Bug,
+                         filepath: str,
+                         restrict_to_lines: Optional[Iterable[int]],
+                         covered_only: bool
+                         ) -> Optional[FrozenSet[int]]:
+        """
+        Determines the set of lines in a given file at which mutations may
+        begin, or returns None if mutations may begin on any line.
+        """
+        lines = None  # type: Optional[FrozenSet[int]]
+        if restrict_to_lines is not None:
+            lines = frozenset(restrict_to_lines)
+        if covered_only:
+            covered = self.coverage.lines(snapshot, filepath)
+            logger.debug("Restricting mutations to %d covered lines in %s",
+                         len(covered), filepath)
+            lines = covered if lines is None else lines & covered
+        return lines
+
+    def _matches(self,
+                 snapshot: Bug,
+                 filepath: str,
+                 *,
+                 language: Language = None,
+                 operators: List[Operator] = None,
+                 restrict_to_lines: Optional[Iterable[int]] = None,
+                 covered_only: bool = False
+                 ) -> Iterator[Tuple[str, int, Match]]:
+        """
+        Finds all template matches in a given file that satisfy the
+        constraints of their transformation. Matches that begin outside of
+        the permitted lines are discarded before their constraints are
+        evaluated.
+
+        Returns:
+            an iterator over the name of the operator, the index of the
+            transformation, and the match for each mutation.
+        """
+        logger.info("Computing mutations to file, '%s', in snapshot, '%s'",
+                    filepath,
+                    snapshot.name)
+        language, operators = self._resolve(filepath, language, operators)
+
+        logger.debug("Obtaining source code for specified file: %s", filepath)
+        text = self.sources.read_file(snapshot, filepath)
+        logger.debug("Obtained source code for file %s", filepath)
+
+        mask = self.sources.lexical_mask(snapshot, filepath, language)
+        tokens = self.sources.token_index(snapshot, filepath, language)
+        lines = self._permitted_lines(snapshot, filepath,
+                                      restrict_to_lines, covered_only)
+        line_starts = self.sources.line_offsets(snapshot, filepath)
+        blob = self.sources.blob_path(snapshot, filepath)
+        yield from self._matches_in_text(text, operators,
+                                         lines=lines,
+                                         line_starts=line_starts,
+                                         mask=mask,
+                                         tokens=tokens,
+                                         language=language,
+                                         blob=blob)
+
+    def _matches_in_text(self,
+                         text: str,
+                         operators: List[Operator],
+                         *,
+                         lines: Optional[FrozenSet[int]] = None,
+                         region: Optional[Tuple[int, int]] = None,
+                         line_starts: Optional[Sequence[int]] = None,
+                         mask: Optional[LexicalMask] = None,
+                         tokens: Optional[TokenIndex] = None,
+                         language: Optional[Language] = None,
+                         blob: Optional[str] = None
+                         ) -> Iterator[Tuple[str, int, Match]]:
+        """
+        Finds all template matches in a given text that satisfy the
+        constraints of their transformation.
+
+        Parameters:
+            text: the text that should be searched.
+            operators: the operators whose templates should be matched.
+            lines: if given, matches that do not begin on one of these lines
+                are discarded before their constraints are evaluated.
+            region: if given, only the given inclusive range of lines is
+                searched. Constraints are still evaluated against the whole
+                text.
+            line_starts: the offset at which each line of the text begins,
+                if known.
+            mask: the lexical mask for the text, used to evaluate lexical
+                constraints.
+            tokens: the token index for the text, used to evaluate token
+                boundary constraints.
+            language: the language of the text. Constraints are only checked
+                by the worker pool, if any, when the language is given.
+            blob: the path to the on-disk blob that holds the text, if any,
+                from which worker processes read the text.
+        """
+        if lines is not None and not lines:
+            logger.info("No lines are eligible for mutation")
+            return
+
+        if line_starts is None:
+            line_starts = _line_starts(text)
+        first, last = region if region else (1, len(line_starts))
+        offset_first = line_starts[first - 1]
+        offset_last = \
+            line_starts[last] if last < len(line_starts) else len(text)
+
+        def search(transformation: Transformation) -> Iterator[Match]:
+            template = transformation.match
+            if transformation.is_literal:
+                logger.debug("Finding all instances of literal template in source code: %s",  # noqa: pycodestyle
+                             template)
+                yield from find_literal(text, template, line_starts,
+                                        offset_first, offset_last)
+                return
+
+            logger.debug("Finding all instances of match template in source code: %s",  # noqa: pycodestyle
+                         template)
+            yield from self._matches_in_chunks(text, template, line_starts,
+                                               first, last)
+
+        def candidates(transformation: Transformation
+                       ) -> Iterator[Tuple[Match, int, int]]:
+            for match in search(transformation):
+                start = match.location.start
+                stop = match.location.stop
+                if lines is not None and start.line not in lines:
+                    continue
+                offset_start = line_starts[start.line - 1] + start.col
+                offset_stop = line_starts[stop.line - 1] + stop.col
+                yield (match, offset_start, offset_stop)
+
+        # transformations that share a match template share a single search
+        # for that template, whose results are kept until the last of those
+        # transformations has been processed.
+        uses = Counter(t.match for op in operators
+                       for t in op.transformations)
+        num_saved = sum(uses.values()) - len(uses)
+        if num_saved:
+            logger.debug("Sharing %d of %d template searches between transformations",  # noqa: pycodestyle
+                         num_saved, sum(uses.values()))
+        shared = {}  # type: Dict[str, List[Tuple[Match, int, int]]]
+
+        def searches() -> Iterator[Tuple[Operator, int, Transformation,
+                                         Iterable[Tuple[Match, int, int]]]]:
+            for operator in operators:
+                logger.debug("Using operator to find mutations: %s",
+                             operator.name)
+                for (idx, transformation) in \
+                        enumerate(operator.transformations):
+                    template = transformation.match
+                    kept = shared.get(template)
+                    if kept is None and uses[template] > 1:
+                        kept = shared[template] = \
+                            list(candidates(transformation))
+                    found = candidates(transformation) if kept is None \
+                        else kept  # type: Iterable[Tuple[Match, int, int]]
+                    uses[template] -= 1
+                    if uses[template] == 0:
+                        shared.pop(template, None)
+                    yield (operator, idx, transformation, found)
+
+        # constraints are checked by the worker pool for large texts
+        workers = self.__workers
+        if workers and language and workers.accepts(text):
+            batches = [(operator, idx, transformation, list(found))
+                       for (operator, idx, transformation, found)
+                       in searches()]
+            logger.debug("Checking constraints of %d transformations in worker pool",  # noqa: pycodestyle
+                         len(batches))
+            accepted = workers.filter_matches(text, language.name,
+                                              [(t, found) for (_, _, t, found)
+                                               in batches],
+                                              blob=blob)
+            for ((operator, idx, _, listed), indices) in \
+                    zip(batches, accepted):
+                for i in indices:
+                    yield (operator.name, idx, listed[i][0])
+            return
+
+        for (operator, idx, transformation, found) in searches():
+            for (match, offset_start, offset_stop) in found:
+                logger.debug("Found possible template match:\n%s",
+                             text[offset_start:offset_stop])
+                is_sat = \
+                    transformation.satisfies_constraints(match,
+                                                         text,
+                                                         offset_start,
+                                                         offset_stop,
+                                                         mask=mask,
+                                                         tokens=tokens)
+                if is_sat:
+                    yield (operator.name, idx, match)
+                else:
+                    logger.debug("Template match doesn't satisfy transformation constraints: %s", match)  # noqa: pycodestyle
+
+    def _matches_in_chunks(self,
+                           text: str,
+                           template: str,
+                           line_starts: Sequence[int],
+                           first: int,
+                           last: int
+                           ) -> Iterator[Match]:
+        """
+        Uses Rooibos to find all matches of a template that begin within an
+        inclusive range of lines in a given text. Ranges that are larger
+        than the chunk size of this installation are split into overlapping
+        chunks that are matched in parallel. Each match is reported by the
+        chunk that owns the line on which it begins, which removes the
+        duplicate matches found in the overlap between chunks.
+        """
+        size_text = len(text)
+
+        def offset(line: int) -> int:
+            return line_starts[line - 1] if line <= len(line_starts) \
+                else size_text
+
+        def find(chunk: Chunk) -> List[Match]:
+            excerpt = text[offset(chunk.first):offset(chunk.stop + 1)]
+            shift = chunk.first - 1
+            found = []  # type: List[Match]
+            for match in self.rooibos.matches(excerpt, template):
+                if match.location.start.line + shift > chunk.last:
+                    continue
+                found.append(_shift_match(match, shift) if shift else match)
+            return found
+
+        if offset(last + 1) - offset(first) <= self.__chunk_size:
+            yield from find(Chunk(first, last, last))
+            return
+
+        chunks = plan_chunks(line_starts, size_text, first, last,
+                             self.__chunk_size, self.__chunk_overlap)
+        logger.debug("Splitting lines %d-%d into %d chunks to find matches of template: %s",  # noqa: pycodestyle
+                     first, last, len(chunks), template)
+        workers = min(self.__num_chunk_workers, len(chunks))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for found in executor.map(find, chunks):
+                yield from found
+
+
+def _line_starts(text: str) -> List[int]:
+    """
+    Returns the offset of the first character of each line in a given text.
+    """
+    offsets = [0]
+    offset = text.find('\n')
+    while offset != -1:
+        offsets.append(offset + 1)
+        offset = text.find('\n', offset + 1)
+    return offsets
+
+
+def _mutation_to_match(mutation: Mutation, line: int) -> Match:
+    """
+    Reconstructs the template match for a given mutation, moved to begin on
+    a given line. Mutations do not record the locations of the terms that
+    were bound by the match, so each term is given the location of the
+    whole match.
+    """
+    start = mutation.location.start
+    stop = mutation.location.stop
+    location = rooibos.LocationRange(
+        rooibos.Location(line, start.col),
+        rooibos.Location(line + stop.line - start.line, stop.col))
+    environment = rooibos.Environment([
+        rooibos.BoundTerm(term, location, fragment)
+        for (term, fragment) in mutation.arguments.items()])
+    return Match(environment, location)
+
+
+def _shift_match(match: Match, num_lines: int) -> Match:
+    """
+    Moves the location of a match that was found in an excerpt of a text
+    forward by a given number of lines.
+    """
+    start = match.location.start
+    stop = match.location.stop
+    location = rooibos.LocationRange(
+        rooibos.Location(start.line + num_lines, start.col),
+        rooibos.Location(stop.line + num_lines, stop.col))
+    return Match(match.environment, location)
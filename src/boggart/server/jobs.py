@@ -0,0 +1,190 @@
+from typing import Any, Callable, Dict, Iterator, Optional
+from uuid import uuid4
+import threading
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+__all__ = ['Job', 'JobManager']
+
+
+class Job(object):
+    """
+    Describes a long-running task that is performed by the server in the
+    background.
+    """
+    def __init__(self, uid: str, description: str) -> None:
+        self.__uid = uid
+        self.__description = description
+        self.__lock = threading.Lock()
+        self.__status = 'running'
+        self.__progress = {}  # type: Dict[str, Any]
+        self.__result = None  # type: Any
+        self.__error = None  # type: Optional[str]
+        self.__finished = threading.Event()
+        self.__finished_at = None  # type: Optional[float]
+
+    @property
+    def uid(self) -> str:
+        """
+        The unique identifier for this job.
+        """
+        return self.__uid
+
+    @property
+    def description(self) -> str:
+        """
+        A short description of the task performed by this job.
+        """
+        return self.__description
+
+    @property
+    def status(self) -> str:
+        """
+        The status of this job: 'running', 'finished' or 'failed'.
+        """
+        return self.__status
+
+    @property
+    def progress(self) -> Dict[str, Any]:
+        """
+        The progress most recently reported by this job.
+        """
+        with self.__lock:
+            return dict(self.__progress)
+
+    @property
+    def finished_at(self) -> Optional[float]:
+        """
+        The time, according to a monotonic clock, at which this job either
+        finished or failed, or None if it is still running.
+        """
+        return self.__finished_at
+
+    @property
+    def result(self) -> Any:
+        """
+        The JSON-serializable result of this job, if it has finished.
+        """
+        return self.__result
+
+    def report(self, **progress: Any) -> None:
+        """
+        Updates the progress that is reported by this job.
+        """
+        with self.__lock:
+            self.__progress.update(progress)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until this job has either finished or failed.
+
+        Returns:
+            True if the job is no longer running, or False if the timeout
+            expired before the job completed.
+        """
+        return self.__finished.wait(timeout)
+
+    def _run(self, task: Callable[['Job'], Any]) -> None:
+        try:
+            self.__result = task(self)
+            self.__status = 'finished'
+        except Exception as err:
+            logger.exception("job [%s] failed: %s", self.uid, err)
+            self.__error = str(err)
+            self.__status = 'failed'
+        finally:
+            self.__finished_at = time.monotonic()
+            self.__finished.set()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Provides a dictionary-based description of this job, ready to be
+        serialized.
+        """
+        jsn = {
+            'id': self.uid,
+            'description': self.description,
+            'status': self.status,
+            'progress': self.progress
+        }  # type: Dict[str, Any]
+        if self.__status == 'finished':
+            jsn['result'] = self.__result
+        if self.__status == 'failed':
+            jsn['error'] = self.__error
+        return jsn
+
+
+class JobManager(object):
+    """
+    Runs and keeps track of background jobs. Jobs that have finished or
+    failed are forgotten once they have been retained for a given number of
+    seconds, so that their results may still be collected by clients.
+    """
+    def __init__(self, retention: float = 3600.0) -> None:
+        """
+        Parameters:
+            retention: the number of seconds for which a job is kept after it
+                has finished or failed.
+        """
+        self.__jobs = {}  # type: Dict[str, Job]
+        self.__lock = threading.Lock()
+        self.__retention = retention
+
+    def _evict(self) -> None:
+        # should only be called while holding the lock
+        now = time.monotonic()
+        expired = [uid for (uid, job) in self.__jobs.items()
+                   if job.finished_at is not None
+                   and now - job.finished_at >= self.__retention]
+        for uid in expired:
+            logger.debug("forgetting expired job [%s]", uid)
+            del self.__jobs[uid]
+
+    def __iter__(self) -> Iterator[Job]:
+        """
+        Returns an iterator over all jobs known to this manager.
+        """
+        with self.__lock:
+            self._evict()
+            jobs = list(self.__jobs.values())
+        return iter(jobs)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of jobs known to this manager.
+        """
+        with self.__lock:
+            self._evict()
+            return len(self.__jobs)
+
+    def __getitem__(self, uid: str) -> Job:
+        """
+        Retrieves a job by its unique identifier.
+
+        Raises:
+            KeyError: if no job is found with the given identifier, or if the
+                job has expired.
+        """
+        with self.__lock:
+            self._evict()
+            return self.__jobs[uid]
+
+    def submit(self,
+               description: str,
+               task: Callable[[Job], Any]
+               ) -> Job:
+        """
+        Launches a given task as a background job. The task is called with the
+        job as its sole argument, allowing it to report its progress, and
+        should return a JSON-serializable result.
+        """
+        job = Job(uuid4().hex, description)
+        with self.__lock:
+            self._evict()
+            self.__jobs[job.uid] = job
+        logger.info("launching job [%s]: %s", job.uid, description)
+        thread = threading.Thread(target=job._run, args=(task,), daemon=True)
+        thread.start()
+        return job
@@ -0,0 +1,47 @@
+"""
+Finds matches of literal match templates (i.e., templates that contain
+neither holes nor whitespace) in-process, without consulting Rooibos.
+"""
+__all__ = ['find_literal']
+
+from typing import Iterator, Optional, Sequence
+import bisect
+
+import rooibos
+from rooibos import Match
+
+
+def _location(line_starts: Sequence[int], offset: int) -> rooibos.Location:
+    line = bisect.bisect_right(line_starts, offset)
+    return rooibos.Location(line, offset - line_starts[line - 1])
+
+
+def find_literal(text: str,
+                 template: str,
+                 line_starts: Sequence[int],
+                 offset_first: int = 0,
+                 offset_last: Optional[int] = None
+                 ) -> Iterator[Match]:
+    """
+    Finds all non-overlapping occurrences of a literal template within a
+    given text, from left to right, in the same form as Rooibos.
+
+    Parameters:
+        text: the text that should be searched.
+        template: the literal template.
+        line_starts: the offset at which each line of the text begins.
+        offset_first: the offset at which the search should begin.
+        offset_last: the offset at which the search should end. Only
+            occurrences that end at or before this offset are reported.
+    """
+    assert template, "expected a non-empty template"
+    if offset_last is None:
+        offset_last = len(text)
+    size = len(template)
+    environment = rooibos.Environment([])
+    offset = text.find(template, offset_first, offset_last)
+    while offset != -1:
+        start = _location(line_starts, offset)
+        stop = _location(line_starts, offset + size)
+        yield Match(environment, rooibos.LocationRange(start, stop))
+        offset = text.find(template, offset + size, offset_last)
@@ -1,6 +1,8 @@
 # TODO mutants are killed when the server is killed
-from typing import List, Iterator, Dict
+from typing import Callable, List, Iterator, Dict, Optional, Set, Tuple
 from uuid import UUID, uuid4
+from concurrent.futures import ThreadPoolExecutor
+import bisect
 import tempfile
 import logging
 
@@ -26,31 +28,176 @@ class MutantManager(object):
                  sources: SourceFileManager
                  ) -> None:
         self.__mutants = {}  # type: Dict[UUID, Mutant]
+        self.__ordered = []  # type: List[UUID]
+        self.__by_base = {}  # type: Dict[str, Set[UUID]]
+        self.__by_operator = {}  # type: Dict[str, Set[UUID]]
         self.__bugzoo = client_bugzoo
         self.__rooibos = client_rooibos
         self.__operators = operators
         self.__sources = sources
 
-    def clear(self) -> None:
+    def clear(self,
+              *,
+              workers: int = 8,
+              on_progress: Optional[Callable[[int, int], None]] = None
+              ) -> Dict[UUID, Exception]:
         """
-        Destroys all mutants that are registered with this manager.
+        Destroys all mutants that are registered with this manager. Mutants
+        are deregistered immediately, and their resources are then destroyed
+        in parallel.
+
+        Parameters:
+            workers: the maximum number of mutants that may be destroyed
+                concurrently.
+            on_progress: an optional callback that is invoked with the
+                number of destroyed mutants and the total number of mutants
+                each time a mutant is destroyed.
+
+        Returns:
+            a mapping from the UUID of each mutant whose resources could not
+            be destroyed to the error that occurred when attempting to do so.
         """
+        assert workers > 0
         logger.info("destroying all registered mutants")
-        try:
-            uuids = list(self)
-            for uuid in uuids:
-                del self[uuid]
-        except Exception:
-            logger.exception("failed to destroy all registered mutants")
-            raise
+        mutants = [self.__mutants[uuid] for uuid in self]
+        for mutant in mutants:
+            self._deregister(mutant)
+
+        failures = {}  # type: Dict[UUID, Exception]
+        num_destroyed = 0
+
+        def destroy(mutant: Mutant) -> Optional[Exception]:
+            try:
+                self._destroy(mutant)
+                return None
+            except Exception as err:
+                return err
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = executor.map(destroy, mutants)
+            for mutant, err in zip(mutants, outcomes):
+                num_destroyed += 1
+                if err is not None:
+                    failures[mutant.uuid] = err
+                if on_progress:
+                    on_progress(num_destroyed, len(mutants))
+
+        if failures:
+            logger.error("failed to destroy %d of %d mutants",
+                         len(failures), len(mutants))
         logger.info("destroyed all registered mutants")
+        return failures
 
     def __iter__(self) -> Iterator[UUID]:
         """
         Returns an iterator over the UUIDs of the mutants that are currently
-        registered with this server.
+        registered with this server, in ascending order.
         """
-        yield from self.__mutants.keys()
+        yield from list(self.__ordered)
+
+    def _register(self, mutant: Mutant) -> None:
+        """
+        Adds a given mutant to the registry and its indices.
+        """
+        uuid = mutant.uuid
+        self.__mutants[uuid] = mutant
+        bisect.insort(self.__ordered, uuid)
+        self.__by_base.setdefault(mutant.base, set()).add(uuid)
+        for operator in {m.operator for m in mutant.mutations}:
+            self.__by_operator.setdefault(operator, set()).add(uuid)
+
+    def _deregister(self, mutant: Mutant) -> None:
+        """
+        Removes a given mutant from the registry and its indices.
+        """
+        uuid = mutant.uuid
+        del self.__mutants[uuid]
+        del self.__ordered[bisect.bisect_left(self.__ordered, uuid)]
+        self.__by_base[mutant.base].discard(uuid)
+        for operator in {m.operator for m in mutant.mutations}:
+            self.__by_operator[operator].discard(uuid)
+
+    def _matching(self,
+                  base: Optional[str],
+                  operator: Optional[str]
+                  ) -> Optional[Set[UUID]]:
+        """
+        Returns the set of UUIDs for mutants that satisfy the given filters,
+        or None if no filters are given.
+        """
+        matching = None  # type: Optional[Set[UUID]]
+        if base is not None:
+            matching = self.__by_base.get(base, set())
+        if operator is not None:
+            by_operator = self.__by_operator.get(operator, set())
+            matching = by_operator if matching is None \
+                else matching & by_operator
+        return matching
+
+    def count(self,
+              *,
+              base: Optional[str] = None,
+              operator: Optional[str] = None
+              ) -> int:
+        """
+        Counts the number of registered mutants that satisfy a set of
+        optional filters.
+
+        Parameters:
+            base: if given, only mutants of the snapshot with this name are
+                counted.
+            operator: if given, only mutants that were generated using the
+                operator with this name are counted.
+        """
+        matching = self._matching(base, operator)
+        return len(self) if matching is None else len(matching)
+
+    def page(self,
+             *,
+             after: Optional[UUID] = None,
+             limit: Optional[int] = None,
+             base: Optional[str] = None,
+             operator: Optional[str] = None
+             ) -> Tuple[List[UUID], Optional[UUID]]:
+        """
+        Returns a page of UUIDs for registered mutants that satisfy a set of
+        optional filters. Mutants are ordered by their UUIDs.
+
+        Parameters:
+            after: if given, the page begins with the first mutant whose
+                UUID is greater than this UUID.
+            limit: the maximum number of UUIDs in the page. If left
+                unspecified, the page contains all remaining mutants.
+            base: if given, only mutants of the snapshot with this name are
+                included.
+            operator: if given, only mutants that were generated using the
+                operator with this name are included.
+
+        Returns:
+            a tuple of the form `(uuids, cursor)`, where `uuids` is the list
+            of UUIDs within the page, and `cursor` is the UUID that should be
+            passed as `after` to obtain the next page, or None if this is the
+            last page.
+        """
+        assert limit is None or limit > 0
+        matching = self._matching(base, operator)
+        ordered = self.__ordered
+        index = 0 if after is None else bisect.bisect_right(ordered, after)
+
+        uuids = []  # type: List[UUID]
+        while index < len(ordered):
+            uuid = ordered[index]
+            index += 1
+            if matching is not None and uuid not in matching:
+                continue
+            uuids.append(uuid)
+            if limit is not None and len(uuids) == limit:
+                break
+
+        has_next = limit is not None and len(uuids) == limit \
+            and index < len(ordered)
+        cursor = uuids[-1] if has_next else None
+        return uuids, cursor
 
     def __getitem__(self, uuid: UUID) -> Mutant:
         """
@@ -74,14 +221,43 @@ class MutantManager(object):
         except KeyError:
             logger.exception("Failed to find mutant with UUID: %s", uuid.hex)
             raise
+        self._deregister(mutant)
         try:
-            self.__bugzoo.docker.delete_image(mutant.docker_image)
+            self._destroy(mutant)
         except Exception:
+            logger.exception("Failed to destroy resources for mutant: %s",
+                             mutant)
+
+    def _destroy(self, mutant: Mutant) -> None:
+        """
+        Destroys the resources that are allocated to a given mutant: its
+        BugZoo snapshot and its Docker image. An attempt is made to destroy
+        each resource, even if the other could not be destroyed.
+
+        Raises:
+            Exception: the first error that was encountered while destroying
+                the resources.
+        """
+        error = None  # type: Optional[Exception]
+        try:
+            del self.__bugzoo.bugs[mutant.snapshot]
+        except KeyError:
+            logger.debug("BugZoo snapshot for mutant [%s] is not registered",
+                         mutant.uuid.hex)
+        except Exception as err:
+            logger.exception("Failed to deregister BugZoo snapshot (%s) for mutant: %s",  # noqa: pycodestyle
+                             mutant.snapshot,
+                             mutant)
+            error = err
+        try:
+            self.__bugzoo.docker.delete_image(mutant.docker_image)
+        except Exception as err:
             logger.exception("Failed to destroy docker image (%s) for mutant: %s",  # noqa: pycodestyle
                              mutant.docker_image,
                              mutant)
-        # FIXME deregister the BugZoo snapshot
-        del self.__mutants[uuid]
+            error = error or err
+        if error is not None:
+            raise error
 
     def __len__(self) -> int:
         """
@@ -175,7 +351,7 @@ class MutantManager(object):
         logger.debug("Registering mutant with UUID '%s': %s",
                      mutant.uuid.hex,
                      mutant)
-        self.__mutants[mutant.uuid] = mutant
+        self._register(mutant)
         logger.debug("Registered mutant with UUID '%s'", mutant.uuid.hex)
         logger.info("Generated mutant: %s", mutant)
         return mutant
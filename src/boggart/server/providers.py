@@ -0,0 +1,356 @@
+"""
+Provides the contents of source files belonging to snapshots.
+"""
+__all__ = ['SourceProvider', 'BugZooProvider', 'LocalDirectoryProvider',
+           'GitProvider', 'InMemoryProvider', 'RoutingProvider',
+           'build_provider']
+
+from typing import Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
+import fnmatch
+import logging
+import os
+import subprocess
+
+from bugzoo.client import Client as BugZooClient
+from bugzoo.core.bug import Bug
+
+from ..config import Sources, SourceRule
+from ..exceptions import BoggartException, FileNotFound
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+
+class SourceProvider(object):
+    """
+    Reads the contents of source files belonging to snapshots.
+    """
+    def read(self, snapshot: Bug, filepath: str) -> str:
+        """
+        Reads the contents of a given file belonging to a snapshot.
+
+        Parameters:
+            snapshot: the snapshot.
+            filepath: the path to the file, relative to the source directory
+                of the snapshot.
+
+        Raises:
+            FileNotFound: if the given file is not found inside the snapshot.
+        """
+        raise NotImplementedError
+
+    def read_many(self,
+                  snapshot: Bug,
+                  filepaths: Iterable[str]
+                  ) -> Dict[str, str]:
+        """
+        Reads the contents of several files belonging to a snapshot.
+
+        Raises:
+            FileNotFound: if one of the files is not found inside the
+                snapshot.
+        """
+        return {fn: self.read(snapshot, fn) for fn in filepaths}
+
+    def stamp(self, snapshot: Bug, filepath: str) -> Optional[Hashable]:
+        """
+        Returns a cheaply computed stamp for the current version of a given
+        file, which changes whenever the contents of that file change, so
+        that cached contents can be revalidated. By default, returns None,
+        which indicates that the contents of files never change.
+        """
+        return None
+
+    def list_files(self, snapshot: Bug) -> List[str]:
+        """
+        Lists the paths of the files belonging to a snapshot, relative to its
+        source directory, in sorted order. Hidden files and the contents of
+        hidden directories are omitted.
+        """
+        raise NotImplementedError
+
+
+class BugZooProvider(SourceProvider):
+    """
+    Reads source files from temporary containers for BugZoo snapshots.
+    """
+    def __init__(self, client_bugzoo: BugZooClient) -> None:
+        self.__bugzoo = client_bugzoo
+
+    def read(self, snapshot: Bug, filepath: str) -> str:
+        return self.read_many(snapshot, [filepath])[filepath]
+
+    def read_many(self,
+                  snapshot: Bug,
+                  filepaths: Iterable[str]
+                  ) -> Dict[str, str]:
+        bgz = self.__bugzoo
+        logger.debug("Provisioning a temporary container to fetch contents of files")  # noqa: pycodestyle
+        container = bgz.containers.provision(snapshot)
+        contents = {}  # type: Dict[str, str]
+        try:
+            for filepath in filepaths:
+                try:
+                    contents[filepath] = bgz.files.read(container, filepath)
+                except KeyError:
+                    logger.exception("Failed to read source file, '%s/%s': file not found",  # noqa: pycodestyle
+                                     snapshot.name, filepath)
+                    raise FileNotFound(filepath)
+        finally:
+            del bgz.containers[container.uid]
+        return contents
+
+    def list_files(self, snapshot: Bug) -> List[str]:
+        bgz = self.__bugzoo
+        command = "find . -type f -not -path '*/.*'"
+        container = bgz.containers.provision(snapshot)
+        try:
+            response = bgz.containers.command(container, command,
+                                              context=snapshot.source_dir)
+        finally:
+            del bgz.containers[container.uid]
+        if response.code != 0:
+            logger.error("Failed to list source files for snapshot, '%s': %s",  # noqa: pycodestyle
+                         snapshot.name, response.output)
+            msg = "failed to list source files for snapshot: {}"
+            raise BoggartException(msg.format(snapshot.name))
+        return sorted(line[2:] if line.startswith('./') else line
+                      for line in response.output.splitlines() if line)
+
+
+class LocalDirectoryProvider(SourceProvider):
+    """
+    Reads source files from a directory on the host, such as a checked-out
+    tree. Occurrences of `{snapshot}` within the path to the directory are
+    replaced by the name of the snapshot.
+    """
+    def __init__(self, root: str) -> None:
+        self.__root = os.path.abspath(root)
+
+    @property
+    def root(self) -> str:
+        """
+        The absolute path to the directory.
+        """
+        return self.__root
+
+    def _root_for(self, snapshot: Bug) -> str:
+        return self.__root.replace('{snapshot}', snapshot.name)
+
+    def _path_for(self, snapshot: Bug, filepath: str) -> str:
+        root = self._root_for(snapshot)
+        path = os.path.abspath(os.path.join(root, filepath))
+        if os.path.commonpath([root, path]) != root:
+            logger.error("Refusing to read file outside of directory, '%s': %s",  # noqa: pycodestyle
+                         root, filepath)
+            raise FileNotFound(filepath)
+        return path
+
+    def stamp(self, snapshot: Bug, filepath: str) -> Optional[Hashable]:
+        # files are stamped with their modification time and size, or with
+        # an empty stamp if they are missing
+        try:
+            stat = os.stat(self._path_for(snapshot, filepath))
+        except (OSError, FileNotFound):
+            return ()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read(self, snapshot: Bug, filepath: str) -> str:
+        path = self._path_for(snapshot, filepath)
+        try:
+            # newlines are left untranslated so that locations are preserved
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                return f.read()
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            logger.error("Failed to read source file, '%s': file not found",
+                         path)
+            raise FileNotFound(filepath)
+
+    def list_files(self, snapshot: Bug) -> List[str]:
+        root = self._root_for(snapshot)
+        filepaths = []  # type: List[str]
+        for (dirpath, dirnames, filenames) in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            filepaths += [os.path.relpath(os.path.join(dirpath, fn), root)
+                          for fn in filenames if not fn.startswith('.')]
+        return sorted(filepaths)
+
+
+class GitProvider(SourceProvider):
+    """
+    Reads source files from a git repository on the host, either at a given
+    revision or, if no revision is given, from its worktree. Occurrences of
+    `{snapshot}` within the revision are replaced by the name of the
+    snapshot, so that snapshots may be named after branches or tags.
+
+    Files in the worktree are revalidated whenever they change, but files
+    at a given revision are assumed never to change: if a branch is moved,
+    the contents that were read from its previous commit remain in use
+    until the server is restarted or its source rules are changed.
+    """
+    def __init__(self,
+                 repository: str,
+                 revision: Optional[str] = None
+                 ) -> None:
+        self.__repository = os.path.abspath(repository)
+        self.__revision = revision
+        self.__worktree = LocalDirectoryProvider(repository)
+
+    @property
+    def repository(self) -> str:
+        """
+        The absolute path to the repository.
+        """
+        return self.__repository
+
+    def read(self, snapshot: Bug, filepath: str) -> str:
+        return self.read_many(snapshot, [filepath])[filepath]
+
+    def stamp(self, snapshot: Bug, filepath: str) -> Optional[Hashable]:
+        if self.__revision is None:
+            return self.__worktree.stamp(snapshot, filepath)
+        return None
+
+    def read_many(self,
+                  snapshot: Bug,
+                  filepaths: Iterable[str]
+                  ) -> Dict[str, str]:
+        if self.__revision is None:
+            return self.__worktree.read_many(snapshot, filepaths)
+
+        # all files are fetched by a single git process
+        revision = self.__revision.replace('{snapshot}', snapshot.name)
+        filepaths = list(filepaths)
+        request = ''.join('{}:{}\n'.format(revision, fn) for fn in filepaths)
+        command = ['git', '-C', self.__repository, 'cat-file', '--batch']
+        try:
+            output = subprocess.run(command,
+                                    input=request.encode('utf-8'),
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE,
+                                    check=True).stdout
+        except (OSError, subprocess.CalledProcessError):
+            logger.exception("Failed to read source files from git repository: %s",  # noqa: pycodestyle
+                             self.__repository)
+            raise FileNotFound(filepaths[0] if filepaths else '')
+
+        contents = {}  # type: Dict[str, str]
+        offset = 0
+        for filepath in filepaths:
+            eol = output.index(b'\n', offset)
+            header = output[offset:eol].split()
+            if len(header) != 3 or header[1] != b'blob':
+                logger.error("Failed to read source file, '%s' at revision '%s': file not found",  # noqa: pycodestyle
+                             filepath, revision)
+                raise FileNotFound(filepath)
+            size = int(header[2])
+            start = eol + 1
+            contents[filepath] = output[start:start + size].decode('utf-8')
+            offset = start + size + 1
+        return contents
+
+    def list_files(self, snapshot: Bug) -> List[str]:
+        if self.__revision is None:
+            return self.__worktree.list_files(snapshot)
+        revision = self.__revision.replace('{snapshot}', snapshot.name)
+        command = ['git', '-C', self.__repository, 'ls-tree', '-r', '-z',
+                   '--name-only', revision]
+        try:
+            output = subprocess.run(command,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE,
+                                    check=True).stdout
+        except (OSError, subprocess.CalledProcessError):
+            logger.exception("Failed to list source files at revision, '%s', of git repository: %s",  # noqa: pycodestyle
+                             revision, self.__repository)
+            msg = "failed to list source files for snapshot: {}"
+            raise BoggartException(msg.format(snapshot.name))
+        filepaths = output.decode('utf-8').split('\0')
+        return sorted(fn for fn in filepaths
+                      if fn and not any(part.startswith('.')
+                                        for part in fn.split('/')))
+
+
+class InMemoryProvider(SourceProvider):
+    """
+    Reads source files from a dictionary that maps the name of each snapshot
+    to the contents of its files, indexed by path.
+    """
+    def __init__(self, files: Mapping[str, Mapping[str, str]]) -> None:
+        self.__files = files
+
+    def read(self, snapshot: Bug, filepath: str) -> str:
+        try:
+            return self.__files[snapshot.name][filepath]
+        except KeyError:
+            logger.error("Failed to read source file, '%s/%s': file not found",  # noqa: pycodestyle
+                         snapshot.name, filepath)
+            raise FileNotFound(filepath)
+
+    def list_files(self, snapshot: Bug) -> List[str]:
+        files = self.__files.get(snapshot.name, {})
+        return sorted(fn for fn in files
+                      if not any(part.startswith('.')
+                                 for part in fn.split('/')))
+
+
+class RoutingProvider(SourceProvider):
+    """
+    Reads the source files of each snapshot using the first provider whose
+    glob pattern matches the name of that snapshot, or using a default
+    provider if no pattern matches.
+    """
+    def __init__(self,
+                 routes: List[Tuple[str, SourceProvider]],
+                 default: SourceProvider
+                 ) -> None:
+        self.__routes = list(routes)
+        self.__default = default
+
+    def provider(self, snapshot: Bug) -> SourceProvider:
+        """
+        Returns the provider that is used to read the files of a snapshot.
+        """
+        for (pattern, provider) in self.__routes:
+            if fnmatch.fnmatchcase(snapshot.name, pattern):
+                return provider
+        return self.__default
+
+    def read(self, snapshot: Bug, filepath: str) -> str:
+        return self.provider(snapshot).read(snapshot, filepath)
+
+    def read_many(self,
+                  snapshot: Bug,
+                  filepaths: Iterable[str]
+                  ) -> Dict[str, str]:
+        return self.provider(snapshot).read_many(snapshot, filepaths)
+
+    def stamp(self, snapshot: Bug, filepath: str) -> Optional[Hashable]:
+        return self.provider(snapshot).stamp(snapshot, filepath)
+
+    def list_files(self, snapshot: Bug) -> List[str]:
+        return self.provider(snapshot).list_files(snapshot)
+
+
+def build_provider(sources: Sources,
+                   client_bugzoo: BugZooClient
+                   ) -> SourceProvider:
+    """
+    Constructs the provider described by the source rules of a
+    configuration. Snapshots that are not matched by any rule are read from
+    BugZoo containers.
+    """
+    bugzoo = BugZooProvider(client_bugzoo)
+
+    def build(rule: SourceRule) -> SourceProvider:
+        if rule.type == 'bugzoo':
+            return bugzoo
+        # the path of directory and git rules is checked by SourceRule
+        assert rule.path is not None
+        if rule.type == 'directory':
+            return LocalDirectoryProvider(rule.path)
+        return GitProvider(rule.path, rule.revision)
+
+    if not len(sources):
+        return bugzoo
+    routes = [(rule.snapshots, build(rule)) for rule in sources]
+    return RoutingProvider(routes, bugzoo)
@@ -0,0 +1,93 @@
+"""
+Provides reservoir sampling over streams of discovered mutations, so that a
+sample of a bounded size can be drawn without holding the entire stream in
+memory.
+"""
+from typing import (Any, Callable, Dict, Hashable, Iterable, List, Tuple,
+                    TypeVar)
+import random
+
+__all__ = ['STRATA', 'sample', 'stratified_sample']
+
+T = TypeVar('T')
+
+STRATA = ('operator', 'line')
+
+
+class _Reservoir(object):
+    """
+    Holds a uniform random sample of a bounded size of the items that have
+    been offered to it, together with their positions in the stream.
+    """
+    def __init__(self, size: int, rng: random.Random) -> None:
+        self.size = size
+        self.seen = 0
+        self.items = []  # type: List[Tuple[int, Any]]
+        self.__rng = rng
+
+    def offer(self, index: int, item: Any) -> None:
+        if self.seen < self.size:
+            self.items.append((index, item))
+        else:
+            j = self.__rng.randint(0, self.seen)
+            if j < self.size:
+                self.items[j] = (index, item)
+        self.seen += 1
+
+
+def _in_stream_order(items: Iterable[Tuple[int, T]]) -> List[T]:
+    return [item for (_, item) in sorted(items, key=lambda p: p[0])]
+
+
+def sample(items: Iterable[T], size: int, seed: int = 0) -> List[T]:
+    """
+    Draws a uniform random sample of a given size from a stream of items,
+    using at most that amount of memory. The sample is determined entirely
+    by the seed and the sequence of items, and is returned in the order in
+    which its items appear in the stream.
+    """
+    assert size >= 0
+    reservoir = _Reservoir(size, random.Random(seed))
+    for (index, item) in enumerate(items):
+        reservoir.offer(index, item)
+    return _in_stream_order(reservoir.items)
+
+
+def stratified_sample(items: Iterable[T],
+                      size: int,
+                      key: Callable[[T], Hashable],
+                      seed: int = 0
+                      ) -> List[T]:
+    """
+    Draws a random sample of a given size from a stream of items, divided as
+    evenly as possible between the strata to which the items belong. Strata
+    with too few items contribute all of their items, and their unused share
+    of the budget is divided among the remaining strata.
+
+    A separate reservoir is kept for each stratum, so at most `size` items
+    are held in memory per stratum. As with `sample`, the result is
+    reproducible for a given seed and is returned in stream order.
+    """
+    assert size >= 0
+    rng = random.Random(seed)
+    reservoirs = {}  # type: Dict[Hashable, _Reservoir]
+    for (index, item) in enumerate(items):
+        stratum = key(item)
+        if stratum not in reservoirs:
+            reservoirs[stratum] = _Reservoir(size, rng)
+        reservoirs[stratum].offer(index, item)
+
+    # divide the budget between strata, smallest first, so that any share
+    # left unused by a small stratum is passed on to the larger ones
+    chosen = []  # type: List[Tuple[int, T]]
+    remaining = size
+    # ties are broken by the order in which strata first appear
+    strata = sorted(reservoirs.values(), key=lambda r: r.seen)
+    for (i, reservoir) in enumerate(strata):
+        share = remaining // (len(strata) - i)
+        kept = reservoir.items
+        if share < len(kept):
+            kept = rng.sample(kept, share)
+        chosen += kept
+        remaining -= len(kept)
+    return _in_stream_order(chosen)
@@ -1,5 +1,4 @@
-from typing import Dict, Tuple, List
-from difflib import unified_diff
+from typing import Callable, Dict, Hashable, Tuple, List, Optional, Union
 import logging
 
 from bugzoo.core.patch import Patch
@@ -7,8 +6,12 @@ from bugzoo.core.bug import Bug
 from bugzoo.client import Client as BugZooClient
 from rooibos import Client as RooibosClient
 
+from .blobs import BlobStore
+from .providers import BugZooProvider, SourceProvider
+from .workers import Edit, WorkerPool, render_diff, splice
 from ..config.operators import Operators as OperatorManager
-from ..core import FileLocationRange, Replacement, Mutation, FileLine, Location
+from ..core import FileLocationRange, Replacement, Mutation, FileLine, \
+                   Location, Language, LexicalMask, TokenIndex
 from ..exceptions import *
 
 logger = logging.getLogger(__name__)
@@ -20,13 +23,56 @@ class SourceFileManager(object):
     def __init__(self,
                  client_bugzoo: BugZooClient,
                  client_rooibos: RooibosClient,
-                 operators: OperatorManager
+                 operators: Union[OperatorManager,
+                                  Callable[[], OperatorManager]],
+                 workers: Optional[WorkerPool] = None,
+                 provider: Optional[SourceProvider] = None,
+                 blobs: Optional[BlobStore] = None
                  ) -> None:
+        """
+        Parameters:
+            client_bugzoo: a connection to the BugZoo server.
+            client_rooibos: a connection to the Rooibos server.
+            operators: the mutation operators, or a function that returns
+                the mutation operators that are currently in use.
+            workers: the pool to which CPU-bound work is offloaded, if any.
+            provider: the provider of the contents of source files. If
+                omitted, files are read from BugZoo containers.
+            blobs: the store in which the contents of files are kept. If
+                omitted, contents are kept in memory.
+        """
+        if provider is None:
+            provider = BugZooProvider(client_bugzoo)
+        if blobs is None:
+            blobs = BlobStore()
         self.__bugzoo = client_bugzoo
+        self.__provider = provider
+        self.__workers = workers
         self.__rooibos = client_rooibos
-        self.__operators = operators
-        self.__cache_file_contents = {}  # type: Dict[Tuple[str, str], str]
-        self.__cache_offsets = {}  # type: Dict[Tuple[str, str], List[int]]
+        if isinstance(operators, OperatorManager):
+            self.__operators = \
+                lambda: operators  # type: Callable[[], OperatorManager]
+        else:
+            self.__operators = operators
+        # files are mapped to the digests of their contents, and everything
+        # derived from those contents is cached by digest, so that files
+        # shared between snapshots are stored and analysed once. each digest
+        # is stored together with the stamp of the file at the time that it
+        # was read, and files whose stamp has since changed (e.g., files in a
+        # directory on the host) are read again.
+        self.__blobs = blobs
+        self.__cache_digests = \
+            {}  # type: Dict[Tuple[str, str], Tuple[str, Optional[Hashable]]]
+        self.__cache_offsets = {}  # type: Dict[str, List[int]]
+        self.__cache_masks = {}  # type: Dict[Tuple[str, str], LexicalMask]
+        self.__cache_tokens = {}  # type: Dict[Tuple[str, str], TokenIndex]
+
+    @property
+    def blobs(self) -> BlobStore:
+        """
+        The store in which the contents of files are kept.
+        """
+        return self.__blobs
 
     def num_lines(self, snapshot: Bug, filepath: str) -> int:
         """
@@ -37,51 +83,167 @@ class SourceFileManager(object):
             FileNotFound: if the given file is not found within the provided
                 snapshot.
         """
-        return len(self._line_offsets(snapshot, filepath))
+        return len(self.line_offsets(snapshot, filepath))
 
     def _forget_file(self, snapshot: Bug, filepath: str) -> None:
         """
         Removes all stored information for a particular file belonging to a
         given snapshot.
         """
-        try:
-            cache_key = (snapshot.name, filepath)
-            del self.__cache_offsets[cache_key]
-            del self.__cache_file_contents[cache_key]
-        except KeyError:
-            pass
+        self.__cache_digests.pop((snapshot.name, filepath), None)
+
+    def _cached_digest(self, snapshot: Bug, filepath: str) -> Optional[str]:
+        """
+        Returns the digest of the cached contents of a particular file in a
+        given snapshot, or None if its contents are not cached or the file
+        has changed since its contents were cached.
+        """
+        key_cache = (snapshot.name, filepath)
+        entry = self.__cache_digests.get(key_cache)
+        if entry is None:
+            return None
+        digest, stamp = entry
+        if stamp is not None and \
+           self.__provider.stamp(snapshot, filepath) != stamp:
+            logger.debug("Source file, '%s/%s', has changed: discarding cached contents",  # noqa: pycodestyle
+                         snapshot.name, filepath)
+            self.__cache_digests.pop(key_cache, None)
+            return None
+        return digest
+
+    def _cache_contents(self,
+                        snapshot: Bug,
+                        filepath: str,
+                        contents: str,
+                        stamp: Optional[Hashable]
+                        ) -> str:
+        digest = self.__blobs.put(contents)
+        self.__cache_digests[(snapshot.name, filepath)] = (digest, stamp)
+        return digest
+
+    def use_provider(self, provider: SourceProvider) -> None:
+        """
+        Replaces the provider of the contents of source files. The contents
+        that were read from the previous provider are forgotten, although
+        their blobs are kept.
+        """
+        self.__provider = provider
+        self.__cache_digests = {}
+
+    def list_files(self, snapshot: Bug) -> List[str]:
+        """
+        Lists the paths of the files belonging to a given snapshot, relative
+        to its source directory.
+        """
+        return self.__provider.list_files(snapshot)
 
-    def _fetch_files(self, snapshot: Bug, filepaths: List[str]) -> None:
+    def fetch_files(self, snapshot: Bug, filepaths: List[str]) -> None:
         """
         Pre-emptively stores the contents of a given list of files for a
         particular snapshot.
+
+        Raises:
+            FileNotFound: if one of the files is not found inside the
+                snapshot.
+        """
+        missing = [fn for fn in filepaths
+                   if self._cached_digest(snapshot, fn) is None]
+        if not missing:
+            return
+        # files are stamped before they are read, so that changes made while
+        # they are being read are noticed
+        provider = self.__provider
+        stamps = {fn: provider.stamp(snapshot, fn) for fn in missing}
+        contents = provider.read_many(snapshot, missing)
+        for (filepath, content) in contents.items():
+            self._cache_contents(snapshot, filepath, content, stamps[filepath])
+
+    def digest(self, snapshot: Bug, filepath: str) -> str:
+        """
+        Computes a hexadecimal digest of the contents of a particular file in
+        a given snapshot.
+
+        Raises:
+            FileNotFound: if the given file is not found within the provided
+                snapshot.
+        """
+        digest = self._cached_digest(snapshot, filepath)
+        if digest is None:
+            stamp = self.__provider.stamp(snapshot, filepath)
+            contents = self.read_file(snapshot, filepath)
+            digest = self._cache_contents(snapshot, filepath, contents, stamp)
+        return digest
+
+    def blob_path(self, snapshot: Bug, filepath: str) -> Optional[str]:
+        """
+        Returns the path to the on-disk blob that holds the contents of a
+        particular file in a given snapshot, or None if the contents of
+        files are kept in memory.
+
+        Raises:
+            FileNotFound: if the given file is not found within the provided
+                snapshot.
         """
-        bgz = self.__bugzoo
-        container = bgz.containers.provision(snapshot)
-        try:
-            for filepath in filepaths:
-                key = (snapshot.name, filepath)
-                try:
-                    if key in self.__cache_file_contents:
-                        continue
-                    self.__cache_file_contents[key] = \
-                        bgz.files.read(container, filepath)
-                except KeyError:
-                    logger.exception("Failed to read source file, '%s/%s': file not found",  # noqa: pycodestyle
-                                     snapshot.name, filepath)
-                    raise FileNotFound(filepath)
-        finally:
-            del bgz.containers[container.uid]
-
-    def _line_offsets(self, snapshot: Bug, filepath: str) -> List[int]:
+        return self.__blobs.path(self.digest(snapshot, filepath))
+
+    def lexical_mask(self,
+                     snapshot: Bug,
+                     filepath: str,
+                     language: Language
+                     ) -> LexicalMask:
+        """
+        Computes the lexical mask for a particular file in a given snapshot,
+        which marks its comments, literals and preprocessor directives. Masks
+        are cached by the contents of the file and its language.
+
+        Raises:
+            FileNotFound: if the given file is not found within the provided
+                snapshot.
+        """
+        key_cache = (self.digest(snapshot, filepath), language.name)
+        if key_cache not in self.__cache_masks:
+            logger.debug("Computing lexical mask for file, '%s', in snapshot, '%s'",  # noqa: pycodestyle
+                         filepath,
+                         snapshot.name)
+            contents = self.read_file(snapshot, filepath)
+            mask = LexicalMask.build(contents, language.name)
+            self.__cache_masks[key_cache] = mask
+        return self.__cache_masks[key_cache]
+
+    def token_index(self,
+                    snapshot: Bug,
+                    filepath: str,
+                    language: Language
+                    ) -> TokenIndex:
+        """
+        Computes the index of token boundaries for a particular file in a
+        given snapshot. Indices are cached by the contents of the file and
+        its language.
+
+        Raises:
+            FileNotFound: if the given file is not found within the provided
+                snapshot.
+        """
+        key_cache = (self.digest(snapshot, filepath), language.name)
+        if key_cache not in self.__cache_tokens:
+            logger.debug("Computing token index for file, '%s', in snapshot, '%s'",  # noqa: pycodestyle
+                         filepath,
+                         snapshot.name)
+            contents = self.read_file(snapshot, filepath)
+            tokens = TokenIndex.build(contents, language.name)
+            self.__cache_tokens[key_cache] = tokens
+        return self.__cache_tokens[key_cache]
+
+    def line_offsets(self, snapshot: Bug, filepath: str) -> List[int]:
         """
         Returns a list specifying the offset for the first character on each
-        line in a given file belonging to a BugZoo snapshot.
+        line in a given file belonging to a BugZoo snapshot. Offsets are
+        cached by the contents of the file.
         """
         logger.debug("Fetching line offsets for file, '%s', in snapshot, '%s'",  # noqa: pycodestyle
                      filepath,
                      snapshot.name)
-        key_cache = (snapshot.name, filepath)
+        key_cache = self.digest(snapshot, filepath)
         if key_cache in self.__cache_offsets:
             logger.debug("Retrieving line offsets for file, '%s', in snapshot, '%s', from cache.",  # noqa: pycodestyle
                          filepath,
@@ -127,7 +289,7 @@ class SourceFileManager(object):
                                            col_num)
         logger.debug("Transforming line-column, '%s', into a character offset",  # noqa: pycodestyle
                      line_col_s)
-        line_offsets = self._line_offsets(snapshot, filepath)
+        line_offsets = self.line_offsets(snapshot, filepath)
         line_starts_at = line_offsets[line_num - 1]
         offset = line_starts_at + col_num
         logger.debug("Transformed line-column, '%s', into character offset: %s",  # noqa: pycodestyle
@@ -184,11 +346,11 @@ class SourceFileManager(object):
         Transforms a given mutation to a snapshot into a replacement.
         """
         logger.debug("transforming mutation [%s] to replacement.", mutation)
-        operator = self.__operators[mutation.operator]
+        operator = self.__operators()[mutation.operator]
         transformation = \
             operator.transformations[mutation.transformation_index]
         text_mutated = self.__rooibos.substitute(transformation.rewrite,
-                                                 mutation.arguments)
+                                                 dict(mutation.arguments))
         replacement = Replacement(mutation.location, text_mutated)
         logger.debug("transformed mutation [%s] to replacement [%s].",
                      mutation, replacement)
@@ -217,10 +379,15 @@ class SourceFileManager(object):
         file_diffs = []  # type: List[str]
         for (filename, replacements) in file_to_replacements.items():
             original = self.read_file(snapshot, filename)
-            mutated = self.apply(snapshot, filename, replacements)
-            diff = ''.join(unified_diff(original.splitlines(True),
-                                        mutated.splitlines(True),
-                                        filename, filename))
+            edits = self._edits(snapshot, filename, replacements)
+            workers = self.__workers
+            if workers and workers.accepts(original):
+                blob = self.blob_path(snapshot, filename)
+                diff = workers.render_diff(original, filename, edits,
+                                           blob=blob)
+            else:
+                diff = render_diff(original, splice(original, edits),
+                                   filename)
             logger.debug("transformed replacements to file to diff:\n%s", diff)
             file_diffs.append(diff)
         diff_s = '\n'.join(file_diffs)
@@ -240,28 +407,19 @@ class SourceFileManager(object):
                      snapshot.name, filepath)
         # TODO normalise file path
 
-        bgz = self.__bugzoo
-        key_cache = (snapshot.name, filepath)
-        if key_cache in self.__cache_file_contents:
-            contents = self.__cache_file_contents[key_cache]
+        digest = self._cached_digest(snapshot, filepath)
+        if digest is not None:
+            contents = self.__blobs.get(digest)
             logger.debug("Found contents of source file, '%s/%s', in cache.",  # noqa: pycodestyle
                          snapshot.name, filepath)
             return contents
 
-        logger.debug("Provisioning a temporary container to fetch contents of file")  # noqa: pycodestyle
-        container = bgz.containers.provision(snapshot)
-        try:
-            contents = bgz.files.read(container, filepath)
-        except KeyError:
-            logger.exception("Failed to read source file, '%s/%s': file not found",  # noqa: pycodestyle
-                             snapshot.name, filepath)
-            raise FileNotFound(filepath)
-        finally:
-            del bgz.containers[container.uid]
+        stamp = self.__provider.stamp(snapshot, filepath)
+        contents = self.__provider.read(snapshot, filepath)
         logger.debug("Read contents of source file, '%s/%s'",
                      snapshot.name, filepath)
 
-        self.__cache_file_contents[key_cache] = contents
+        self._cache_contents(snapshot, filepath, contents, stamp)
         return contents
 
     def read_line(self,
@@ -281,7 +439,7 @@ class SourceFileManager(object):
         TODO: LineNotFound
         """
         content_file = self.read_file(snapshot, location.filename)
-        line_offsets = self._line_offsets(snapshot, location.filename)
+        line_offsets = self.line_offsets(snapshot, location.filename)
         start_at = line_offsets[location.num - 1]
         if len(line_offsets) == location.num:
             content_line = content_file[start_at:]
@@ -325,12 +483,30 @@ class SourceFileManager(object):
         # TODO ensure all replacements are in the same file
         logger.debug("applying replacements to source file, '%s/%s': %s",
                      snapshot.name, filename, replacements)
-
-        # exclude conflicting replacements
-        replacements = Replacement.resolve(replacements)
-
         content = self.read_file(snapshot, filename)
-        for replacement in replacements:
+        edits = self._edits(snapshot, filename, replacements)
+        workers = self.__workers
+        if workers and workers.accepts(content):
+            content = workers.splice(content, edits,
+                                     blob=self.blob_path(snapshot, filename))
+        else:
+            content = splice(content, edits)
+        logger.debug("applied replacements to source file, '%s/%s': %s",
+                     snapshot.name, filename, replacements)
+        return content
+
+    def _edits(self,
+               snapshot: Bug,
+               filename: str,
+               replacements: List[Replacement]
+               ) -> List[Edit]:
+        """
+        Transforms a list of replacements to a given file into a list of
+        edits, given by character offsets, after excluding conflicting
+        replacements.
+        """
+        edits = []  # type: List[Edit]
+        for replacement in Replacement.resolve(replacements):
             location = replacement.location
             start_at = self.line_col_to_offset(snapshot,
                                                filename,
@@ -340,8 +516,5 @@ class SourceFileManager(object):
                                               filename,
                                               location.stop.line,
                                               location.stop.column)
-            content = \
-                content[:start_at] + replacement.text + content[stop_at:]
-        logger.debug("applied replacements to source file, '%s/%s': %s",
-                     snapshot.name, filename, replacements)
-        return content
+            edits.append((start_at, stop_at, replacement.text))
+        return edits
@@ -0,0 +1,173 @@
+"""
+Provides background warm-up of the caches used to find the mutations to the
+source files of registered snapshots, so that the first requests for those
+snapshots need not fetch and search every file on the request path.
+"""
+__all__ = ['WarmUpManager']
+
+from typing import Any, Dict, List, Optional, Sequence
+import fnmatch
+import logging
+import threading
+
+from bugzoo.core.bug import Bug
+
+from .jobs import Job
+from ..exceptions import BoggartException, SnapshotNotFound
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+
+class WarmUpManager(object):
+    """
+    Runs warm-up jobs for an installation. Warm-up runs at low priority:
+    between files, it waits until the server has no requests in flight.
+
+    Before warming a snapshot, the discovery cache of the installation is
+    grown, up to its maximum capacity, so that it can hold the mutations of
+    the files that are about to be warmed. Warm-up never evicts entries from
+    the discovery cache: once the cache is full, only the contents and line
+    indices of the remaining files are cached.
+    """
+    def __init__(self, installation: Any, idle_timeout: float = 5.0) -> None:
+        """
+        Parameters:
+            installation: the installation whose caches should be warmed.
+            idle_timeout: the longest time, in seconds, for which warm-up
+                waits for the server to become idle before processing its
+                next file regardless.
+        """
+        self.__installation = installation
+        self.__idle_timeout = idle_timeout
+        self.__idle = threading.Condition()
+        self.__num_requests = 0
+        self.__lock = threading.Lock()
+        self.__jobs = []  # type: List[Job]
+
+    def request_started(self) -> None:
+        """
+        Records that the server has begun to handle a request.
+        """
+        with self.__idle:
+            self.__num_requests += 1
+
+    def request_finished(self) -> None:
+        """
+        Records that the server has finished handling a request.
+        """
+        with self.__idle:
+            self.__num_requests -= 1
+            if self.__num_requests <= 0:
+                self.__num_requests = 0
+                self.__idle.notify_all()
+
+    def _wait_until_idle(self) -> None:
+        with self.__idle:
+            self.__idle.wait_for(lambda: self.__num_requests == 0,
+                                 self.__idle_timeout)
+
+    @property
+    def jobs(self) -> List[Job]:
+        """
+        The warm-up jobs that are still running, in the order that they were
+        submitted. Jobs that have finished or failed are forgotten, though
+        their outcome remains available from the job manager.
+        """
+        with self.__lock:
+            self.__jobs = [job for job in self.__jobs
+                           if job.status == 'running']
+            return list(self.__jobs)
+
+    def resolve(self, patterns: Sequence[str]) -> List[Bug]:
+        """
+        Finds the snapshots whose names match any of a given list of names or
+        glob patterns.
+
+        Raises:
+            SnapshotNotFound: if a name that is not a pattern does not belong
+                to a registered snapshot.
+        """
+        bugs = self.__installation.bugzoo.bugs
+        names = []  # type: List[str]
+        registered = None  # type: Optional[List[str]]
+        for pattern in patterns:
+            if not any(c in pattern for c in '*?['):
+                if pattern not in bugs:
+                    raise SnapshotNotFound(pattern)
+                matches = [pattern]
+            else:
+                if registered is None:
+                    registered = sorted(bugs)
+                matches = fnmatch.filter(registered, pattern)
+            names += [name for name in matches if name not in names]
+        return [bugs[name] for name in names]
+
+    def submit(self, patterns: Sequence[str]) -> Job:
+        """
+        Launches a background job that warms the caches for the snapshots
+        whose names match any of a given list of names or glob patterns.
+
+        Raises:
+            SnapshotNotFound: if a name that is not a pattern does not belong
+                to a registered snapshot.
+        """
+        snapshots = self.resolve(patterns)
+        description = "warm up {} snapshots".format(len(snapshots))
+
+        def task(job: Job) -> Dict[str, Any]:
+            job.report(snapshots=len(snapshots), snapshots_done=0,
+                       files=0, files_done=0, files_failed=0)
+            for (i, snapshot) in enumerate(snapshots):
+                self.warm(snapshot, job)
+                job.report(snapshots_done=i + 1)
+            return job.progress
+
+        job = self.__installation.jobs.submit(description, task)
+        with self.__lock:
+            self.__jobs = [j for j in self.__jobs if j.status == 'running']
+            self.__jobs.append(job)
+        return job
+
+    def warm(self, snapshot: Bug, job: Optional[Job] = None) -> None:
+        """
+        Fetches the contents of all source files belonging to a snapshot that
+        are written in a supported language, and finds their mutations using
+        all operators, filling the content, line index and discovery caches.
+        Mutations are only found for as many files as the discovery cache
+        has room for. Files whose mutations cannot be found are skipped.
+        """
+        installation = self.__installation
+        endings = tuple(installation.languages.supported_file_endings)
+        filepaths = [fn for fn in installation.sources.list_files(snapshot)
+                     if fn.endswith(endings)]
+        logger.info("warming up %d files in snapshot: %s",
+                    len(filepaths), snapshot.name)
+
+        progress = job.progress if job else {}
+        num_files = progress.get('files', 0) + len(filepaths)
+        num_done = progress.get('files_done', 0)
+        num_failed = progress.get('files_failed', 0)
+        if job:
+            job.report(snapshot=snapshot.name, files=num_files)
+
+        room = installation.discovery.reserve(len(filepaths))
+        if room < len(filepaths):
+            logger.info("discovery cache is full: finding mutations for %d of %d files in snapshot: %s",  # noqa: pycodestyle
+                        room, len(filepaths), snapshot.name)
+        self._wait_until_idle()
+        installation.sources.fetch_files(snapshot, filepaths)
+        for (i, filepath) in enumerate(filepaths):
+            self._wait_until_idle()
+            try:
+                if i < room:
+                    installation.mutation_set(snapshot, filepath)
+                else:
+                    installation.sources.line_offsets(snapshot, filepath)
+            except BoggartException as err:
+                logger.warning("failed to warm up file, '%s', in snapshot, '%s': %s",  # noqa: pycodestyle
+                               filepath, snapshot.name, err)
+                num_failed += 1
+            num_done += 1
+            if job:
+                job.report(files_done=num_done, files_failed=num_failed)
+        logger.info("warmed up snapshot: %s", snapshot.name)
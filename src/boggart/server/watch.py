@@ -0,0 +1,95 @@
+"""
+Provides a watcher that reloads the configuration of an installation when
+its configuration files change.
+"""
+__all__ = ['ConfigWatcher']
+
+from typing import Any, Dict, Optional, Tuple
+import logging
+import os
+import threading
+
+from ..exceptions import BoggartException
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+
+class ConfigWatcher(object):
+    """
+    Polls the configuration files of an installation for changes, and
+    reloads the configuration of that installation whenever a change is
+    detected. If the changed files describe a bad configuration, the error
+    is logged and the current configuration is kept.
+    """
+    def __init__(self, installation: Any, interval: float = 2.0) -> None:
+        """
+        Parameters:
+            installation: the installation whose configuration should be
+                reloaded.
+            interval: the number of seconds between checks for changes.
+        """
+        self.__installation = installation
+        self.__interval = interval
+        self.__stopped = threading.Event()
+        self.__thread = None  # type: Optional[threading.Thread]
+        self.__stamps = self._stamps()
+
+    def _stamps(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        """
+        Returns the modification time and size of each configuration file,
+        or None for files that do not exist.
+        """
+        stamps = {}  # type: Dict[str, Optional[Tuple[int, int]]]
+        for path in self.__installation.config_paths():
+            try:
+                stat = os.stat(path)
+                stamps[path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stamps[path] = None
+        return stamps
+
+    def check(self) -> bool:
+        """
+        Reloads the configuration if any of the configuration files have
+        changed since they were last checked.
+
+        Returns:
+            True if the configuration was reloaded, or False if there were no
+            changes or the changed configuration could not be loaded.
+        """
+        stamps = self._stamps()
+        if stamps == self.__stamps:
+            return False
+        self.__stamps = stamps
+        logger.info("configuration files have changed: reloading configuration")  # noqa: pycodestyle
+        try:
+            self.__installation.reload()
+        except BoggartException as err:
+            logger.error("failed to reload configuration -- keeping current configuration: %s",  # noqa: pycodestyle
+                         err)
+            return False
+        return True
+
+    def _watch(self) -> None:
+        while not self.__stopped.wait(self.__interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("unexpected error while watching configuration files")  # noqa: pycodestyle
+
+    def start(self) -> None:
+        """
+        Begins to watch the configuration files in a background thread.
+        """
+        assert self.__thread is None, "watcher has already been started"
+        self.__thread = threading.Thread(target=self._watch, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops watching the configuration files.
+        """
+        self.__stopped.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
@@ -0,0 +1,244 @@
+"""
+Provides an optional pool of worker processes to which the CPU-bound stages
+of mutation discovery and diff generation can be offloaded, so that large
+files do not hold the GIL of the server for the duration of a request.
+File contents are passed to workers via the on-disk blob that holds them,
+or via shared memory, when available, rather than being pickled.
+"""
+__all__ = ['WorkerPool']
+
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from difflib import unified_diff
+import logging
+import multiprocessing
+import os
+
+from rooibos import Match
+
+from ..core import Constraint, ConstraintStatistics, LexicalMask, \
+                   TokenIndex, Transformation
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None  # type: ignore
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+# a text is passed to a worker either as the kind ('shm' or 'file'), name and
+# size of the shared memory block or file that holds its UTF-8 encoding, or
+# as the text itself.
+_Handle = Union[Tuple[str, str, int], str]
+
+_Candidates = List[Tuple[Match, int, int]]
+_Statistics = List[Tuple[Constraint, ConstraintStatistics]]
+
+#: Describes a replacement of the characters between two offsets.
+Edit = Tuple[int, int, str]
+
+
+def _read(handle: _Handle) -> str:
+    if isinstance(handle, str):
+        return handle
+    kind, name, size = handle
+    if kind == 'file':
+        with open(name, 'rb') as f:
+            return f.read(size).decode('utf-8')
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        buf = block.buf
+        assert buf is not None
+        return bytes(buf[:size]).decode('utf-8')
+    finally:
+        block.close()
+
+
+def splice(text: str, edits: Sequence[Edit]) -> str:
+    """
+    Applies a sequence of edits to a given text, in order.
+    """
+    for (start, stop, replacement) in edits:
+        text = text[:start] + replacement + text[stop:]
+    return text
+
+
+def render_diff(original: str, mutated: str, filename: str) -> str:
+    """
+    Produces a unified diff between two versions of a given file.
+    """
+    return ''.join(unified_diff(original.splitlines(True),
+                                mutated.splitlines(True),
+                                filename, filename))
+
+
+def _filter_matches(handle: _Handle,
+                    language: str,
+                    batches: List[Tuple[Transformation, _Candidates]]
+                    ) -> List[Tuple[List[int], _Statistics]]:
+    text = _read(handle)
+    mask = LexicalMask.build(text, language)
+    tokens = TokenIndex.build(text, language)
+    results = []  # type: List[Tuple[List[int], _Statistics]]
+    for (transformation, candidates) in batches:
+        accepted = [i for (i, (match, start, stop)) in enumerate(candidates)
+                    if transformation.satisfies_constraints(match,
+                                                            text,
+                                                            start,
+                                                            stop,
+                                                            mask=mask,
+                                                            tokens=tokens)]
+        results.append((accepted, transformation.constraint_statistics()))
+    return results
+
+
+def _splice(handle: _Handle, edits: List[Edit]) -> str:
+    return splice(_read(handle), edits)
+
+
+def _render_diff(handle: _Handle, filename: str, edits: List[Edit]) -> str:
+    original = _read(handle)
+    return render_diff(original, splice(original, edits), filename)
+
+
+class WorkerPool(object):
+    """
+    A pool of worker processes for CPU-bound work on the contents of files.
+    Only texts with at least a given number of characters are worth the
+    cost of offloading.
+    """
+    def __init__(self, size: int, threshold: int = 64 * 1024) -> None:
+        """
+        Parameters:
+            size: the number of worker processes.
+            threshold: the smallest number of characters in a text for which
+                work should be offloaded to the pool.
+        """
+        assert size > 0, "expected at least one worker process"
+        # workers are spawned rather than forked, since forking a threaded
+        # server can leave locks held in the child
+        context = multiprocessing.get_context('spawn')
+        self.__executor = ProcessPoolExecutor(max_workers=size,
+                                              mp_context=context)
+        self.__size = size
+        self.__threshold = threshold
+
+    @property
+    def size(self) -> int:
+        """
+        The number of worker processes in this pool.
+        """
+        return self.__size
+
+    def accepts(self, text: str) -> bool:
+        """
+        Determines whether work on a given text should be offloaded.
+        """
+        return len(text) >= self.__threshold
+
+    @contextmanager
+    def _shared(self,
+                text: str,
+                blob: Optional[str] = None
+                ) -> Iterator[_Handle]:
+        """
+        Passes a given text by the path to the on-disk blob that holds it, if
+        given, or places the text in shared memory for the duration of the
+        context, or passes the text itself if shared memory is unavailable.
+        """
+        if blob is not None:
+            yield ('file', blob, os.path.getsize(blob))
+            return
+        block = None
+        try:
+            if shared_memory is not None:
+                contents = text.encode('utf-8')
+                try:
+                    block = shared_memory.SharedMemory(create=True,
+                                                       size=max(1, len(contents)))  # noqa: pycodestyle
+                except OSError:
+                    logger.warning("failed to allocate shared memory: passing text to worker directly")  # noqa: pycodestyle
+                else:
+                    buf = block.buf
+                    assert buf is not None
+                    buf[:len(contents)] = contents
+                    yield ('shm', block.name, len(contents))
+                    return
+            yield text
+        finally:
+            if block is not None:
+                block.close()
+                block.unlink()
+
+    def filter_matches(self,
+                       text: str,
+                       language: str,
+                       batches: List[Tuple[Transformation, _Candidates]],
+                       *,
+                       blob: Optional[str] = None
+                       ) -> List[List[int]]:
+        """
+        Checks candidate matches in a given text against the constraints of
+        their transformations. The statistics gathered by the workers are
+        added to those of each transformation.
+
+        Parameters:
+            text: the text in which the matches were found.
+            language: the name of the language of the text.
+            batches: a list of transformations, each with a list of candidate
+                matches, given together with the offsets at which they begin
+                and end.
+            blob: the path to the on-disk blob that holds the text, if any.
+
+        Returns:
+            for each transformation, the indices of the candidates that
+            satisfy its constraints.
+        """
+        with self._shared(text, blob) as handle:
+            future = self.__executor.submit(_filter_matches,
+                                            handle,
+                                            language,
+                                            batches)
+            results = future.result()
+        accepted = []  # type: List[List[int]]
+        for ((transformation, _), (indices, stats)) in zip(batches, results):
+            transformation.record_constraint_statistics(stats)
+            accepted.append(indices)
+        return accepted
+
+    def splice(self,
+               text: str,
+               edits: List[Edit],
+               *,
+               blob: Optional[str] = None
+               ) -> str:
+        """
+        Applies a sequence of edits to a given text, in order.
+        """
+        with self._shared(text, blob) as handle:
+            return self.__executor.submit(_splice, handle, edits).result()
+
+    def render_diff(self,
+                    text: str,
+                    filename: str,
+                    edits: List[Edit],
+                    *,
+                    blob: Optional[str] = None
+                    ) -> str:
+        """
+        Produces a unified diff for a file with given contents that applies
+        a sequence of edits to that file.
+        """
+        with self._shared(text, blob) as handle:
+            future = self.__executor.submit(_render_diff,
+                                            handle,
+                                            filename,
+                                            edits)
+            return future.result()
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker processes of this pool.
+        """
+        self.__executor.shutdown(wait=True)
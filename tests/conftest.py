@@ -0,0 +1,143 @@
+from typing import Dict, Iterator, List, Set
+
+import pytest
+import rooibos
+from bugzoo.core.coverage import TestCoverage, TestSuiteCoverage
+from bugzoo.core.fileline import FileLineSet
+from bugzoo.core.test import TestOutcome
+
+import boggart.server
+from boggart.config import Configuration
+from boggart.server import Installation
+
+
+class FakeSnapshot(object):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.instructions_coverage = None
+
+
+class FakeContainer(object):
+    def __init__(self, uid: str, snapshot: FakeSnapshot) -> None:
+        self.uid = uid
+        self.snapshot = snapshot
+
+
+class FakeBugZoo(object):
+    """
+    A stand-in for a BugZoo client that serves the contents of source files
+    from memory.
+    """
+    class Bugs(dict):
+        def __init__(self) -> None:
+            super().__init__()
+            self.covered_lines = {}  # type: Dict[str, Dict[str, List[int]]]
+            self.num_coverage_requests = 0
+
+        def register(self, snapshot: FakeSnapshot) -> None:
+            self[snapshot.name] = snapshot
+
+        def coverage(self, snapshot: FakeSnapshot) -> TestSuiteCoverage:
+            self.num_coverage_requests += 1
+            lines = self.covered_lines.get(snapshot.name, {})
+            coverage = TestCoverage('t1', TestOutcome(None, True),
+                                    FileLineSet.from_dict(lines))
+            return TestSuiteCoverage({'t1': coverage})
+
+    class Containers(dict):
+        def provision(self, snapshot: FakeSnapshot) -> FakeContainer:
+            container = FakeContainer(str(len(self)), snapshot)
+            self[container.uid] = container
+            return container
+
+    class Files(object):
+        def __init__(self, contents: Dict[str, Dict[str, str]]) -> None:
+            self.contents = contents
+            self.num_reads = 0
+
+        def read(self, container: FakeContainer, filepath: str) -> str:
+            self.num_reads += 1
+            return self.contents[container.snapshot.name][filepath]
+
+    class Docker(object):
+        def __init__(self) -> None:
+            self.images = set()  # type: Set[str]
+
+        def delete_image(self, name: str) -> None:
+            self.images.remove(name)
+
+    def __init__(self, contents: Dict[str, Dict[str, str]]) -> None:
+        self.docker = FakeBugZoo.Docker()
+        self.bugs = FakeBugZoo.Bugs()
+        for name in contents:
+            self.bugs[name] = FakeSnapshot(name)
+        self.containers = FakeBugZoo.Containers()
+        self.files = FakeBugZoo.Files(contents)
+
+
+class FakeRooibos(object):
+    """
+    A stand-in for a Rooibos client that supports only match templates that
+    do not contain holes.
+    """
+    def __init__(self) -> None:
+        self.num_matches = 0
+
+    def matches(self, text: str, template: str) -> Iterator[rooibos.Match]:
+        assert ':[' not in template
+        self.num_matches += 1
+        offset = text.find(template)
+        while offset != -1:
+            start = self._location(text, offset)
+            stop = self._location(text, offset + len(template))
+            location = rooibos.LocationRange(start, stop)
+            yield rooibos.Match(rooibos.Environment([]), location)
+            offset = text.find(template, offset + len(template))
+
+    @staticmethod
+    def _location(text: str, offset: int) -> rooibos.Location:
+        line = text.count('\n', 0, offset) + 1
+        col = offset - (text.rfind('\n', 0, offset) + 1)
+        return rooibos.Location(line, col)
+
+    def substitute(self, template: str, args: Dict[str, str]) -> str:
+        for term, value in args.items():
+            template = template.replace(':[{}]'.format(term), value)
+        return template
+
+
+SOURCE_GCD = """
+int gcd(int a, int b) {
+  if (a == 0) {
+    return b;
+  }
+  while (b != 0) {
+    if (a > b) {
+      a = a - b;
+    } else {
+      b = b - a;
+    }
+  }
+  return a;
+}
+""".lstrip()
+
+
+@pytest.fixture
+def bugzoo() -> FakeBugZoo:
+    return FakeBugZoo({'gcd': {'gcd.c': SOURCE_GCD}})
+
+
+@pytest.fixture
+def installation(bugzoo: FakeBugZoo) -> Installation:
+    config = Configuration.from_file(Installation.sys_config_path())
+    return Installation(config, bugzoo, FakeRooibos())
+
+
+@pytest.fixture
+def server(installation: Installation):
+    boggart.server.installation = installation
+    boggart.server.app.config['TESTING'] = True
+    with boggart.server.app.test_client() as client:
+        yield client
+    boggart.server.installation = None
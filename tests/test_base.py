@@ -1,3 +1,6 @@
+import threading
+
+import attr
 import pytest
 from boggart.core import Language, \
                          Transformation, \
@@ -5,6 +8,9 @@ from boggart.core import Language, \
                          Location, \
                          LocationRange, \
                          FileLocationRange
+from boggart.core.constraint import Constraint, NotInComment, PrecededBy, \
+    IsSingleTerm, WholeToken, COST_CHEAP, COST_MODERATE, COST_EXPENSIVE
+from boggart.core.location import FileLocation, FileLocationRangeSet
 
 
 def test_location_equality():
@@ -69,12 +75,145 @@ def test_file_location_range_to_and_from_string():
     assert loc == loc_from_s
 
 
+def test_location_range_contains():
+    loc = LocationRange.from_string("2:5::4:3")
+    assert Location(2, 5) in loc
+    assert Location(3, 0) in loc
+    assert Location(4, 2) in loc
+    assert Location(2, 4) not in loc
+    assert Location(4, 3) not in loc
+    assert Location(1, 8) not in loc
+
+
+def test_file_location_range_set_queries():
+    ranges = FileLocationRangeSet([
+        FileLocationRange.from_string("foo.c@10:0::12:0"),
+        FileLocationRange.from_string("foo.c@11:4::14:2"),
+        FileLocationRange.from_string("foo.c@20:0::20:5"),
+        FileLocationRange.from_string("bar.c@1:0::1:1")])
+    assert [str(r) for r in ranges] == ["bar.c@1:0::1:1",
+                                        "foo.c@10:0::14:2",
+                                        "foo.c@20:0::20:5"]
+
+    def loc(s):
+        return FileLocation.from_string(s)
+
+    assert loc("foo.c@10:0") in ranges
+    assert loc("foo.c@13:100") in ranges
+    assert loc("foo.c@14:2") not in ranges
+    assert loc("foo.c@9:20") not in ranges
+    assert loc("foo.c@20:4") in ranges
+    assert loc("bar.c@13:0") not in ranges
+    assert loc("baz.c@10:0") not in ranges
+
+    def overlaps(s):
+        return ranges.overlaps(FileLocationRange.from_string(s))
+
+    assert overlaps("foo.c@14:1::15:0")
+    assert overlaps("foo.c@1:0::30:0")
+    assert not overlaps("foo.c@14:2::20:0")
+    assert not overlaps("foo.c@30:0::31:0")
+    assert not overlaps("baz.c@10:0::11:0")
+
+
+def test_file_location_range_set_operations():
+    contents = "int x = 0;\nint y = 1;\nx = y;\n"
+    offsets = [(4, 5), (11, 21)]
+    xs = FileLocationRangeSet.from_offsets("foo.c", contents, offsets)
+    assert [str(r) for r in xs] == ["foo.c@1:4::1:5", "foo.c@2:0::2:10"]
+
+    ys = FileLocationRangeSet([
+        FileLocationRange.from_string("foo.c@2:4::3:1"),
+        FileLocationRange.from_string("bar.c@1:0::1:1")])
+    assert [str(r) for r in xs & ys] == ["foo.c@2:4::2:10"]
+    assert [str(r) for r in xs | ys] == ["bar.c@1:0::1:1",
+                                         "foo.c@1:4::1:5",
+                                         "foo.c@2:0::3:1"]
+    assert not (xs & FileLocationRangeSet([]))
+    assert xs | FileLocationRangeSet([]) == xs
+
+
 def test_transformation_serialisation():
     expected = Transformation(':x = :y', ':y = :x', [])
     actual = Transformation.from_dict(expected.to_dict())
     assert expected == actual
 
 
+def test_lexical_constraint_serialisation():
+    kinds = ('not-in-comment', 'not-in-string', 'not-in-preprocessor',
+             'whole-token')
+    for kind in kinds:
+        constraint = Constraint.from_dict({'type': kind})
+        assert constraint.to_dict() == {'type': kind}
+    expected = Transformation('<', '>=', [NotInComment()])
+    assert Transformation.from_dict(expected.to_dict()) == expected
+
+
+@attr.s(frozen=True)
+class AlwaysAccepts(Constraint):
+    COST = COST_CHEAP
+
+    def is_satisfied_by(self, *args, **kwargs) -> bool:
+        return True
+
+
+@attr.s(frozen=True)
+class AlwaysRejects(Constraint):
+    COST = COST_CHEAP
+
+    def is_satisfied_by(self, *args, **kwargs) -> bool:
+        return False
+
+
+def test_constraint_plan_order():
+    constraints = [PrecededBy(['(']), IsSingleTerm('1'), WholeToken()]
+    transformation = Transformation(':[1] < :[2]', ':[1] > :[2]', constraints)
+    order = [c for (c, _) in transformation.constraint_statistics()]
+    assert [c.COST for c in order] == [COST_CHEAP, COST_MODERATE,
+                                       COST_EXPENSIVE]
+
+    # constraints that often reject matches are moved forward
+    transformation = Transformation('<', '>',
+                                    [AlwaysAccepts(), AlwaysRejects()])
+    plan = transformation._plan
+    assert plan.order == [AlwaysAccepts(), AlwaysRejects()]
+    for _ in range(10):
+        assert not transformation.satisfies_constraints(None, '<', 0, 1)
+    plan.reorder()
+    assert plan.order == [AlwaysRejects(), AlwaysAccepts()]
+    assert not transformation.satisfies_constraints(None, '<', 0, 1)
+
+    stats = dict(transformation.constraint_statistics())
+    assert stats[AlwaysRejects()].evaluations == 11
+    assert stats[AlwaysRejects()].rejections == 11
+    assert stats[AlwaysAccepts()].evaluations == 10
+    assert stats[AlwaysAccepts()].rejections == 0
+
+    # statistics do not affect equality
+    assert transformation == Transformation('<', '>', [AlwaysRejects(),
+                                                       AlwaysAccepts()])
+
+
+
+def test_constraint_plan_is_thread_safe():
+    transformation = Transformation('<', '>',
+                                    [AlwaysAccepts(), AlwaysRejects()])
+    num_threads, num_evaluations = 8, 2000
+
+    def evaluate() -> None:
+        for _ in range(num_evaluations):
+            transformation.satisfies_constraints(None, '<', 0, 1)
+
+    threads = [threading.Thread(target=evaluate) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = dict(transformation.constraint_statistics())
+    assert stats[AlwaysRejects()].evaluations == num_threads * num_evaluations
+    assert stats[AlwaysRejects()].rejections == num_threads * num_evaluations
+
 def test_language_serialisation():
     expected = Language("c", [".c"])
     actual = Language.from_dict(expected.to_dict())
@@ -0,0 +1,99 @@
+import os
+import resource
+
+import pytest
+
+from boggart.config import Configuration
+from boggart.server import Installation
+from boggart.server.blobs import BlobStore
+
+from conftest import FakeBugZoo, FakeRooibos, SOURCE_GCD
+
+
+def test_blob_store_in_memory():
+    store = BlobStore()
+    digest = store.put(SOURCE_GCD)
+    assert store.put(SOURCE_GCD) == digest
+    assert store.get(digest) == SOURCE_GCD
+    assert len(store) == 1
+    assert store.num_bytes == len(SOURCE_GCD.encode('utf-8'))
+    assert store.path(digest) is None
+
+
+def test_blob_store_on_disk(tmp_path):
+    store = BlobStore(str(tmp_path), cache_size=1)
+    first = store.put(SOURCE_GCD)
+    second = store.put('int x = 0;\n')
+    empty = store.put('')
+    assert store.path(first) == os.path.join(str(tmp_path), first)
+    with open(store.path(first), 'rb') as f:
+        assert f.read().decode('utf-8') == SOURCE_GCD
+    assert store.path(empty) is None
+
+    # decoded texts that are evicted from memory are read back from disk
+    assert store.get(first) == SOURCE_GCD
+    assert store.get(second) == 'int x = 0;\n'
+    assert store.get(empty) == ''
+    store.close()
+
+    # blobs written by an earlier store are reused
+    reopened = BlobStore(str(tmp_path))
+    assert reopened.put(SOURCE_GCD) == first
+    assert reopened.get(first) == SOURCE_GCD
+    reopened.close()
+
+
+def test_files_shared_between_snapshots(tmp_path):
+    config = Configuration.from_file(Installation.sys_config_path())
+    bugzoo = FakeBugZoo({'gcd-1': {'gcd.c': SOURCE_GCD},
+                         'gcd-2': {'gcd.c': SOURCE_GCD,
+                                   'main.c': 'int main() {}\n'}})
+    installation = Installation(config, bugzoo, FakeRooibos(),
+                                blob_dir=str(tmp_path))
+    sources = installation.sources
+    first, second = bugzoo.bugs['gcd-1'], bugzoo.bugs['gcd-2']
+    assert sources.read_file(first, 'gcd.c') == SOURCE_GCD
+    assert sources.read_file(second, 'gcd.c') == SOURCE_GCD
+    assert sources.read_file(second, 'main.c') == 'int main() {}\n'
+    assert len(sources.blobs) == 2
+
+    # information derived from the contents of a file is shared
+    assert sources.digest(first, 'gcd.c') == sources.digest(second, 'gcd.c')
+    assert sources.line_offsets(first, 'gcd.c') is \
+        sources.line_offsets(second, 'gcd.c')
+    assert sources.blob_path(first, 'gcd.c') == \
+        sources.blob_path(second, 'gcd.c')
+    installation.close()
+
+
+def test_blob_store_holds_no_open_files(tmp_path):
+    # more blobs than the limit on open files can be stored and read
+    limit = len(os.listdir('/proc/self/fd')) + 32
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (limit, hard))
+    try:
+        store = BlobStore(str(tmp_path), cache_size=8)
+        texts = ['int x{} = {};\n'.format(i, i) for i in range(limit + 100)]
+        digests = [store.put(text) for text in texts]
+        assert [store.get(digest) for digest in digests] == texts
+        store.close()
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_blob_store_failed_write(tmp_path, monkeypatch):
+    store = BlobStore(str(tmp_path))
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, 'replace', fail)
+    with pytest.raises(OSError):
+        store.put(SOURCE_GCD)
+    assert len(store) == 0
+    assert os.listdir(str(tmp_path)) == []
+
+    # the text is stored once the write succeeds
+    monkeypatch.undo()
+    digest = store.put(SOURCE_GCD)
+    assert digest in store
+    assert store.get(digest) == SOURCE_GCD
@@ -0,0 +1,54 @@
+from boggart.config import Configuration
+from boggart.core import Operator, Transformation
+from boggart.server import Installation
+from boggart.server.chunking import Chunk, plan_chunks
+from boggart.server.installation import _line_starts
+
+from conftest import FakeBugZoo, FakeRooibos
+
+
+def test_plan_chunks():
+    text = ''.join('line {}\n'.format(i) for i in range(1, 21))
+    line_starts = _line_starts(text)
+    chunks = plan_chunks(line_starts, len(text), 1, 20, 30, 2)
+    assert chunks[0] == Chunk(1, 4, 6)
+    assert chunks[-1].last == chunks[-1].stop == 20
+
+    # every line is owned by exactly one chunk
+    owned = [line for c in chunks for line in range(c.first, c.last + 1)]
+    assert owned == list(range(1, 21))
+
+    # chunks are split after blank lines within the overlap, if possible
+    text = 'a\nb\n\nc\nd\ne\n'
+    chunks = plan_chunks(_line_starts(text), len(text), 1, 6, 8, 2)
+    assert chunks[0] == Chunk(1, 3, 5)
+
+
+def test_chunked_matching():
+    # templates that contain whitespace are sent to Rooibos
+    blocks = ['int f{}(int a) {{\n  if (a < 0) {{\n    return a;\n  }}\n'
+              '  return 0;\n}}\n\n'.format(i) for i in range(40)]
+    source = ''.join(blocks)
+    operator = Operator('multi-line', ['C'], [
+        Transformation('if (a < 0) {\n    return a;', 'return a;', []),
+        Transformation('return 0;', 'return 1;', [])])
+
+    def find(chunk_size: int):
+        config = Configuration.from_file(Installation.sys_config_path())
+        bugzoo = FakeBugZoo({'big': {'big.c': source}})
+        rooibos = FakeRooibos()
+        installation = Installation(config, bugzoo, rooibos,
+                                    chunk_size=chunk_size,
+                                    chunk_overlap=3)
+        snapshot = bugzoo.bugs['big']
+        mutations = list(installation.mutations(snapshot, 'big.c',
+                                                operators=[operator]))
+        return mutations, rooibos.num_matches
+
+    expected, num_requests = find(len(source))
+    assert num_requests == 2
+    assert len(expected) == 80
+
+    mutations, num_requests = find(100)
+    assert num_requests > 2
+    assert mutations == expected
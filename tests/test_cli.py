@@ -0,0 +1,75 @@
+import io
+import json
+
+import pytest
+
+from boggart.cli import discover, main, write_columnar, write_jsonl
+from boggart.core import MutationSet
+from boggart.exceptions import BoggartException, FileNotFound, \
+    OperatorNotFound
+from boggart.server.providers import LocalDirectoryProvider
+
+from conftest import SOURCE_GCD, FakeSnapshot
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'gcd.c').write_text(SOURCE_GCD)
+    (tmp_path / 'README.txt').write_text('a < b\n')
+    (tmp_path / '.hidden').mkdir()
+    (tmp_path / '.hidden' / 'ignored.c').write_text('a < b;\n')
+    return str(tmp_path)
+
+
+def test_local_directory_provider(tree):
+    provider = LocalDirectoryProvider(tree)
+    snapshot = FakeSnapshot('local')
+    assert provider.read(snapshot, 'src/gcd.c') == SOURCE_GCD
+    with pytest.raises(FileNotFound):
+        provider.read(snapshot, 'src/missing.c')
+    with pytest.raises(FileNotFound):
+        provider.read(snapshot, '../outside.c')
+
+
+def test_discover(tree):
+    mutation_sets = list(discover(tree, num_workers=1))
+    assert len(mutation_sets) == 1
+    mutations = mutation_sets[0]
+    assert set(mutations.filenames) == {'src/gcd.c'}
+    assert set(mutations.operators) == {'flip-arithmetic-operator',
+                                        'flip-relational-operator'}
+
+    # the results do not depend on the number of workers
+    assert list(discover(tree, num_workers=2)) == mutation_sets
+
+    output = io.StringIO()
+    assert write_jsonl(mutation_sets, output) == len(mutations)
+    lines = output.getvalue().splitlines()
+    assert MutationSet.from_dicts([json.loads(ln) for ln in lines]) == \
+        mutations
+
+    output = io.BytesIO()
+    assert write_columnar(mutation_sets, output) == len(mutations)
+    assert MutationSet.from_bytes(output.getvalue()) == mutations
+
+
+def test_discover_without_rooibos(tree):
+    with pytest.raises(BoggartException):
+        list(discover(tree, operator_names=['delete-void-function-call']))
+    with pytest.raises(OperatorNotFound):
+        list(discover(tree, operator_names=['no-such-operator']))
+
+
+def test_main(tree, tmp_path, capsys):
+    output = str(tmp_path / 'mutations.jsonl')
+    main(['discover', tree, 'src/gcd.c', '--workers', '1', '-o', output,
+          '--operators', 'flip-relational-operator'])
+    with open(output) as f:
+        mutations = [json.loads(line) for line in f]
+    assert len(mutations) == 3
+    assert all(m['operator'] == 'flip-relational-operator'
+               for m in mutations)
+
+    with pytest.raises(SystemExit):
+        main(['discover', tree, '--format', 'columnar'])
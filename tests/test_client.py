@@ -1,6 +1,11 @@
+import subprocess
+import sys
+
 import pytest
 import boggart
 from boggart import Client
+from boggart.client.cache import ResponseCache
+from boggart.client.media import encode_lines
 
 
 @pytest.mark.skip(reason="attempts to connect to server")
@@ -18,3 +23,37 @@ def test_url():
     actual_url = client._url("/languages")
     expected_url = "{}/languages".format(base_url)
     assert actual_url == expected_url
+
+
+def test_import_is_lazy():
+    # importing boggart should not pull in the server and its dependencies
+    code = "import sys, boggart; assert 'boggart.server' not in sys.modules"
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+def test_constructor_without_connection_check():
+    # no server is running at this address
+    client = Client("http://127.0.0.1:1", check_connection=False)
+    assert client.api.base_url == "http://127.0.0.1:1"
+
+
+def test_response_cache_eviction():
+    cache = ResponseCache(max_size=2)
+    key_a = cache.key("http://x/a")
+    key_b = cache.key("http://x/b", {'lines': '1;2'})
+    key_c = cache.key("http://x/c")
+    cache.put(key_a, '"a"', 'A')
+    cache.put(key_b, '"b"', 'B')
+    assert cache.get(key_a) == 'A'
+    cache.put(key_c, '"c"', 'C')
+
+    # b was the least recently used response
+    assert len(cache) == 2
+    assert cache.etag(key_b) is None
+    assert cache.etag(key_a) == '"a"'
+    assert cache.get(key_c) == 'C'
+
+
+def test_encode_lines():
+    assert encode_lines([]) == ''
+    assert encode_lines([55, 10, 11, 12, 13, 56, 80]) == '10-13;55-56;80'
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+from aiohttp import web
+
+from boggart.core import Mutation, FileLocationRange
+from boggart.client.aio import AsyncClient
+
+
+class MockSnapshot(object):
+    @property
+    def name(self) -> str:
+        return "foo"
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+async def fake_server(num_mutations_by_file):
+    """
+    Launches a minimal stand-in for a boggart server that answers requests
+    for languages and mutations.
+    """
+    in_flight = {'now': 0, 'max': 0}
+
+    async def status(request):
+        return web.Response(status=204)
+
+    async def languages(request):
+        return web.json_response([{'name': 'C', 'file-endings': ['.c']}])
+
+    async def mutations(request):
+        in_flight['now'] += 1
+        in_flight['max'] = max(in_flight['max'], in_flight['now'])
+        await asyncio.sleep(0.01)
+        in_flight['now'] -= 1
+        filepath = request.match_info['filepath']
+        jsn = [{'operator': 'foo',
+                'transformation-index': 0,
+                'location': '{}@{}:0::{}:1'.format(filepath, i + 1, i + 1),
+                'arguments': {}}
+               for i in range(num_mutations_by_file[filepath])]
+        return web.json_response(jsn)
+
+    app = web.Application()
+    app.router.add_get('/status', status)
+    app.router.add_get('/languages', languages)
+    app.router.add_get('/mutations/{snapshot}/{filepath:.+}', mutations)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, "http://127.0.0.1:{}".format(port), in_flight
+
+
+def test_mutations_many():
+    num_mutations_by_file = {'a.c': 2, 'b.c': 0, 'c.c': 5, 'd.c': 1}
+
+    async def check():
+        runner, url, in_flight = await fake_server(num_mutations_by_file)
+        try:
+            async with AsyncClient(url) as client:
+                assert (await client.languages.get('C')).name == 'C'
+                names = [lang.name async for lang in client.languages]
+                assert names == ['C']
+
+                snapshot = MockSnapshot()
+                files = list(num_mutations_by_file)
+                found = await client.mutations_many(snapshot, files,
+                                                    concurrency=2)
+        finally:
+            await runner.cleanup()
+
+        assert in_flight['max'] <= 2
+        assert set(found) == set(files)
+        for fn, expected in num_mutations_by_file.items():
+            assert len(found[fn]) == expected
+        location = FileLocationRange.from_string('c.c@3:0::3:1')
+        assert found['c.c'][2] == Mutation('foo', 0, location, {})
+
+    run(check())
@@ -0,0 +1,58 @@
+import difflib
+
+import pytest
+
+from boggart.exceptions import BadFormat
+from boggart.server.diff import ChangedBlock, LineMapping, \
+    apply_file_change, changed_blocks, parse_unified_diff
+
+
+def unified_diff(old: str, new: str) -> str:
+    return ''.join(difflib.unified_diff(old.splitlines(True),
+                                        new.splitlines(True),
+                                        'a/foo.c', 'b/foo.c'))
+
+
+@pytest.mark.parametrize('old,new', [
+    ('a\nb\nc\n', 'a\nx\nc\n'),
+    ('a\nb\nc\n', 'z\na\nb\nc\nd\n'),
+    ('a\nb\nc\nd\n', 'a\nd\n'),
+    ('', 'a\n'),
+])
+def test_apply_unified_diff(old, new):
+    changes = parse_unified_diff(unified_diff(old, new))
+    assert len(changes) == 1
+    assert changes[0].old_filename == changes[0].new_filename == 'foo.c'
+    text, blocks = apply_file_change(old, changes[0])
+    assert text == new
+    assert blocks == changed_blocks(old, new)
+
+
+def test_apply_unified_diff_without_trailing_newline():
+    diff = '\n'.join(['--- a/foo.c', '+++ b/foo.c', '@@ -2,2 +2,2 @@',
+                      ' b', '-c', '+x', '\\ No newline at end of file', ''])
+    change, = parse_unified_diff(diff)
+    assert apply_file_change('a\nb\nc\n', change)[0] == 'a\nb\nx'
+
+    with pytest.raises(BadFormat):
+        apply_file_change('a\nq\nc\n', change)
+    with pytest.raises(BadFormat):
+        parse_unified_diff(diff.replace('@@ -2,2', '@@ -2,1'))
+
+
+def test_line_mapping():
+    # line 2 is replaced, and two lines are inserted after line 4
+    mapping = LineMapping([ChangedBlock(1, 2, 1, 2), ChangedBlock(4, 4, 4, 6)])
+    assert mapping.old_to_new(1, 1) == 1
+    assert mapping.old_to_new(2, 2) is None
+    assert mapping.old_to_new(3, 4) == 3
+    assert mapping.old_to_new(4, 5) is None
+    assert mapping.old_to_new(5, 7) == 7
+    assert mapping.new_to_old(5, 5) is None
+    assert mapping.new_to_old(7, 7) == 5
+    assert mapping.changed_regions(10, context=1) == [(1, 7)]
+    assert mapping.changed_regions(10) == [(2, 2), (5, 6)]
+
+    blocks = changed_blocks('a\nb\nc\n', 'a\nc\n')
+    assert blocks == [ChangedBlock(1, 2, 1, 1)]
+    assert LineMapping(blocks).changed_regions(3) == [(1, 2)]
@@ -0,0 +1,96 @@
+import shutil
+
+import pytest
+import rooibos
+
+from boggart.core import Transformation
+from boggart.server.installation import _line_starts
+from boggart.server.literal import find_literal
+
+from conftest import SOURCE_GCD
+
+LITERAL_TEMPLATES = ['<', '<=', '>', '>=', '==', '!=', '&&', '||',
+                     '+', '-', '*', '/']
+
+SOURCES = [SOURCE_GCD,
+           'x = a<<b; y = a <= b;\n\nif (p->q && !r) { z++; }\n',
+           '// a < b\n/* c\n < d */ char *s = "e < f";',
+           '<<<',
+           '']
+
+# a regression snapshot of the locations of the non-overlapping, left-to-right
+# occurrences of each literal template in each of the sources above. These
+# were derived independently of find_literal, but have NOT been checked
+# against Rooibos; parity with Rooibos is only checked by the test below that
+# requires a Rooibos server. Lines are one-indexed and columns are
+# zero-indexed. Templates that are not listed do not occur in the source.
+EXPECTED_LOCATIONS = [
+    {'>': ['6:10::6:11'],
+     '==': ['2:8::2:10'],
+     '!=': ['5:11::5:13'],
+     '-': ['7:12::7:13', '9:12::9:13']},
+    {'<': ['1:5::1:6', '1:6::1:7', '1:16::1:17'],
+     '<=': ['1:16::1:18'],
+     '>': ['3:6::3:7'],
+     '&&': ['3:9::3:11'],
+     '+': ['3:19::3:20', '3:20::3:21'],
+     '-': ['3:5::3:6']},
+    {'<': ['1:5::1:6', '3:1::3:2', '3:21::3:22'],
+     '*': ['2:1::2:2', '3:5::3:6', '3:13::3:14'],
+     '/': ['1:0::1:1', '1:1::1:2', '2:0::2:1', '3:6::3:7']},
+    {'<': ['1:0::1:1', '1:1::1:2', '1:2::1:3']},
+    {}
+]
+
+
+def locations(matches):
+    return [str(match.location) for match in matches]
+
+
+def test_template_classification():
+    assert Transformation('<', '>=', []).is_literal
+    assert Transformation('&&', '||', []).is_literal
+    assert not Transformation(':[1]();', '', []).is_literal
+    assert not Transformation('if (:[1])', 'if (!(:[1]))', []).is_literal
+    assert not Transformation('a b', 'b a', []).is_literal
+
+
+def test_find_literal():
+    text = 'a <= b\n  c<<d <\n'
+    line_starts = _line_starts(text)
+    assert locations(find_literal(text, '<', line_starts)) == \
+        ['1:2::1:3', '2:3::2:4', '2:4::2:5', '2:7::2:8']
+    assert locations(find_literal(text, '<<', line_starts)) == ['2:3::2:5']
+    assert locations(find_literal(text, '<', line_starts,
+                                  line_starts[1], len(text))) == \
+        ['2:3::2:4', '2:4::2:5', '2:7::2:8']
+
+    # occurrences that extend beyond the end of the search are ignored
+    assert locations(find_literal(text, '<<', line_starts, 0, 11)) == []
+
+    # occurrences do not overlap
+    assert locations(find_literal('<<<', '<<', [0])) == ['1:0::1:2']
+
+
+def test_find_literal_regressions():
+    for (source, expected) in zip(SOURCES, EXPECTED_LOCATIONS):
+        line_starts = _line_starts(source)
+        for template in LITERAL_TEMPLATES:
+            actual = locations(find_literal(source, template, line_starts))
+            assert actual == expected.get(template, []), \
+                "mismatch for template [{}] in source: {}".format(
+                    template, source)
+
+
+@pytest.mark.skipif(shutil.which('rooibosd') is None,
+                    reason="requires a Rooibos server")
+def test_find_literal_parity_with_rooibos():
+    with rooibos.ephemeral_server(port=8889) as client:
+        for source in SOURCES:
+            line_starts = _line_starts(source)
+            for template in LITERAL_TEMPLATES:
+                expected = locations(client.matches(source, template))
+                actual = locations(find_literal(source, template, line_starts))
+                assert actual == expected, \
+                    "mismatch for template [{}] in source: {}".format(
+                        template, source)
@@ -1,6 +1,10 @@
+from uuid import UUID
+import copy
+import pickle
+
 import pytest
 
-from boggart.core import Mutation, FileLocationRange
+from boggart.core import Mutant, Mutation, FileLocationRange
 
 
 def test_eq():
@@ -37,3 +41,45 @@ def test_to_and_from_dict():
 
     actual = Mutation.from_dict(mutation.to_dict())
     assert actual == mutation
+
+
+def test_hash():
+    location = FileLocationRange.from_string('bar.c@1:5::2:30')
+    args = {'x': '120'}
+    mutation = Mutation('foo', 0, location, args)
+    identical = Mutation('foo', 0, location, {'x': '120'})
+    assert hash(mutation) == hash(identical)
+    assert len({mutation, identical}) == 1
+
+    # arguments are a read-only view of a private copy
+    args['x'] = '0'
+    assert mutation.arguments['x'] == '120'
+    with pytest.raises(TypeError):
+        mutation.arguments['x'] = '0'
+    assert not hasattr(mutation, '__dict__')
+
+
+def test_pickle_and_copy():
+    location = FileLocationRange.from_string('bar.c@1:5::2:30')
+    mutation = Mutation('foo', 0, location, {'x': '120'})
+    mutant = Mutant(UUID('9c7b3c2d-94a2-4d24-a6a0-85e8b1b5c3d2'), 'bar',
+                    [mutation])
+    for obj in (mutation, mutant):
+        for clone in (pickle.loads(pickle.dumps(obj)),
+                      copy.deepcopy(obj),
+                      copy.copy(obj)):
+            assert clone == obj
+            assert hash(clone) == hash(obj)
+    clone = pickle.loads(pickle.dumps(mutation))
+    with pytest.raises(TypeError):
+        clone.arguments['x'] = '0'
+
+
+def test_mutant_to_and_from_dict():
+    location = FileLocationRange.from_string('bar.c@1:5::2:30')
+    mutations = [Mutation('foo', 0, location, {'x': '120'})]
+    mutant = Mutant(UUID('9c7b3c2d-94a2-4d24-a6a0-85e8b1b5c3d2'), 'bar',
+                    mutations)
+    assert list(mutant.mutations) == mutations
+    assert Mutant.from_dict(mutant.to_dict()) == mutant
+    assert hash(Mutant.from_dict(mutant.to_dict())) == hash(mutant)
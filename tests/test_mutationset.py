@@ -0,0 +1,88 @@
+from uuid import uuid4
+
+import pytest
+
+from boggart.core import Mutant, Mutation, MutationSet, MutationSummary, \
+                         FileLocationRange
+from boggart.exceptions import BadFormat
+
+
+def build_mutations():
+    def mutation(operator, location, args):
+        location = FileLocationRange.from_string(location)
+        return Mutation(operator, 0, location, args)
+
+    return [mutation('foo', 'a.c@1:0::1:5', {'x': '1'}),
+            mutation('bar', 'a.c@4:2::6:0', {}),
+            mutation('foo', 'b.c@5:1::5:3', {'x': '1', 'y': '2'}),
+            mutation('baz', 'b.c@10:0::10:1', {'x': '3'})]
+
+
+def test_round_trip():
+    mutations = build_mutations()
+    mutation_set = MutationSet.from_mutations(mutations)
+    assert len(mutation_set) == 4
+    assert list(mutation_set) == mutations
+    assert mutation_set[2] == mutations[2]
+    assert mutation_set[-1] == mutations[-1]
+    with pytest.raises(IndexError):
+        mutation_set[4]
+
+    dicts = mutation_set.to_dicts()
+    assert dicts == [m.to_dict() for m in mutations]
+    assert MutationSet.from_dicts(dicts) == mutation_set
+
+
+def test_filters():
+    mutations = build_mutations()
+    mutation_set = MutationSet.from_mutations(mutations)
+
+    assert list(mutation_set.with_operators('foo')) == \
+        [mutations[0], mutations[2]]
+    assert list(mutation_set.with_operators('baz', 'qux')) == [mutations[3]]
+    assert list(mutation_set.in_file('b.c')) == mutations[2:]
+    assert len(mutation_set.in_file('c.c')) == 0
+    assert list(mutation_set.within_lines(4, 5)) == mutations[1:3]
+
+    subset = mutation_set.in_file('b.c').within_lines(1, 5)
+    assert list(subset) == [mutations[2]]
+    assert subset.operators == ['foo']
+    assert subset.filenames == ['b.c']
+
+
+def test_binary_encoding():
+    mutation_set = MutationSet.from_mutations(build_mutations())
+    encoded = mutation_set.to_bytes()
+    assert MutationSet.from_bytes(encoded) == mutation_set
+    assert MutationSet.from_bytes(MutationSet().to_bytes()) == MutationSet()
+
+    # subsets share their string table with the original set
+    subset = mutation_set.with_operators('baz')
+    assert list(MutationSet.from_bytes(subset.to_bytes())) == list(subset)
+
+    for corrupted in (encoded[:-1], encoded + b'\0', b'JSON' + encoded[4:]):
+        with pytest.raises(BadFormat):
+            MutationSet.from_bytes(corrupted)
+
+
+def test_mutants_binary_encoding():
+    mutations = build_mutations()
+    mutants = [Mutant(uuid4(), 'foo', mutations[:1]),
+               Mutant(uuid4(), 'bär', []),
+               Mutant(uuid4(), 'foo', mutations[1:])]
+    encoded = Mutant.list_to_bytes(mutants)
+    assert Mutant.list_from_bytes(encoded) == mutants
+    with pytest.raises(BadFormat):
+        Mutant.list_from_bytes(encoded[:20])
+
+
+def test_summary():
+    mutation_set = MutationSet.from_mutations(build_mutations())
+    summary = mutation_set.summary()
+    assert summary.total == 4
+    assert summary.operators == {'foo': 2, 'bar': 1, 'baz': 1}
+    assert summary.transformations == {('foo', 0): 2, ('bar', 0): 1,
+                                       ('baz', 0): 1}
+    assert summary.lines == {1: 1, 4: 1, 5: 1, 10: 1}
+    assert MutationSummary.from_dict(summary.to_dict()) == summary
+    assert mutation_set.in_file('c.c').summary().total == 0
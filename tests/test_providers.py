@@ -0,0 +1,118 @@
+import subprocess
+
+import pytest
+
+from boggart.config import Configuration
+from boggart.exceptions import FileNotFound, IllegalConfig
+from boggart.server import Installation
+from boggart.server.providers import GitProvider, InMemoryProvider, \
+    LocalDirectoryProvider, RoutingProvider
+
+from conftest import FakeBugZoo, FakeRooibos, FakeSnapshot, SOURCE_GCD
+
+
+def test_in_memory_provider():
+    provider = InMemoryProvider({'gcd': {'gcd.c': SOURCE_GCD,
+                                         '.git/config': ''}})
+    assert provider.read(FakeSnapshot('gcd'), 'gcd.c') == SOURCE_GCD
+    assert provider.list_files(FakeSnapshot('gcd')) == ['gcd.c']
+    with pytest.raises(FileNotFound):
+        provider.read(FakeSnapshot('gcd'), 'missing.c')
+    with pytest.raises(FileNotFound):
+        provider.read(FakeSnapshot('other'), 'gcd.c')
+
+
+def test_git_provider(tmp_path):
+    def git(*args: str) -> None:
+        subprocess.run(['git', '-C', str(tmp_path), '-c', 'user.name=test',
+                        '-c', 'user.email=test@example.com'] + list(args),
+                       check=True, stdout=subprocess.DEVNULL)
+
+    git('init', '-q')
+    (tmp_path / 'gcd.c').write_text(SOURCE_GCD)
+    (tmp_path / 'a file.c').write_text('a < b;\r\n')
+    git('add', '.')
+    git('commit', '-q', '-m', 'first')
+    git('tag', 'v1')
+    (tmp_path / 'gcd.c').write_text('int main() {}\n')
+
+    snapshot = FakeSnapshot('v1')
+    tagged = GitProvider(str(tmp_path), '{snapshot}')
+    assert tagged.read_many(snapshot, ['gcd.c', 'a file.c']) == \
+        {'gcd.c': SOURCE_GCD, 'a file.c': 'a < b;\r\n'}
+    with pytest.raises(FileNotFound):
+        tagged.read(snapshot, 'missing.c')
+    with pytest.raises(FileNotFound):
+        tagged.read(FakeSnapshot('v2'), 'gcd.c')
+    assert tagged.list_files(snapshot) == ['a file.c', 'gcd.c']
+
+    (tmp_path / 'untracked.c').write_text('')
+    worktree = GitProvider(str(tmp_path))
+    assert worktree.read(snapshot, 'gcd.c') == 'int main() {}\n'
+    assert worktree.list_files(snapshot) == ['a file.c', 'gcd.c',
+                                             'untracked.c']
+
+
+def test_routing_provider():
+    default = InMemoryProvider({'gcd': {'gcd.c': 'default'}})
+    routed = InMemoryProvider({'local-gcd': {'gcd.c': 'routed'}})
+    provider = RoutingProvider([('local-*', routed)], default)
+    assert provider.read(FakeSnapshot('gcd'), 'gcd.c') == 'default'
+    assert provider.read(FakeSnapshot('local-gcd'), 'gcd.c') == 'routed'
+
+
+def test_sources_from_config(tmp_path):
+    (tmp_path / 'local-gcd').mkdir()
+    (tmp_path / 'local-gcd' / 'gcd.c').write_text('int gcd() {}\n')
+    config_path = tmp_path / 'boggart.yml'
+    config_path.write_text("""
+version: '1.0'
+sources:
+  - snapshots: 'local-*'
+    type: directory
+    path: '{}/{{snapshot}}'
+  - snapshots: 'container-*'
+    type: bugzoo
+""".format(tmp_path))
+    system = Configuration.from_file(Installation.sys_config_path())
+    config = Configuration.from_file(str(config_path), system)
+    assert [rule.type for rule in config.sources] == ['directory', 'bugzoo']
+    assert config.sources.find('local-gcd').type == 'directory'
+    assert config.sources.find('gcd') is None
+    assert config.digest == system.digest
+
+    bugzoo = FakeBugZoo({'gcd': {'gcd.c': SOURCE_GCD},
+                         'local-gcd': {'gcd.c': SOURCE_GCD}})
+    installation = Installation(config, bugzoo, FakeRooibos())
+    read = installation.sources.read_file
+    assert read(bugzoo.bugs['local-gcd'], 'gcd.c') == 'int gcd() {}\n'
+    assert read(bugzoo.bugs['gcd'], 'gcd.c') == SOURCE_GCD
+
+    config_path.write_text("""
+version: '1.0'
+sources:
+  - snapshots: '*'
+    type: directory
+""")
+    with pytest.raises(IllegalConfig):
+        Configuration.from_file(str(config_path), system)
+
+
+def test_directory_contents_are_revalidated(tmp_path):
+    (tmp_path / 'gcd.c').write_text(SOURCE_GCD)
+    config = Configuration.from_file(Installation.sys_config_path())
+    bugzoo = FakeBugZoo({'gcd': {}})
+    installation = Installation(config, bugzoo, FakeRooibos(),
+                                provider=LocalDirectoryProvider(str(tmp_path)))
+    snapshot = bugzoo.bugs['gcd']
+    sources = installation.sources
+    assert sources.read_file(snapshot, 'gcd.c') == SOURCE_GCD
+    digest = sources.digest(snapshot, 'gcd.c')
+
+    # changes to the file are noticed, and a deleted file is not served
+    (tmp_path / 'gcd.c').write_text('int main() {}\n')
+    assert sources.read_file(snapshot, 'gcd.c') == 'int main() {}\n'
+    assert sources.digest(snapshot, 'gcd.c') != digest
+    (tmp_path / 'gcd.c').unlink()
+    with pytest.raises(FileNotFound):
+        sources.read_file(snapshot, 'gcd.c')
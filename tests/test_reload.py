@@ -0,0 +1,113 @@
+import importlib
+
+import pytest
+
+from boggart.exceptions import BadConfigFile
+from boggart.server.watch import ConfigWatcher
+
+RELATIONAL = 'flip-relational-operator'
+
+EXTRA_OPERATOR = """
+version: '1.0'
+operators:
+  - name: flip-modulo
+    languages: [C]
+    transformations:
+      - match: "%"
+        rewrite: "/"
+"""
+
+CHANGED_RELATIONAL = """
+version: '1.0'
+operators:
+  - name: flip-relational-operator
+    languages: [C]
+    transformations:
+      - match: "!="
+        rewrite: "=="
+"""
+
+
+@pytest.fixture
+def user_config(tmp_path, monkeypatch):
+    path = tmp_path / 'boggart.yml'
+    monkeypatch.setenv('BOGGART_USER_CONFIG_PATH', str(path))
+    return path
+
+
+def test_reload_keeps_unchanged_operators(installation, user_config,
+                                          monkeypatch):
+    module = importlib.import_module('boggart.server.installation')
+    scans = []
+
+    def find_literal(text, template, *args, **kwargs):
+        scans.append(template)
+        return module.find_literal.__wrapped__(text, template, *args,
+                                               **kwargs)
+    find_literal.__wrapped__ = module.find_literal
+    monkeypatch.setattr(module, 'find_literal', find_literal)
+
+    snapshot = installation.bugzoo.bugs['gcd']
+
+    def discover():
+        operators = [installation.operators[RELATIONAL]]
+        return installation.mutation_set(snapshot, 'gcd.c',
+                                         operators=operators)
+
+    mutations = discover()
+    assert len(mutations) == 3
+    num_scans = len(scans)
+
+    user_config.write_text(EXTRA_OPERATOR)
+    config = installation.reload()
+    assert installation.config is config
+    assert 'flip-modulo' in installation.operators
+
+    # the operator is unchanged, so its mutations are still cached
+    assert discover() == mutations
+    assert len(scans) == num_scans
+
+    user_config.write_text(CHANGED_RELATIONAL)
+    installation.reload()
+    assert len(discover()) == 1
+    assert len(scans) == num_scans + 1
+
+
+def test_pinned_configuration(installation, user_config):
+    old = installation.pin()
+    user_config.write_text(EXTRA_OPERATOR)
+    new = installation.reload()
+    assert installation.config is old
+    assert 'flip-modulo' not in installation.operators
+    installation.unpin()
+    assert installation.config is new
+    assert 'flip-modulo' in installation.operators
+
+
+def test_reload_endpoint(server, installation, user_config):
+    user_config.write_text(EXTRA_OPERATOR)
+    r = server.post('/reload')
+    assert r.status_code == 200
+    assert r.get_json()['digest'] == installation.config.digest
+    assert server.get('/operators/flip-modulo').status_code == 200
+
+    # a bad configuration is rejected and the current one is kept
+    user_config.write_text("operators: []\n")
+    assert server.post('/reload').status_code == 500
+    assert server.get('/operators/flip-modulo').status_code == 200
+
+
+def test_config_watcher(installation, user_config):
+    watcher = ConfigWatcher(installation)
+    assert not watcher.check()
+
+    user_config.write_text(EXTRA_OPERATOR)
+    assert watcher.check()
+    assert 'flip-modulo' in installation.operators
+    assert not watcher.check()
+
+    user_config.write_text("operators: []\n")
+    with pytest.raises(BadConfigFile):
+        installation.reload()
+    assert not watcher.check()
+    assert 'flip-modulo' in installation.operators
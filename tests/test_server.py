@@ -0,0 +1,478 @@
+from uuid import uuid4
+import difflib
+import importlib
+import threading
+
+import pytest
+from requests.utils import parse_header_links
+
+from boggart.client.media import accept_header
+from boggart.server.coverage import CoverageManager
+from boggart.server.jobs import JobManager
+from boggart.server.literal import find_literal
+from boggart.core import Mutant, Mutation, MutationSet, MutationDelta, \
+                         Operator, Transformation, \
+                         FileLocationRange, MEDIA_TYPE_MUTANTS, \
+                         MEDIA_TYPE_MUTATIONS
+
+from conftest import SOURCE_GCD, FakeSnapshot
+
+
+def test_languages_etag(server):
+    r = server.get('/languages')
+    assert r.status_code == 200
+    etag = r.headers['ETag']
+
+    r = server.get('/languages', headers={'If-None-Match': etag})
+    assert r.status_code == 304
+    assert r.headers['ETag'] == etag
+
+
+def test_operator_etag(server):
+    r = server.get('/operators/flip-boolean-operator')
+    assert r.status_code == 200
+    etag = r.headers['ETag']
+    assert etag != server.get('/operators/flip-signedness').headers['ETag']
+
+    r = server.get('/operators/flip-boolean-operator',
+                   headers={'If-None-Match': etag})
+    assert r.status_code == 304
+
+
+def test_mutations_etag(server, bugzoo):
+    path = '/mutations/gcd/gcd.c?operators=flip-relational-operator'
+    r = server.get(path)
+    assert r.status_code == 200
+    assert len(r.get_json()) == 3
+    etag = r.headers['ETag']
+
+    r = server.get(path, headers={'If-None-Match': etag})
+    assert r.status_code == 304
+
+    # the tag depends on the arguments to the request
+    r = server.get('/mutations/gcd/gcd.c?operators=flip-boolean-operator',
+                   headers={'If-None-Match': etag})
+    assert r.status_code == 200
+    assert r.headers['ETag'] != etag
+
+
+def register_mutants(installation, num_mutants):
+    location = FileLocationRange.from_string('gcd.c@3:8::3:10')
+    for i in range(num_mutants):
+        base = 'gcd' if i % 2 == 0 else 'lcm'
+        operator = 'flip-relational-operator' if i % 3 else 'foo'
+        mutation = Mutation(operator, 0, location, {})
+        installation.mutants._register(Mutant(uuid4(), base, [mutation]))
+
+
+def test_mutants_pagination(server, installation):
+    register_mutants(installation, 7)
+    expected = [uuid.hex for uuid in installation.mutants]
+    assert expected == sorted(expected)
+
+    listed = []
+    path = '/mutants?limit=3'
+    while path:
+        r = server.get(path)
+        assert r.status_code == 200
+        page = r.get_json()
+        assert len(page) <= 3
+        listed += page
+        links = parse_header_links(r.headers.get('Link', ''))
+        path = links[0]['url'] if links else None
+    assert listed == expected
+
+
+def test_mutants_filters(server, installation):
+    register_mutants(installation, 6)
+    r = server.get('/mutants?base=gcd')
+    assert len(r.get_json()) == 3
+    assert server.get('/mutants/count?base=gcd').get_json() == 3
+    assert server.get('/mutants/count?operator=foo').get_json() == 2
+    assert server.get('/mutants/count?base=gcd&operator=foo').get_json() == 1
+    assert server.get('/mutants/count?base=nope').get_json() == 0
+    assert server.get('/mutants/count').get_json() == 6
+
+
+def test_mutants_bulk_describe(server, installation):
+    register_mutants(installation, 3)
+    uuids = [uuid.hex for uuid in installation.mutants]
+    r = server.get('/mutants?uuids={}'.format(';'.join(uuids[:2])))
+    assert r.status_code == 200
+    assert [d['uuid'] for d in r.get_json()] == uuids[:2]
+
+    r = server.get('/mutants?uuids={}'.format(uuid4().hex))
+    assert r.status_code == 404
+
+
+def test_clear_mutants(server, installation, bugzoo):
+    register_mutants(installation, 5)
+    uuids = list(installation.mutants)
+    for uuid in uuids[1:]:
+        mutant = installation.mutants[uuid]
+        bugzoo.docker.images.add(mutant.docker_image)
+        bugzoo.bugs[mutant.snapshot] = mutant
+
+    # the Docker image for the first mutant is missing
+    r = server.delete('/mutants?workers=3')
+    assert r.status_code == 200
+    assert list(r.get_json()['failures']) == [uuids[0].hex]
+    assert len(installation.mutants) == 0
+    assert not bugzoo.docker.images
+    assert set(bugzoo.bugs) == {'gcd'}
+
+
+def test_clear_mutants_in_background(server, installation, bugzoo):
+    register_mutants(installation, 4)
+    for uuid in installation.mutants:
+        bugzoo.docker.images.add(installation.mutants[uuid].docker_image)
+
+    r = server.delete('/mutants?async=1')
+    assert r.status_code == 202
+    uid = r.get_json()['job']
+    assert r.headers['Location'].endswith('/jobs/{}'.format(uid))
+    assert installation.jobs[uid].wait(timeout=10)
+
+    jsn = server.get('/jobs/{}'.format(uid)).get_json()
+    assert jsn['status'] == 'finished'
+    assert jsn['result'] == {}
+    assert jsn['progress'] == {'destroyed': 4, 'total': 4}
+    assert server.get('/jobs/{}'.format(uuid4().hex)).status_code == 404
+
+
+
+def test_finished_jobs_expire():
+    jobs = JobManager(retention=0.0)
+    started = threading.Event()
+    release = threading.Event()
+
+    def task(job):
+        started.set()
+        release.wait(10)
+
+    running = jobs.submit('running', task)
+    assert started.wait(10)
+    finished = jobs.submit('finished', lambda job: None)
+    assert finished.wait(10)
+    assert list(jobs) == [running]
+    with pytest.raises(KeyError):
+        jobs[finished.uid]
+
+    release.set()
+    assert running.wait(10)
+    assert len(jobs) == 0
+
+def test_delete_mutant(server, installation):
+    register_mutants(installation, 2)
+    uuid = next(iter(installation.mutants))
+    assert server.delete('/mutants/{}'.format(uuid.hex)).status_code == 204
+    assert uuid not in list(installation.mutants)
+    assert server.delete('/mutants/{}'.format(uuid.hex)).status_code == 404
+
+
+def test_mutations_binary_encoding(server):
+    path = '/mutations/gcd/gcd.c?operators=flip-relational-operator'
+    expected = MutationSet.from_dicts(server.get(path).get_json())
+
+    r = server.get(path, headers={'Accept': MEDIA_TYPE_MUTATIONS})
+    assert r.status_code == 200
+    assert r.mimetype == MEDIA_TYPE_MUTATIONS
+    assert MutationSet.from_bytes(r.get_data()) == expected
+
+    # each representation has its own tag
+    assert r.headers['ETag'] != server.get(path).headers['ETag']
+    r = server.get(path, headers={'Accept': MEDIA_TYPE_MUTATIONS,
+                                  'If-None-Match': r.headers['ETag']})
+    assert r.status_code == 304
+
+
+def test_replacements_binary_encoding(server):
+    path = '/mutations/gcd/gcd.c?operators=flip-relational-operator'
+    mutations = MutationSet.from_dicts(server.get(path).get_json())
+    r = server.put('/replacements/mutations/gcd',
+                   data=mutations.to_bytes(),
+                   content_type=MEDIA_TYPE_MUTATIONS)
+    assert r.status_code == 200
+    expected = server.put('/replacements/mutations/gcd',
+                          json={'mutations': mutations.to_dicts()})
+    assert r.get_json() == expected.get_json()
+    assert len(r.get_json()) == 3
+
+    r = server.put('/replacements/mutations/gcd',
+                   data=b'garbage',
+                   content_type=MEDIA_TYPE_MUTATIONS)
+    assert r.status_code == 400
+    assert server.put('/replacements/mutations/gcd').status_code == 400
+
+
+def test_mutants_bulk_describe_binary_encoding(server, installation):
+    register_mutants(installation, 3)
+    uuids = [uuid.hex for uuid in installation.mutants]
+    r = server.get('/mutants?uuids={}'.format(';'.join(uuids)),
+                   headers={'Accept': MEDIA_TYPE_MUTANTS})
+    assert r.status_code == 200
+    assert r.mimetype == MEDIA_TYPE_MUTANTS
+    mutants = Mutant.list_from_bytes(r.get_data())
+    assert mutants == [installation.mutants[uuid] for uuid in
+                       installation.mutants]
+
+
+def test_mutations_restricted_to_lines(server):
+    path = '/mutations/gcd/gcd.c?operators=flip-relational-operator'
+    r = server.get(path + '&lines=1-2;6')
+    assert r.status_code == 200
+    lines = sorted(FileLocationRange.from_string(m['location']).start.line
+                   for m in r.get_json())
+    assert lines == [2, 6]
+    assert server.get(path + '&lines=2-1').status_code == 400
+    assert server.get(path + '&lines=x').status_code == 400
+    assert server.get(path + '&lines=100-200').get_json() == []
+
+
+def test_mutations_covered_only(server, bugzoo):
+    bugzoo.bugs.covered_lines['gcd'] = {'gcd.c': [1, 2, 3, 5]}
+    path = '/mutations/gcd/gcd.c?operators=flip-relational-operator'
+    r = server.get(path + '&covered_only=1')
+    assert r.status_code == 200
+    lines = sorted(FileLocationRange.from_string(m['location']).start.line
+                   for m in r.get_json())
+    assert lines == [2, 5]
+
+    r = server.get(path + '&covered_only=1&lines=3-10')
+    assert len(r.get_json()) == 1
+
+    # coverage is computed once per snapshot
+    assert bugzoo.bugs.num_coverage_requests == 1
+
+
+
+def test_coverage_computed_per_snapshot(bugzoo):
+    # computing the coverage of one snapshot does not block other snapshots
+    bugzoo.bugs.register(FakeSnapshot('slow'))
+    bugzoo.bugs.covered_lines['gcd'] = {'gcd.c': [2]}
+    blocked = threading.Event()
+    release = threading.Event()
+    compute = bugzoo.bugs.coverage
+
+    def coverage(snapshot):
+        if snapshot.name == 'slow':
+            blocked.set()
+            release.wait(10)
+        return compute(snapshot)
+    bugzoo.bugs.coverage = coverage
+
+    manager = CoverageManager(bugzoo)
+    slow = threading.Thread(target=manager.lines,
+                            args=(bugzoo.bugs['slow'], 'gcd.c'))
+    slow.start()
+    assert blocked.wait(10)
+    assert manager.lines(bugzoo.bugs['gcd'], 'gcd.c') == frozenset([2])
+    release.set()
+    slow.join(10)
+    assert manager.lines(bugzoo.bugs['slow'], 'gcd.c') == frozenset()
+    assert bugzoo.bugs.num_coverage_requests == 2
+
+def test_mutation_delta(server, installation, bugzoo):
+    target = '// computes the greatest common divisor\n' + \
+        SOURCE_GCD.replace('a > b', 'a < b')
+    bugzoo.bugs.register(FakeSnapshot('gcd2'))
+    bugzoo.files.contents['gcd2'] = {'gcd.c': target}
+    payload = {'target': 'gcd2',
+               'files': ['gcd.c'],
+               'operators': ['flip-relational-operator']}
+    r = server.put('/delta/mutations/gcd', json=payload)
+    assert r.status_code == 200
+    delta = MutationDelta.from_dict(r.get_json()['gcd.c'])
+
+    def locations(mutations):
+        return sorted(str(m.location) for m in mutations)
+
+    assert locations(delta.removed) == ['gcd.c@6:10::6:11']
+    assert locations(delta.carried) == ['gcd.c@3:8::3:10',
+                                        'gcd.c@6:11::6:13']
+    assert locations(delta.added) == ['gcd.c@7:10::7:11']
+
+    # carried and added mutations together match a full analysis
+    operators = [installation.operators['flip-relational-operator']]
+    expected = installation.mutation_set(bugzoo.bugs['gcd2'], 'gcd.c',
+                                         operators=operators)
+    assert set(delta.carried) | set(delta.added) == set(expected)
+
+    # the same delta is computed from a unified diff
+    diff = ''.join(difflib.unified_diff(SOURCE_GCD.splitlines(True),
+                                        target.splitlines(True),
+                                        'a/gcd.c', 'b/gcd.c'))
+    payload = {'diff': diff, 'operators': ['flip-relational-operator']}
+    r = server.put('/delta/mutations/gcd', json=payload)
+    assert r.status_code == 200
+    assert MutationDelta.from_dict(r.get_json()['gcd.c']) == delta
+
+    payload['diff'] = diff.replace('a > b', 'a >= b')
+    assert server.put('/delta/mutations/gcd', json=payload).status_code == 400
+    assert server.put('/delta/mutations/gcd', json={}).status_code == 400
+
+
+
+def test_mutation_delta_rechecks_constraints(server, bugzoo):
+    # commenting out the body of the function invalidates the mutations to
+    # its unchanged lines, and uncommenting it makes them valid again
+    commented = '/*\n' + SOURCE_GCD + '*/\n'
+    bugzoo.bugs.register(FakeSnapshot('commented'))
+    bugzoo.files.contents['commented'] = {'gcd.c': commented}
+    payload = {'target': 'commented',
+               'files': ['gcd.c'],
+               'operators': ['flip-relational-operator'],
+               'context': 0}
+    r = server.put('/delta/mutations/gcd', json=payload)
+    assert r.status_code == 200
+    delta = MutationDelta.from_dict(r.get_json()['gcd.c'])
+    assert len(delta.removed) == 3
+    assert len(delta.carried) == 0
+    assert len(delta.added) == 0
+
+    payload = {'target': 'gcd',
+               'files': ['gcd.c'],
+               'operators': ['flip-relational-operator'],
+               'context': 20}
+    r = server.put('/delta/mutations/commented', json=payload)
+    assert r.status_code == 200
+    delta = MutationDelta.from_dict(r.get_json()['gcd.c'])
+    assert len(delta.removed) == 0
+    assert len(delta.carried) == 0
+    assert len(delta.added) == 3
+
+def test_mutations_sample(server, installation):
+    path = '/mutations/gcd/gcd.c?operators={}'.format(
+        'flip-arithmetic-operator;flip-relational-operator')
+    everything = MutationSet.from_dicts(server.get(path).get_json())
+    assert len(everything) > 3
+
+    # samples are reproducible, and do not depend on the state of the cache
+    r = server.get(path + '&sample=3&seed=7')
+    assert r.status_code == 200
+    sample = MutationSet.from_dicts(r.get_json())
+    assert len(sample) == 3
+    assert set(sample) <= set(everything)
+    operators = [installation.operators['flip-arithmetic-operator'],
+                 installation.operators['flip-relational-operator']]
+    snapshot = installation.bugzoo.bugs['gcd']
+    installation.discovery.clear()
+    assert installation.sample_mutations(snapshot, 'gcd.c', 3, seed=7,
+                                         operators=operators) == sample
+
+    r = server.get(path + '&sample=1000')
+    assert len(r.get_json()) == len(everything)
+
+    # each operator contributes to a stratified sample
+    num_operators = len(set(everything.operators))
+    r = server.get(path + '&sample={}&stratify=operator'.format(num_operators))
+    assert set(MutationSet.from_dicts(r.get_json()).operators) == \
+        set(everything.operators)
+
+    assert server.get(path + '&sample=x').status_code == 400
+    assert server.get(path + '&sample=5&stratify=function').status_code == 400
+
+
+def test_mutations_summary(server, bugzoo):
+    path = '/mutations/gcd/gcd.c?operators=flip-relational-operator'
+    r = server.get(path + '&summary=1',
+                   headers={'Accept': accept_header(MEDIA_TYPE_MUTATIONS)})
+    assert r.status_code == 200
+    assert r.get_json() == {
+        'total': 3,
+        'operators': {'flip-relational-operator': 3},
+        'transformations': {'flip-relational-operator': {'2': 1,
+                                                         '4': 1,
+                                                         '5': 1}},
+        'lines': {'2': 1, '5': 1, '6': 1}}
+    assert server.get(path + '&summary=1&lines=5-6').get_json()['total'] == 2
+
+    bugzoo.files.contents['gcd']['lcm.c'] = 'int lcm(int a) { a > 0; }\n'
+    r = server.get('/summary/mutations/gcd?files=gcd.c;lcm.c'
+                   '&operators=flip-relational-operator')
+    assert r.status_code == 200
+    jsn = r.get_json()
+    assert jsn['total'] == 4
+    assert jsn['files']['lcm.c']['lines'] == {'1': 1}
+    assert server.get('/summary/mutations/gcd').status_code == 400
+
+
+def test_mutations_skip_comments_and_strings(server, bugzoo):
+    bugzoo.files.contents['gcd']['lt.c'] = '\n'.join([
+        '#if X < 2',
+        'int lt(int a, int b) { return a < b; } // a < b',
+        'char *s = "a < b"; /* a <',
+        '  b */'])
+    r = server.get('/mutations/gcd/lt.c?operators=flip-relational-operator')
+    assert r.status_code == 200
+    assert [m['location'] for m in r.get_json()] == ['lt.c@2:32::2:33']
+
+
+def test_mutations_respect_token_boundaries(server, bugzoo):
+    bugzoo.files.contents['gcd']['shift.c'] = '\n'.join([
+        'int f(int a, int b) { return (a << b) < (a <= b); }'])
+    r = server.get('/mutations/gcd/shift.c?operators=flip-relational-operator')
+    assert r.status_code == 200
+    assert [m['location'] for m in r.get_json()] == ['shift.c@1:38::1:39',
+                                                     'shift.c@1:43::1:45']
+
+
+def test_constraint_statistics(server, bugzoo):
+    bugzoo.files.contents['gcd']['shift.c'] = 'int f(int a) { return a << 1; }'
+    r = server.get('/mutations/gcd/shift.c?operators=flip-relational-operator')
+    assert r.status_code == 200
+    assert r.get_json() == []
+
+    path = '/statistics/constraints?operators=flip-relational-operator'
+    r = server.get(path)
+    assert r.status_code == 200
+    reports = r.get_json()
+    assert {report['operator'] for report in reports} == \
+        {'flip-relational-operator'}
+    for report in reports:
+        costs = [c['cost'] for c in report['constraints']]
+        assert costs == sorted(costs)
+
+    # each "<" within "<<" is rejected for splitting a token
+    report = reports[0]
+    evaluations = {c['constraint']['type']: c['evaluations']
+                   for c in report['constraints']}
+    rejections = {c['constraint']['type']: c['rejections']
+                  for c in report['constraints']}
+    assert sum(rejections.values()) == 2
+    assert rejections['whole-token'] == 2
+    assert evaluations['whole-token'] >= 2
+
+    r = server.get('/statistics/constraints?operators=no-such-operator')
+    assert r.status_code == 404
+
+
+def test_shared_match_templates(installation, monkeypatch):
+    snapshot = installation.bugzoo.bugs['gcd']
+    relational = installation.operators['flip-relational-operator']
+    lt_to_gt = Operator('lt-to-gt', ['C'], [Transformation('<', '>', [])])
+    num_templates = len(relational.transformations)
+
+    templates = []
+
+    def counting_find_literal(text, template, *args):
+        templates.append(template)
+        return find_literal(text, template, *args)
+
+    # the server package shadows its installation module with a global
+    module = importlib.import_module('boggart.server.installation')
+    monkeypatch.setattr(module, 'find_literal', counting_find_literal)
+
+    expected = list(installation.mutations(snapshot, 'gcd.c',
+                                           operators=[relational]))
+    templates.clear()
+    mutations = list(installation.mutations(snapshot, 'gcd.c',
+                                            operators=[relational, lt_to_gt]))
+    assert len(templates) == num_templates
+    assert mutations[:len(expected)] == expected
+    assert [m.location for m in mutations[len(expected):]] == \
+        [m.location for m in expected
+         if relational.transformations[m.transformation_index].match == '<']
+
+    # literal templates are matched without consulting Rooibos
+    assert installation.rooibos.num_matches == 0
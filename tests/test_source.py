@@ -4,7 +4,8 @@ from unittest.mock import MagicMock
 import pytest
 from bugzoo.core.bug import Bug as Snapshot
 
-from boggart.core import Replacement, FileLocationRange, FileLine
+from boggart.core import Replacement, FileLocationRange, FileLine, Language
+from boggart.core.lexical import COMMENT, PREPROCESSOR, STRING
 from boggart.config.operators import Operators as OperatorManager
 from boggart.server.sourcefile import SourceFileManager
 
@@ -110,3 +111,49 @@ for (int i = 0; i < 10; ++i) {
 }
     """.strip()
     assert apply(src, replacements) == expected
+
+
+def test_lexical_mask():
+    src = '#include "a.h"\nint x = a < b; // c < d\nchar *s = "e < f";\n'
+    mgr = MockSourceFileManager(src)
+    mask = mgr.lexical_mask(MockSnapshot(), "foo.c", Language("C", [".c"]))
+    assert mask is mgr.lexical_mask(MockSnapshot(), "foo.c",
+                                    Language("C", [".c"]))
+
+    def kind(fragment: str) -> int:
+        return mask.flags(src.index(fragment))
+
+    assert kind('a.h') == STRING | PREPROCESSOR
+    assert kind('a < b') == 0
+    assert kind('c < d') == COMMENT
+    assert kind('e < f') == STRING
+    assert kind('char') == 0
+
+    # files in unknown languages are left unmasked
+    mask = mgr.lexical_mask(MockSnapshot(), "foo.c", Language("Z", [".c"]))
+    assert not any(mask.flags(i) for i in range(len(src)))
+
+
+def test_token_index():
+    src = 'x = a << b; y = p->q + 1e-5; i++; z = a <= b;\n'
+    mgr = MockSourceFileManager(src)
+    tokens = mgr.token_index(MockSnapshot(), "foo.c", Language("C", [".c"]))
+    assert tokens is mgr.token_index(MockSnapshot(), "foo.c",
+                                     Language("C", [".c"]))
+
+    def whole(fragment: str, occurrence: str) -> bool:
+        start = src.index(occurrence) + occurrence.index(fragment)
+        return tokens.is_whole(start, start + len(fragment))
+
+    assert not whole('<', 'a << b')
+    assert whole('<<', 'a << b')
+    assert not whole('-', 'p->q')
+    assert not whole('-', '1e-5')
+    assert not whole('+', 'i++')
+    assert whole('+', '+ 1e')
+    assert whole('<=', 'a <= b')
+    assert not whole('<', 'a <= b')
+
+    # files in unknown languages place no restrictions on token boundaries
+    tokens = mgr.token_index(MockSnapshot(), "foo.c", Language("Z", [".c"]))
+    assert tokens.is_whole(src.index('<'), src.index('<') + 1)
@@ -0,0 +1,101 @@
+import pytest
+
+from boggart.config import Configuration, Operators
+from boggart.server import Installation
+from boggart.server.providers import InMemoryProvider
+from boggart.server.warmup import WarmUpManager
+
+from conftest import FakeBugZoo, FakeRooibos, SOURCE_GCD
+
+FILES = {'gcd.c': SOURCE_GCD,
+         'lib/abs.c': 'int abs(int x) { return x < 0 ? -x : x; }\n',
+         'README.md': 'a < b\n'}
+
+
+@pytest.fixture
+def installation() -> Installation:
+    config = Configuration.from_file(Installation.sys_config_path())
+    # restrict the operators to those that are supported by FakeRooibos
+    literal = {op.name: op for op in config.operators
+               if all(t.is_literal for t in op.transformations)}
+    config = Configuration(config.languages, Operators(literal))
+    contents = {'gcd-1': FILES, 'gcd-2': FILES, 'other': FILES}
+    return Installation(config, FakeBugZoo(contents), FakeRooibos(),
+                        provider=InMemoryProvider(contents))
+
+
+def test_warm_up(server, installation):
+    assert server.get('/status').status_code == 204
+    assert server.post('/warmup').status_code == 400
+    assert server.post('/warmup?snapshots=gcd-1;missing').status_code == 404
+
+    r = server.post('/warmup?snapshots=gcd-*')
+    assert r.status_code == 202
+    job = installation.jobs[r.get_json()['job']]
+    assert job.wait(10)
+
+    # finished jobs are no longer reported by the status endpoint
+    assert server.get('/status').status_code == 204
+    report = server.get('/jobs/{}'.format(job.uid)).get_json()
+    assert report['status'] == 'finished'
+    assert report['progress']['snapshots'] == 2
+    assert report['progress']['files'] == 4
+    assert report['progress']['files_done'] == 4
+    assert report['progress']['files_failed'] == 0
+
+    # mutations to warmed files are served from the discovery cache, in
+    # which identical files in different snapshots share an entry
+    num_cached = len(installation.discovery)
+    assert num_cached == 2
+    assert server.get('/mutations/gcd-2/lib/abs.c').status_code == 200
+    assert len(installation.discovery) == num_cached
+
+
+def test_warm_up_waits_for_idle_server(installation):
+    warmup = WarmUpManager(installation, idle_timeout=10.0)
+    assert [s.name for s in warmup.resolve(['other', 'gcd-?', 'gcd-1'])] == \
+        ['other', 'gcd-1', 'gcd-2']
+
+    warmup.request_started()
+    job = warmup.submit(['gcd-1'])
+    assert not job.wait(0.2)
+    assert job.progress['files_done'] == 0
+    assert warmup.jobs == [job]
+    warmup.request_finished()
+    assert job.wait(10)
+    assert job.status == 'finished'
+    assert warmup.jobs == []
+
+
+def test_warm_up_does_not_evict_own_results(installation):
+    files = {'f{}.c'.format(i): 'int x = {} < y;\n'.format(i)
+             for i in range(300)}
+    installation.sources.use_provider(InMemoryProvider({'gcd-1': files}))
+    assert installation.discovery.capacity < len(files)
+    WarmUpManager(installation).warm(installation.bugzoo.bugs['gcd-1'])
+    assert len(installation.discovery) == len(files)
+
+
+def test_warm_up_respects_maximum_cache_capacity():
+    config = Configuration.from_file(Installation.sys_config_path())
+    literal = {op.name: op for op in config.operators
+               if all(t.is_literal for t in op.transformations)}
+    config = Configuration(config.languages, Operators(literal))
+    contents = {name: {'f{}.c'.format(i): 'int {} = {} < y;\n'.format(name, i)
+                       for i in range(8)}
+                for name in ('a', 'b')}
+    installation = Installation(config, FakeBugZoo(contents), FakeRooibos(),
+                                provider=InMemoryProvider(contents),
+                                discovery_capacity=4,
+                                discovery_max_capacity=10)
+    warmup = WarmUpManager(installation)
+    job = warmup.submit(['a', 'b'])
+    assert job.wait(10)
+    assert job.progress['files_done'] == 16
+    assert job.progress['files_failed'] == 0
+
+    # the cache grows to its maximum capacity, and no further
+    discovery = installation.discovery
+    assert discovery.capacity == 10
+    assert len(discovery) == 10
+    assert len(installation.sources.blobs) == 16
@@ -0,0 +1,82 @@
+import pytest
+
+from boggart.config import Configuration
+from boggart.server import Installation
+from boggart.server.workers import WorkerPool
+
+from conftest import FakeBugZoo, FakeRooibos, SOURCE_GCD
+
+OPERATORS = ['flip-arithmetic-operator', 'flip-relational-operator']
+
+
+@pytest.fixture
+def pooled() -> Installation:
+    config = Configuration.from_file(Installation.sys_config_path())
+    bugzoo = FakeBugZoo({'gcd': {'gcd.c': SOURCE_GCD}})
+    installation = Installation(config, bugzoo, FakeRooibos(),
+                                num_workers=1,
+                                offload_threshold=0)
+    yield installation
+    installation.close()
+
+
+def test_offloaded_discovery(installation, pooled):
+    def discover(inst: Installation):
+        snapshot = inst.bugzoo.bugs['gcd']
+        operators = [inst.operators[name] for name in OPERATORS]
+        return list(inst.mutations(snapshot, 'gcd.c', operators=operators))
+
+    expected = discover(installation)
+    assert expected
+    assert discover(pooled) == expected
+
+    # statistics gathered by the workers are recorded by the server
+    relational = pooled.operators['flip-relational-operator']
+    evaluations = sum(stats.evaluations
+                      for t in relational.transformations
+                      for (_, stats) in t.constraint_statistics())
+    assert evaluations > 0
+
+
+def test_offloaded_diff(installation, pooled):
+    snapshot = installation.bugzoo.bugs['gcd']
+    operators = [installation.operators[name] for name in OPERATORS]
+    mutations = list(installation.mutations(snapshot, 'gcd.c',
+                                            operators=operators))[:3]
+    expected = installation.sources.mutations_to_diff(snapshot, mutations)
+    actual = pooled.sources.mutations_to_diff(snapshot, mutations)
+    assert str(actual) == str(expected)
+
+    replacements = \
+        installation.sources.mutations_to_replacements(snapshot, mutations)
+    assert pooled.sources.apply(snapshot, 'gcd.c', replacements['gcd.c']) == \
+        installation.sources.apply(snapshot, 'gcd.c', replacements['gcd.c'])
+
+
+def test_offload_from_blobs(installation, tmp_path):
+    config = Configuration.from_file(Installation.sys_config_path())
+    bugzoo = FakeBugZoo({'gcd': {'gcd.c': SOURCE_GCD}})
+    pooled = Installation(config, bugzoo, FakeRooibos(),
+                          num_workers=1,
+                          offload_threshold=0,
+                          blob_dir=str(tmp_path))
+    try:
+        snapshot = pooled.bugzoo.bugs['gcd']
+        operators = [pooled.operators[name] for name in OPERATORS]
+        assert pooled.sources.blob_path(snapshot, 'gcd.c') is not None
+        assert list(pooled.mutations(snapshot, 'gcd.c',
+                                     operators=operators)) == \
+            list(installation.mutations(installation.bugzoo.bugs['gcd'],
+                                        'gcd.c', operators=operators))
+    finally:
+        pooled.close()
+
+
+def test_offload_threshold():
+    pool = WorkerPool(1, threshold=10)
+    try:
+        assert not pool.accepts('short')
+        assert pool.accepts('long enough')
+        assert pool.splice('a < b', [(2, 3, '>=')]) == 'a >= b'
+    finally:
+        pool.shutdown()